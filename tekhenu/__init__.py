@@ -0,0 +1,53 @@
+"""
+Solo bot for Tekhenu, Obelisk of the Sun.
+
+Importing the package only loads the rules tables, the engine and what plays or records a game. Forecasting,
+hints, Bot turn outcomes and paired runs are imported the first time one of their names is used, see LAZY.
+The NumPy batch engine lives in tekhenu.batch and is imported on demand. Run `python -m tekhenu --help` for the
+command line.
+"""
+
+import importlib
+
+from .board import Board
+from .dice import DicePool, roll_dice
+from .engine import Game, Decision, ENGINE_VERSION
+from .events import (NullSink, ConsoleSink, JsonLinesSink, DestinyCard, PyramidBuilt, PhaseStarted, PhaseEnded, TurnOrder,
+                     DiceShown, DieTaken, StatueBonus, PieceBuilt, BuildFailed, InputRejected, VPsScored, HappinessGained,
+                     CardsTaken, DiceAdded, BalanceDeclared, Debug)
+from .journal import JournalSink, JournalError, read_journal, replay, find_divergence
+from .policies import (PlayerPolicy, ConsolePolicy, RandomPolicy, GreedyPolicy, ScriptedPolicy, ScriptExhausted,
+                       ScriptDiverged)
+from .rng import BlockRandom, StreamRandom
+from .snapshot import SnapshotError
+from .rules import (TOTAL_BUILDINGS, TOTAL_PILLARS, TOTAL_STATUES, STARTING_HAPPINESS, STARTING_POPULATION, GOD_ORDER,
+                    BOT_BASE_ACTIONS, LIGHTING, POSSIBLE_BOT_ACTIONS, OSIRIS_ORDER, VP_CATEGORIES, PLAYER_GOD_ACTIONS,
+                    DICE_COLORS, STATUE_SPOTS, REGION_STATUE, STATUE_REGIONS, STATUE_BITS, OSIRIS_SHIFTS,
+                    OSIRIS_REGION_MASKS, ROW_MASKS, COL_MASKS, ALL_CELLS, LINE_ROW_MASKS, LINE_COL_MASKS,
+                    NEIGHBOR_MASKS, CENTER_MASKS, POLARITIES, WHEEL_LIGHTING, POLARITY_TABLE, POLARITY_CHANGES,
+                    GOD_POLARITIES,
+                    THOTH_ZONES, BASTET_SCRIBES, HAPPINESS_TRIANGLES, STATUE_BONUS, Ruleset, STANDARD_RULES, mask_cells)
+from .zobrist import TranspositionTable
+from .metrics import Metrics
+from .stats import StreamingSummary, QuantileSketch, RunningStats
+
+# Exported names whose modules start process pools or threads or run the search, with the module of each
+LAZY = {
+    "Forecaster": "forecast", "ForecastingConsolePolicy": "forecast",
+    "HintSearch": "search", "HintPolicy": "search", "hint": "search",
+    "BotTurns": "botturn", "BotOutcome": "botturn", "apply_outcome": "botturn",
+    "PairedSummary": "paired", "paired": "paired",
+}
+
+
+def __getattr__(name):
+    if name not in LAZY:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + LAZY[name], __name__), name)
+    # Later lookups find it without coming back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY))
@@ -0,0 +1,531 @@
+import numpy as np
+
+from .rules import STANDARD_RULES, GOD_ORDER, BOT_BASE_ACTIONS, POSSIBLE_BOT_ACTIONS, OSIRIS_ORDER, DICE_COLORS, VP_CATEGORIES, POLARITIES
+from .simulate import DEFAULT_CONFIG, ScoreSummary
+from .stats import StreamingSummary
+
+"""
+Structure-of-arrays batch engine. Plays N headless games in lockstep, Player side driven like RandomPolicy.
+
+Every rule of Game is applied to the whole batch at once with array operations. Random tie-breaks pick
+uniformly among the same candidates Game would, so decisions follow the same distributions.
+
+Encodings (int8):
+  - owners: 0 None, 1 Bot, 2 Player
+  - gods: GOD_ORDER index. Bot actions: BOT_BASE_ACTIONS index
+  - colors: DICE_COLORS index, -1 for an empty dice slot. Dice values 1-6, 0 for an empty slot
+  - polarity: 0 Forbidden, 1 Pure, 2 Tainted
+  - statues: GOD_ORDER, then Papyrus_Bread, Limestone_Granite, Temple_Horizontal, Temple_Vertical
+  - Osiris: OSIRIS_ORDER x value 1-6. Temple buildings: Horizontal, Vertical x row/col
+"""
+
+NONE, BOT, PLAYER = 0, 1, 2
+FORBIDDEN, PURE, TAINTED = 0, 1, 2
+HORUS, RA, HATHOR, BASTET, THOTH, OSIRIS = range(6)
+GRAY = DICE_COLORS.index("Gray")
+PAPYRUS_BREAD, LIMESTONE_GRANITE, TEMPLE_HORIZONTAL, TEMPLE_VERTICAL = 6, 7, 8, 9
+DICE_SLOTS = 24
+CATEGORY = {category: i for i, category in enumerate(VP_CATEGORIES)}
+
+# Colors tried in order by the 4 resource actions
+COLOR_ACTIONS = np.array([[DICE_COLORS.index(c) for c in action.split("/")] for action in BOT_BASE_ACTIONS[6:]], dtype=np.int8)
+
+# Osiris region for each die color. Gray is resolved at build time.
+COLOR_REGION = np.array([OSIRIS_ORDER.index(c) if c in OSIRIS_ORDER else -1 for c in DICE_COLORS], dtype=np.int8)
+
+# Ra candidate tie-break, higher is closer to the center
+CENTER_SCORES = np.array([[min(r, 4-r, 2)+min(c, 4-c, 2) for c in range(5)] for r in range(5)], dtype=np.int8).reshape(25)
+ROWS, COLS = np.arange(25)//5, np.arange(25)%5
+
+class BatchRules(object):
+    """
+    Ruleset tables as arrays, indexed like the Ruleset ones with names turned into indices.
+      - polarity: (first_sunny, god, color) -> polarity
+      - osiris_probes: (value-1, resource) -> 24 Osiris spots (region*6 + row) in the order build_osiris_building probes them
+      - thoth_cards: (min(happiness, thoth_cap), value) -> (decrees, technologies, blessings)
+      - bastet: (gap+6, value) -> (scribes, happiness gained, population gained)
+      - happiness_vps, statue_bonus, statue_vps: as in Ruleset
+    """
+    def __init__(self, rules):
+        self.rules = rules
+        self.polarity = np.array([[[POLARITIES.index(rules.polarity_table[(sunny, god, color)]) for color in DICE_COLORS]
+                                   for god in GOD_ORDER] for sunny in GOD_ORDER], dtype=np.int8)
+        self.osiris_probes = np.array([[[OSIRIS_ORDER.index(region)*6+row for region, row in rules.osiris_probes[(resource, value)]]
+                                        for resource in OSIRIS_ORDER] for value in range(1, 7)], dtype=np.int8)
+        self.thoth_cards = np.array([[(0,0,0)] + [cards[:3] for cards in row[1:]] for row in rules.thoth_cards], dtype=np.int16)
+        self.bastet = np.array([[(0,0,0)] + [rules.bastet[(gap, value)] for value in range(1, 7)] for gap in range(-6, 7)], dtype=np.int16)
+        self.happiness_vps = np.array(rules.happiness_vps, dtype=np.int16)
+        self.statue_bonus = np.array(rules.statue_bonus, dtype=np.int16)
+        self.statue_vps = np.array(rules.statue_vps, dtype=np.int16)
+
+
+STANDARD_TABLES = BatchRules(STANDARD_RULES)
+
+
+class BatchGame(object):
+    def __init__(self, n_games, difficulty, horus_order=None, first_sunny=None, starting_dice=None, rng=None, rules=None):
+        """
+        Board state setup and bot init for n_games games. Same params as Game, applied to every game.
+        horus_order, first_sunny and starting_dice are drawn per game when None.
+        Params:
+          - rng (numpy.random.Generator): source of all randomness
+          - rules (Ruleset): house rules. Standard rules if None.
+        """
+        n = self.n = n_games
+        self.tables = STANDARD_TABLES if rules is None or rules is STANDARD_RULES else BatchRules(rules)
+        self.rules = self.tables.rules
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.all = np.arange(n)
+
+        if horus_order is None:
+            self.horus_order = np.argsort(self.rng.random((n, 6)), axis=1).astype(np.int8)
+        else:
+            self.horus_order = np.tile(np.array([GOD_ORDER.index(g) for g in horus_order], dtype=np.int8), (n, 1))
+        # god -> position on Horus
+        self.horus_pos = np.argsort(self.horus_order, axis=1).astype(np.int8)
+
+        if first_sunny is None:
+            self.first_sunny = self.rng.integers(0, 6, n).astype(np.int8)
+        else:
+            self.first_sunny = np.full(n, GOD_ORDER.index(first_sunny), dtype=np.int8)
+
+        self.dice_colors = np.full((n, 6, DICE_SLOTS), -1, dtype=np.int8)
+        self.dice_values = np.zeros((n, 6, DICE_SLOTS), dtype=np.int8)
+        if starting_dice is None:
+            self.dice_colors[:, :, :3] = self.rng.integers(0, len(DICE_COLORS), (n, 6, 3))
+            self.dice_values[:, :, :3] = self.rng.integers(1, 7, (n, 6, 3))
+        else:
+            for god, dice in starting_dice.items():
+                for slot, (color, value) in enumerate(dice):
+                    self.dice_colors[:, GOD_ORDER.index(god), slot] = DICE_COLORS.index(color)
+                    self.dice_values[:, GOD_ORDER.index(god), slot] = value
+        self.assign_polarity()
+
+        self.built_statues = np.zeros((n, 10), dtype=np.int8)
+        self.built_osiris_buildings = np.zeros((n, 4, 6), dtype=np.int8)
+        self.built_temple_buildings = np.zeros((n, 2, 5), dtype=np.int8)
+        self.built_temple_pillars = np.zeros((n, 5, 5), dtype=np.int8)
+
+        self.vps = np.zeros(n, dtype=np.int16)
+        self.vp_breakdown = np.zeros((n, len(VP_CATEGORIES)), dtype=np.int16)
+        self.scribes = np.zeros(n, dtype=np.int16)
+        self.number_built_buildings = np.zeros(n, dtype=np.int8)
+        self.number_built_pillars = np.zeros(n, dtype=np.int8)
+        self.number_built_statues = np.zeros(n, dtype=np.int8)
+        self.happiness = np.full(n, self.rules.starting_happiness, dtype=np.int16)
+        self.population = np.full(n, self.rules.starting_population, dtype=np.int16)
+        self.blessings = np.zeros(n, dtype=np.int16)
+        self.technologies = np.zeros(n, dtype=np.int16)
+        self.decrees = np.zeros(n, dtype=np.int16)
+        self.player_first = np.zeros(n, dtype=bool)
+        self.player_balance = np.zeros(n, dtype=np.int16)
+
+        self.build_statue(self.all, np.ones(n, dtype=np.int8))
+
+        if difficulty=="Medium" or difficulty=="Hard":
+            self.build_osiris_building(self.all, np.full(n, 5), np.full(n, OSIRIS_ORDER.index("Bread")))
+            self.build_osiris_building(self.all, np.full(n, 5), np.full(n, OSIRIS_ORDER.index("Granite")))
+            self.build_pillar(self.all, None, setup=True)
+
+        if difficulty=="Hard":
+            self.build_statue(self.all, np.full(n, 4, dtype=np.int8))
+
+        self.new_pyramid()
+
+    def choose(self, candidates):
+        """
+        Uniform random pick of a True column in every row of a boolean (n, k) matrix.
+        Returns: int array of column indexes, -1 for rows without candidates
+        """
+        counts = candidates.sum(1)
+        draws = (self.rng.random(len(counts)) * counts).astype(np.int64)
+        picks = (candidates.cumsum(1) > draws[:, None]).argmax(1)
+        return np.where(counts>0, picks, -1)
+
+    def score(self, idx, category, vps):
+        """
+        Add VPs to the bot total and to its VP_CATEGORIES breakdown for games idx.
+        """
+        self.vps[idx] += vps
+        self.vp_breakdown[idx, CATEGORY[category]] += vps
+
+    def new_pyramid(self):
+        """
+        Shuffle the action pyramid and draw an action order for every game.
+        """
+        self.bot_pyramid = np.argsort(self.rng.random((self.n, 10)), axis=1).astype(np.int8)
+        self.bot_actions = np.array(POSSIBLE_BOT_ACTIONS, dtype=np.int8)[self.rng.integers(0, len(POSSIBLE_BOT_ACTIONS), self.n)]
+
+    def assign_polarity(self):
+        """
+        Based on lighting condition, classify polarity of every die in every game. Called on every Rotation Phase.
+        """
+        self.dice_polarity = self.tables.polarity[self.first_sunny[:, None, None], np.arange(6)[None, :, None], self.dice_colors]
+        self.dice_polarity[self.dice_values==0] = FORBIDDEN
+
+    def takeable(self):
+        # (n, 6, slots) mask of Pure/Tainted dice
+        return (self.dice_polarity!=FORBIDDEN) & (self.dice_values>0)
+
+    def osiris_winner(self, statue, buildings):
+        """
+        Select winner of Osiris regions. Most pieces. Topmost piece if tied.
+        Params:
+          - statue (n,), buildings (n, 6): owners
+        Returns: winner owner per game
+        """
+        pieces = np.concatenate([statue[:, None], buildings], axis=1)
+        bot_count, player_count = (pieces==BOT).sum(1), (pieces==PLAYER).sum(1)
+        topmost = pieces[np.arange(len(pieces)), (pieces!=NONE).argmax(1)]
+        return np.where(bot_count>player_count, BOT, np.where(player_count>bot_count, PLAYER, topmost))
+
+    def statue_bonus(self, idx, god):
+        """
+        Horus rewards for bot when a die is taken from a God with its statue. VP, Scribe or both.
+        """
+        has_statue = self.built_statues[idx, god]==BOT
+        idx, god = idx[has_statue], god[has_statue]
+        bonus = self.tables.statue_bonus[self.horus_pos[idx, god]]
+        self.scribes[idx] += bonus[:, 0]
+        self.score(idx, "Statue Bonus", bonus[:, 1])
+
+    def remove_die(self, idx, god, slot):
+        self.dice_values[idx, god, slot] = 0
+        self.dice_colors[idx, god, slot] = -1
+        self.dice_polarity[idx, god, slot] = FORBIDDEN
+
+    def add_dice(self, god):
+        """
+        Refill god in every game with a die rolled like RandomPolicy.new_die.
+        """
+        slot = (self.dice_values[self.all, god]==0).argmax(1)
+        self.dice_colors[self.all, god, slot] = self.rng.integers(0, len(DICE_COLORS), self.n)
+        self.dice_values[self.all, god, slot] = self.rng.integers(1, 7, self.n)
+
+    def build_statue(self, idx, value):
+        """
+        Build a statue following Horus action logic with die value for games idx.
+
+        Build on God. If occupied, build on biggest impact Osiris. If none, build on Temple with most pillars. Score 3VPs if still not possible.
+        """
+        room = self.number_built_statues[idx]<self.rules.total_statues
+        idx, value = idx[room], value[room]
+        god = self.horus_order[idx, value-1]
+        on_god = self.built_statues[idx, god]==NONE
+        self.built_statues[idx[on_god], god[on_god]] = BOT
+        built = on_god.copy()
+
+        # Osiris impact: regions whose winner changes with a Bot statue. Ties broken randomly.
+        impacts = np.zeros((len(idx), 2), dtype=np.int8)
+        for group in range(2):
+            free = self.built_statues[idx, PAPYRUS_BREAD+group]==NONE
+            for region in (2*group, 2*group+1):
+                buildings = self.built_osiris_buildings[idx, region]
+                old = self.osiris_winner(np.full(len(idx), NONE, dtype=np.int8), buildings)
+                new = self.osiris_winner(np.full(len(idx), BOT, dtype=np.int8), buildings)
+                impacts[:, group] += free & (old!=new)
+        best = self.choose(impacts==impacts.max(1)[:, None])
+        on_osiris = ~built & (impacts.max(1)>0)
+        self.built_statues[idx[on_osiris], PAPYRUS_BREAD+best[on_osiris]] = BOT
+        built |= on_osiris
+
+        # Temple row/col through the center with more Bot pillars
+        temple = ~built
+        horizontal = np.where(self.built_statues[idx, TEMPLE_HORIZONTAL]==NONE, (self.built_temple_pillars[idx, 2, :]==BOT).sum(1), 0)
+        vertical = np.where(self.built_statues[idx, TEMPLE_VERTICAL]==NONE, (self.built_temple_pillars[idx, :, 2]==BOT).sum(1), 0)
+        side = np.where(horizontal>vertical, 0, np.where(vertical>horizontal, 1, self.rng.integers(0, 2, len(idx))))
+        on_temple = temple & (np.maximum(horizontal, vertical)>0)
+        self.built_statues[idx[on_temple], TEMPLE_HORIZONTAL+side[on_temple]] = BOT
+        self.score(idx[on_temple], "Actions", 3*np.where(side==0, horizontal, vertical)[on_temple])
+        built |= on_temple
+
+        # All Statues occupied
+        self.score(idx[~built], "Actions", 3)
+        self.number_built_statues[idx[built]] += 1
+
+    def build_osiris_building(self, idx, value, resource):
+        """
+        Build an Osiris Building following Osiris action logic with die value and resource (OSIRIS_ORDER index) for games idx.
+
+        Build on spot referenced by resource, value. If occupied, cycle through resources first and values descending next.
+        """
+        room = self.number_built_buildings[idx]<self.rules.total_buildings
+        idx, value, resource = idx[room], value[room], resource[room]
+        probes = self.tables.osiris_probes[value-1, resource]
+        board = self.built_osiris_buildings.reshape(self.n, 24)
+        free = board[idx[:, None], probes]==NONE
+        found = free.any(1)
+        spot = probes[np.arange(len(idx)), free.argmax(1)]
+        board[idx[found], spot[found]] = BOT
+        self.number_built_buildings[idx[found]] += 1
+
+    def build_pillar(self, idx, value, setup=False):
+        """
+        Build a Pillar following Ra action logic with die value for games idx.
+
+        Build on spot with most VPs gain. If multiple, pick most inline with Temple Buildings. Random if still tied.
+        """
+        if setup:
+            idx = idx[self.number_built_pillars[idx]<self.rules.total_pillars]
+            self.built_temple_pillars[idx, 2, 2] = BOT
+            self.number_built_pillars[idx] += 1
+            return
+
+        room = self.number_built_pillars[idx]<self.rules.total_pillars
+        idx, value = idx[room], value[room]
+        room = (self.built_temple_pillars[idx]==NONE).reshape(-1, 25).any(1)
+        idx, value = idx[room], value[room]
+        pillars = self.built_temple_pillars[idx]
+        buildings = self.built_temple_buildings[idx]
+        filled = np.pad(pillars!=NONE, ((0,0), (1,1), (1,1)), constant_values=True)
+        neighbors = (filled[:, :-2, 1:-1].astype(np.int8) + filled[:, 2:, 1:-1] + filled[:, 1:-1, :-2] + filled[:, 1:-1, 2:]).reshape(-1, 25)
+        lines = (buildings[:, 0, ROWS]!=NONE).astype(np.int8) + (buildings[:, 1, COLS]!=NONE)
+        free = pillars.reshape(-1, 25)==NONE
+        vps = np.where(free, neighbors+lines, -1)
+
+        candidates = vps==vps.max(1)[:, None]
+        inline = candidates & ((buildings[:, 0, ROWS]==BOT) | (buildings[:, 1, COLS]==BOT))
+        shortlist = np.where(inline.any(1)[:, None], inline, candidates)
+        center = np.where(shortlist, CENTER_SCORES, -1)
+        spot = self.choose(center==center.max(1)[:, None])
+
+        self.built_temple_pillars.reshape(self.n, 25)[idx, spot] = BOT
+        self.score(idx, "Actions", vps.max(1) + (value+1)//2)
+        self.number_built_pillars[idx] += 1
+
+    def build_temple_building(self, idx, value):
+        """
+        Build a Temple Building following Hathor action logic with die value for games idx.
+
+        Build on spot with most VPs gain. Random if tied.
+        """
+        room = self.number_built_buildings[idx]<self.rules.total_buildings
+        idx, value = idx[room], value[room]
+        bot_pillars = self.built_temple_pillars[idx]==BOT
+        counts = np.concatenate([bot_pillars.sum(2), bot_pillars.sum(1)], axis=1)
+        counts = np.where(self.built_temple_buildings[idx].reshape(-1, 10)==NONE, counts, -1)
+        most_pillars = counts.max(1)
+        spot = self.choose(counts==most_pillars[:, None])
+        # -1 everywhere when every Temple spot has a building
+        found = (spot>=0) & (most_pillars>=0)
+        idx, value, spot, most_pillars = idx[found], value[found], spot[found], most_pillars[found]
+
+        self.number_built_buildings[idx] += 1
+        self.population[idx] += value
+        self.score(idx, "Actions", 3*most_pillars)
+        self.built_temple_buildings.reshape(self.n, 10)[idx, spot] = BOT
+
+    def player_turn(self, idx):
+        """
+        RandomPolicy turn for games idx. Random Pure/Tainted die, matching piece on a random free spot.
+        """
+        takeable = self.takeable()[idx].reshape(-1, 6*DICE_SLOTS)
+        pick = self.choose(takeable)
+        idx, pick = idx[pick>=0], pick[pick>=0]
+        god, slot = pick//DICE_SLOTS, pick%DICE_SLOTS
+        self.player_balance[idx] += np.where(self.dice_polarity[idx, god, slot]==PURE, 1, -1).astype(np.int16)
+        self.remove_die(idx, god, slot)
+        self.statue_bonus(idx, god)
+
+        for acting_god, board in ((HORUS, self.built_statues), (RA, self.built_temple_pillars.reshape(self.n, 25)),
+                                  (HATHOR, self.built_temple_buildings.reshape(self.n, 10)), (OSIRIS, self.built_osiris_buildings.reshape(self.n, 24))):
+            acting = idx[god==acting_god]
+            spot = self.choose(board[acting]==NONE)
+            board[acting[spot>=0], spot[spot>=0]] = PLAYER
+
+    def bot_turn(self, round_number):
+        """
+        Main bot action selection according to pyramid, for every game.
+
+        For god action, evaluate highest available dice. Pure if tied. Random otherwise. Move to next God if None.
+        For resource action, evaluate highest dice of that color. Statue if tied. Highest if multuple. Random if no statue. Next color if none.
+        """
+        action = self.bot_pyramid[self.all, self.bot_actions[:, (round_number-1)%4]]
+        takeable = self.takeable()
+        god = np.full(self.n, -1, dtype=np.int64)
+        slot = np.full(self.n, -1, dtype=np.int64)
+
+        # God actions, falling back to the previous God when nothing is takeable
+        idx = np.nonzero(action<6)[0]
+        order = (action[idx, None] - np.arange(6)[None, :]) % 6
+        available = takeable[idx].any(2)[np.arange(len(idx))[:, None], order]
+        idx, order, available = idx[available.any(1)], order[available.any(1)], available[available.any(1)]
+        picked = order[np.arange(len(idx)), available.argmax(1)]
+        values = np.where(takeable[idx, picked], self.dice_values[idx, picked], 0)
+        top = values==values.max(1)[:, None]
+        pure = top & (self.dice_polarity[idx, picked]==PURE)
+        choice = self.choose(np.where(pure.any(1)[:, None], pure, top & (values>0)))
+        god[idx], slot[idx] = picked, choice
+
+        # Resource actions, trying colors in order
+        pending = np.nonzero(action>=6)[0]
+        colors = COLOR_ACTIONS[action[pending]-6]
+        for i in range(4):
+            if not len(pending):
+                break
+            idx = pending
+            values = np.where(takeable[idx] & (self.dice_colors[idx]==colors[:, i, None, None]), self.dice_values[idx], 0)
+            found = values.max((1, 2))>0
+            candidates = values==values.max((1, 2))[:, None, None]
+            candidates &= values>0
+
+            on_statue = candidates & (self.built_statues[idx, :6]==BOT)[:, :, None]
+            statue_gods = on_statue.any(2)
+            best_god = np.where(statue_gods, self.horus_pos[idx], -1).argmax(1)
+            statue_slot = on_statue[np.arange(len(idx)), best_god].argmax(1)
+            random_pick = self.choose(candidates.reshape(-1, 6*DICE_SLOTS))
+            use_statue = statue_gods.any(1)
+            god[idx] = np.where(use_statue, best_god, random_pick//DICE_SLOTS)
+            slot[idx] = np.where(use_statue, statue_slot, random_pick%DICE_SLOTS)
+
+            pending, colors = idx[~found], colors[~found]
+            god[pending], slot[pending] = -1, -1
+
+        idx = np.nonzero(god>=0)[0]
+        god, slot = god[idx], slot[idx]
+        color, value = self.dice_colors[idx, god, slot], self.dice_values[idx, god, slot]
+        self.remove_die(idx, god, slot)
+        self.statue_bonus(idx, god)
+        self.do_bot_action(idx, god, color, value)
+
+    def do_bot_action(self, idx, god, color, value):
+        """
+        Evaluate the bot action for games idx with their selected god, color and value.
+        """
+        acting = god==HORUS
+        self.build_statue(idx[acting], value[acting])
+
+        acting = god==RA
+        self.build_pillar(idx[acting], value[acting])
+
+        acting = god==HATHOR
+        self.build_temple_building(idx[acting], value[acting])
+
+        acting = god==BASTET
+        bastet, v = idx[acting], value[acting]
+        gap = np.clip(self.population[bastet]-self.happiness[bastet], -6, 6)
+        gains = self.tables.bastet[gap+6, v]
+        self.scribes[bastet] += gains[:, 0]
+        self.happiness[bastet] += gains[:, 1]
+        self.population[bastet] += gains[:, 2]
+
+        acting = god==THOTH
+        thoth, v = idx[acting], value[acting]
+        cards = self.tables.thoth_cards[np.minimum(self.happiness[thoth], self.rules.thoth_cap), v]
+        self.decrees[thoth] += cards[:, 0]
+        self.technologies[thoth] += cards[:, 1]
+        self.blessings[thoth] += cards[:, 2]
+
+        acting = god==OSIRIS
+        osiris, c, v = idx[acting], color[acting], value[acting]
+        most_empty = (self.built_osiris_buildings[osiris]==NONE).sum(2).argmax(1)
+        resource = np.where(c==GRAY, most_empty, COLOR_REGION[c])
+        self.build_osiris_building(osiris, v, resource)
+
+    def temple_scoring(self):
+        """
+        Calculate VPs scored by Bot for Pillars and Temple Buildings
+        """
+        buildings, statues = self.built_temple_buildings, self.built_statues
+        self.score(self.all, "Temple Buildings", (buildings==BOT).reshape(self.n, -1).sum(1) + (statues[:, TEMPLE_HORIZONTAL:]==BOT).sum(1))
+
+        pillars = self.built_temple_pillars==BOT
+        vps = (pillars & (buildings[:, 0, :, None]==BOT)).sum((1, 2))
+        vps += (pillars & (buildings[:, 1, None, :]==BOT)).sum((1, 2))
+        vps += np.where(statues[:, TEMPLE_HORIZONTAL]==BOT, pillars[:, 2, :].sum(1), 0)
+        vps += np.where(statues[:, TEMPLE_VERTICAL]==BOT, pillars[:, :, 2].sum(1), 0)
+        self.score(self.all, "Temple Pillars", vps)
+
+    def osiris_scoring(self):
+        """
+        3 VPs to the bot for every Osiris region it wins.
+        """
+        for region in range(4):
+            statue = self.built_statues[:, PAPYRUS_BREAD + region//2]
+            winner = self.osiris_winner(statue, self.built_osiris_buildings[:, region])
+            self.score(self.all, "Osiris", 3*(winner==BOT))
+
+    def statue_scoring(self):
+        """
+        Statue VPs for Bot. 1/3/6/10...
+        """
+        self.score(self.all, "Statues", self.tables.statue_vps[self.number_built_statues])
+
+    def happiness_scoring(self):
+        """
+        Happiness VPs for Bot. 3*triangles reached.
+        """
+        self.score(self.all, "Happiness", self.tables.happiness_vps[np.minimum(self.happiness, self.rules.happiness_cap)])
+
+    def card_scoring(self):
+        """
+        Card VPs for Bot. 2 per blessing (discard), 2 per tech (keep)
+        """
+        self.score(self.all, "Blessings", 2*self.blessings)
+        self.score(self.all, "Technologies", 2*self.technologies)
+        self.blessings[:] = 0
+
+    def game_loop(self):
+        """
+        Play rounds 1-16 for the whole batch. Same flow as Game.game_loop.
+        """
+        for round_number in range(1, 17):
+            self.player_turn(np.nonzero(self.player_first)[0])
+            self.bot_turn(round_number)
+            self.player_turn(np.nonzero(~self.player_first)[0])
+
+            if round_number%2==0:
+                # move wheel
+                self.first_sunny = (self.first_sunny+1)%6
+
+                if round_number%4==0:
+                    bot_balance = max(4-(round_number/4), 1)
+                    self.player_first = np.abs(self.player_balance)<bot_balance
+                    self.new_pyramid()
+
+                    if round_number%8==0:
+                        self.osiris_scoring()
+                        self.temple_scoring()
+                        self.statue_scoring()
+                        self.happiness_scoring()
+                        self.card_scoring()
+
+                        if round_number%16==0:
+                            self.score(self.all, "Decrees", 4*self.decrees)
+                            self.score(self.all, "Scribes", self.scribes//2)
+                            self.score(self.all, "Turn Order", 3*(~self.player_first))
+                            return
+
+                for offset in (2, 2, 5, 5):
+                    self.add_dice((self.first_sunny+offset)%6)
+                self.assign_polarity()
+
+
+def simulate_batch(n_games, config=None, seed=0, batch_size=10000):
+    """
+    Play n_games headless games with the batch engine. Only the "random" policy is vectorized.
+
+    Params:
+      - n_games (int), config (dict): as in simulate.simulate
+      - seed (int): seed for numpy.random.default_rng
+      - batch_size (int): games advanced together
+    Returns:
+      - dict. ScoreSummary.as_dict() over all games
+    """
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    if config["policy"]!="random":
+        raise ValueError("Batch engine only supports the random policy")
+    rng = np.random.default_rng(seed)
+    summary = StreamingSummary() if config["streaming"] else ScoreSummary()
+    writer = None
+    if config["store"] is not None:
+        from .store import process_writer
+        writer = process_writer(config["store"])
+    for start in range(0, n_games, batch_size):
+        game = BatchGame(min(batch_size, n_games-start), config["difficulty"], config["horus_order"],
+                         config["first_sunny"], config["starting_dice"], rng=rng, rules=config["rules"])
+        game.game_loop()
+        summary.add_batch(game)
+        if writer is not None:
+            writer.add_batch(game, seed, start, config["config_id"])
+    return summary.as_dict()
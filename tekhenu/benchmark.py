@@ -0,0 +1,210 @@
+import gc
+import json
+import os
+import platform
+import random
+import time
+
+from .dice import roll_dice
+from .engine import Game
+from .events import NullSink
+from .policies import GreedyPolicy
+from .rules import GOD_ORDER, DICE_COLORS
+from .simulate import simulate
+
+"""
+Benchmark suite of the Bot's hot paths and of full game throughput.
+
+Micro benchmarks run one Game method on copies of fixed seeded states, taken at the Player's die pick in every
+round of a few greedy games, so every commit times the same work. Each is timed a few times and the best run kept.
+Throughput benchmarks play whole 16 round games with the headless, multi-process and batch engines.
+
+Results are seconds per call or per game, lower is better, saved as JSON. compare() flags every benchmark that got
+slower than a baseline by more than a threshold.
+"""
+
+FORMAT_VERSION = 1
+
+STATE_SEEDS = range(4)
+
+
+def rotate(game):
+    # Rotation phase: move the wheel one God on and reclassify the dice
+    game.first_sunny = GOD_ORDER[(GOD_ORDER.index(game.first_sunny)+1)%6]
+    game.assign_polarity()
+
+
+def god_die_pick(game):
+    for god in GOD_ORDER:
+        game.dice_pool.top_god_dice(god)
+
+
+def color_die_pick(game):
+    for color in DICE_COLORS:
+        game.dice_pool.top_color_dice(color)
+
+
+# name: function of (game, round_number). Each runs on its own copy of the state
+MICRO_BENCHMARKS = {
+    "build_pillar": lambda game, round_number: game.build_pillar(4),
+    "build_statue": lambda game, round_number: game.build_statue(3),
+    "build_temple_building": lambda game, round_number: game.build_temple_building(4),
+    "build_osiris_building": lambda game, round_number: game.build_osiris_building(4, "Bread"),
+    "god_die_pick": lambda game, round_number: god_die_pick(game),
+    "color_die_pick": lambda game, round_number: color_die_pick(game),
+    "bot_turn": lambda game, round_number: game.bot_turn(round_number),
+    "assign_polarity": lambda game, round_number: rotate(game),
+    "osiris_scoring": lambda game, round_number: game.osiris_scoring(),
+    "temple_scoring": lambda game, round_number: game.temple_scoring(),
+    "statue_scoring": lambda game, round_number: game.statue_scoring(),
+    "happiness_scoring": lambda game, round_number: game.happiness_scoring(),
+    "card_scoring": lambda game, round_number: game.card_scoring(),
+}
+
+
+def seeded_states(seeds=STATE_SEEDS, difficulty="Medium"):
+    """
+    Returns: [(game, round_number) ..] at the Player's die pick of every round of a greedy game per seed
+    """
+    states = []
+    for seed in seeds:
+        rng = random.Random("tekhenu:bench:{}".format(seed))
+        game = Game(difficulty, rng.sample(GOD_ORDER, 6), rng.choice(GOD_ORDER), roll_dice(rng),
+                    policy=GreedyPolicy(rng), sink=NullSink(), rng=rng)
+        steps = game.play()
+        answer, changes = None, None
+        try:
+            while True:
+                decision = steps.send(answer)
+                if decision.kind=="die":
+                    states.append((game.clone(rng=random.Random(seed)), decision.round_number))
+                    changes = None
+                    answer = game.policy.select_die(game, decision.round_number)
+                elif decision.kind=="change":
+                    if changes is None:
+                        changes = iter(game.policy.board_changes(game, decision.round_number, decision.god, decision.die))
+                    answer = next(changes, None)
+                elif decision.kind=="balance":
+                    answer = game.policy.balance(game, decision.round_number)
+                else:
+                    answer = game.policy.new_die(game, decision.god)
+        except StopIteration:
+            pass
+    return states
+
+
+def time_micro(run, states, repeat=5, number=20):
+    """
+    Returns: best seconds per call of run over repeat timings, each calling it number times on every state.
+    Copies of the states are made before the clock starts, and the garbage collector is off while it runs.
+    """
+    best = None
+    for _ in range(repeat):
+        copies = [(game.clone(), round_number) for game, round_number in states for _ in range(number)]
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for game, round_number in copies:
+                run(game, round_number)
+            elapsed = (time.perf_counter()-start)/len(copies)
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def batch_engine(n_games, config, seed):
+    # NumPy is only loaded when the batch engine is asked for
+    from .batch import simulate_batch
+    return simulate_batch(n_games, config, seed=seed)
+
+
+# name: function of (n_games, config, seed) that plays n_games full games
+THROUGHPUT_BENCHMARKS = {
+    "games_headless": lambda n_games, config, seed: simulate(n_games, config, workers=1, seed=seed),
+    "games_multiprocess": lambda n_games, config, seed: simulate(n_games, config, seed=seed),
+    "games_batch": batch_engine,
+}
+
+
+def time_games(run, n_games, config, repeat=3):
+    """
+    Returns: best seconds per game of run over repeat timings
+    """
+    best = None
+    for seed in range(repeat):
+        start = time.perf_counter()
+        run(n_games, config, seed)
+        elapsed = (time.perf_counter()-start)/n_games
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_suite(names=None, games=500, batch_games=20000, repeat=5, config=None, report=None):
+    """
+    Run the benchmark suite.
+    Params:
+      - names (list of str): benchmarks to run. All if None
+      - games (int): games per timing of the headless and multi-process engines
+      - batch_games (int): games per timing of the batch engine
+      - repeat (int): timings per benchmark, the best one is kept
+      - config (dict): simulate config of the throughput benchmarks
+      - report (callable): called with (name, seconds) as every benchmark finishes
+    Returns:
+      - dict. {"version", "python", "platform", "cpus", "results": {name: seconds per call or game}}
+    """
+    results = {}
+    states = None
+    for name, run in MICRO_BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        if states is None:
+            states = seeded_states()
+        results[name] = time_micro(run, states, repeat)
+        if report is not None:
+            report(name, results[name])
+
+    for name, run in THROUGHPUT_BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        try:
+            results[name] = time_games(run, batch_games if name=="games_batch" else games, config, min(repeat, 3))
+        except ImportError:
+            # The batch engine needs NumPy
+            continue
+        if report is not None:
+            report(name, results[name])
+
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Params:
+      - results, baseline (dict): run_suite output
+      - threshold (float): slowdown allowed, 0.1 for 10%
+    Returns:
+      - [(name, baseline seconds, seconds, ratio) ..] of the benchmarks slower than baseline by more than threshold
+    """
+    regressions = []
+    for name, seconds in results["results"].items():
+        before = baseline["results"].get(name)
+        if before and seconds>before*(1+threshold):
+            regressions.append((name, before, seconds, seconds/before))
+    return regressions
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,273 @@
+from .rules import (OSIRIS_ORDER, STATUE_SPOTS, REGION_STATUE, STATUE_REGIONS, STATUE_BITS, OSIRIS_SHIFTS, OSIRIS_REGION_MASKS,
+                    ROW_MASKS, COL_MASKS, NEIGHBOR_MASKS)
+from .zobrist import BOARD_KEYS, board_hash
+
+
+class Board(object):
+    """
+    Bitmask board state. One int per piece type and owner, so copying or hashing it is a handful of ints.
+      - pillars: 25 bits, row*5 + col
+      - horizontal/vertical: 5 bits, Temple Building row/col
+      - osiris: 24 bits, OSIRIS_ORDER index*6 + value-1
+      - statues: 10 bits, STATUE_SPOTS order
+    Owners are {None, Bot, Player} like the rest of Game.
+
+    pillar_buckets[v] is the mask of empty cells where a new pillar scores v VPs before the die bonus:
+    1 per Temple Building in line and 1 per neighbor pillar or board edge. Kept up to date on every placement.
+
+    The majority ledger is kept the same way:
+      - osiris_winners[region]: (winner, player_count, bot_count) with the region statue counted
+      - osiris_swings[region]: True if a Bot statue on the free region statue would change the winner
+      - temple_vps[owner]: Temple Pillars VPs the owner would score now
+
+    zobrist is the Zobrist hash of the masks, see tekhenu.zobrist. Also kept up to date on every placement.
+    """
+    __slots__ = (
+        "bot_pillars", "player_pillars", "bot_horizontal", "player_horizontal", "bot_vertical", "player_vertical",
+        "bot_osiris", "player_osiris", "bot_statues", "player_statues", "pillar_buckets",
+        "osiris_winners", "osiris_swings", "temple_vps", "zobrist",
+    )
+
+    def __init__(self, state=None, pillar_buckets=None, ledger=None, zobrist=None):
+        (self.bot_pillars, self.player_pillars, self.bot_horizontal, self.player_horizontal,
+         self.bot_vertical, self.player_vertical, self.bot_osiris, self.player_osiris,
+         self.bot_statues, self.player_statues) = state or (0,)*10
+        if pillar_buckets is None:
+            self.rebuild_pillar_buckets()
+        else:
+            self.pillar_buckets = pillar_buckets
+        if ledger is None:
+            self.rebuild_ledger()
+        else:
+            self.osiris_winners, self.osiris_swings, self.temple_vps = ledger
+        self.zobrist = board_hash(self.state()) if zobrist is None else zobrist
+
+    def state(self):
+        """
+        Returns: tuple of all masks in __slots__ order
+        """
+        return (self.bot_pillars, self.player_pillars, self.bot_horizontal, self.player_horizontal,
+                self.bot_vertical, self.player_vertical, self.bot_osiris, self.player_osiris,
+                self.bot_statues, self.player_statues)
+
+    def clone(self):
+        return Board(self.state(), list(self.pillar_buckets), (dict(self.osiris_winners), dict(self.osiris_swings), dict(self.temple_vps)),
+                     self.zobrist)
+
+    def rebuild_pillar_buckets(self):
+        """
+        Recompute pillar_buckets from scratch.
+        """
+        pillars = self.bot_pillars | self.player_pillars
+        horizontal = self.bot_horizontal | self.player_horizontal
+        vertical = self.bot_vertical | self.player_vertical
+        self.pillar_buckets = [0]*7
+        for cell in range(25):
+            if not pillars>>cell & 1:
+                r, c = cell//5, cell%5
+                edges = 4 - NEIGHBOR_MASKS[cell].bit_count()
+                vps = (horizontal>>r & 1) + (vertical>>c & 1) + edges + (pillars & NEIGHBOR_MASKS[cell]).bit_count()
+                self.pillar_buckets[vps] |= 1<<cell
+
+    def raise_pillar_values(self, cells):
+        # Every empty cell in mask cells is worth 1 more VP
+        buckets = self.pillar_buckets
+        for vps in range(5, -1, -1):
+            moving = buckets[vps] & cells
+            if moving:
+                buckets[vps] ^= moving
+                buckets[vps+1] |= moving
+
+    def best_pillar_spots(self):
+        """
+        Returns:
+          - (vps, mask) of the empty pillar cells worth the most VPs before the die bonus. (0, 0) if the Temple is full.
+        """
+        for vps in range(6, -1, -1):
+            if self.pillar_buckets[vps]:
+                return vps, self.pillar_buckets[vps]
+        return 0, 0
+
+    def osiris_result(self, region, statue):
+        """
+        Winner of an Osiris region. Most pieces, the region statue included. Topmost piece if tied.
+        Params:
+          - region (str): {Papyrus ... Granite}
+          - statue (str): {None, Bot, Player} owner of the region statue
+        Returns:
+          - winner (str): {None, Bot, Player}
+          - player_count, bot_count (int): Pieces per player
+        """
+        mask = OSIRIS_REGION_MASKS[region]
+        bot, player = self.bot_osiris & mask, self.player_osiris & mask
+        bot_count = bot.bit_count() + (statue=="Bot")
+        player_count = player.bit_count() + (statue=="Player")
+        winner = None
+
+        if player_count>bot_count:
+            winner = "Player"
+        elif player_count<bot_count:
+            winner = "Bot"
+        elif statue:
+            winner = statue
+        elif bot|player:
+            # Topmost building is the lowest bit
+            topmost = (bot|player) & -(bot|player)
+            winner = "Bot" if bot & topmost else "Player"
+
+        return winner, player_count, bot_count
+
+    def update_osiris(self, region):
+        statue = self.statue(REGION_STATUE[region])
+        self.osiris_winners[region] = self.osiris_result(region, statue)
+        self.osiris_swings[region] = statue is None and self.osiris_result(region, "Bot")[0]!=self.osiris_winners[region][0]
+
+    def line_vps(self, pillars, horizontal, vertical, statues):
+        # Temple Pillars VPs: 1 per own building or Temple statue in line with each own pillar
+        vps = 0
+        for i in range(5):
+            if horizontal>>i & 1:
+                vps += (pillars & ROW_MASKS[i]).bit_count()
+            if vertical>>i & 1:
+                vps += (pillars & COL_MASKS[i]).bit_count()
+        if statues & STATUE_BITS["Temple_Horizontal"]:
+            vps += (pillars & ROW_MASKS[2]).bit_count()
+        if statues & STATUE_BITS["Temple_Vertical"]:
+            vps += (pillars & COL_MASKS[2]).bit_count()
+        return vps
+
+    def rebuild_ledger(self):
+        """
+        Recompute the majority ledger from scratch.
+        """
+        self.osiris_winners, self.osiris_swings = {}, {}
+        for region in OSIRIS_ORDER:
+            self.update_osiris(region)
+        self.temple_vps = {
+            "Bot": self.line_vps(self.bot_pillars, self.bot_horizontal, self.bot_vertical, self.bot_statues),
+            "Player": self.line_vps(self.player_pillars, self.player_horizontal, self.player_vertical, self.player_statues),
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.state()==other.state()
+
+    def __hash__(self):
+        return hash(self.state())
+
+    def statue(self, spot):
+        bit = STATUE_BITS[spot]
+        return "Bot" if self.bot_statues & bit else "Player" if self.player_statues & bit else None
+
+    def place_statue(self, spot, owner):
+        bit = STATUE_BITS[spot]
+        if owner=="Bot":
+            if not self.bot_statues & bit:
+                self.zobrist ^= BOARD_KEYS[8][bit.bit_length()-1]
+            self.bot_statues |= bit
+            pillars = self.bot_pillars
+        else:
+            if not self.player_statues & bit:
+                self.zobrist ^= BOARD_KEYS[9][bit.bit_length()-1]
+            self.player_statues |= bit
+            pillars = self.player_pillars
+        if spot in STATUE_REGIONS:
+            for region in STATUE_REGIONS[spot]:
+                self.update_osiris(region)
+        elif spot=="Temple_Horizontal":
+            self.temple_vps[owner] += (pillars & ROW_MASKS[2]).bit_count()
+        elif spot=="Temple_Vertical":
+            self.temple_vps[owner] += (pillars & COL_MASKS[2]).bit_count()
+
+    def pillar(self, row, col):
+        bit = 1<<(5*row+col)
+        return "Bot" if self.bot_pillars & bit else "Player" if self.player_pillars & bit else None
+
+    def place_pillar(self, row, col, owner):
+        cell = 5*row+col
+        if owner=="Bot":
+            if not self.bot_pillars>>cell & 1:
+                self.zobrist ^= BOARD_KEYS[0][cell]
+            self.bot_pillars |= 1<<cell
+            horizontal, vertical, statues = self.bot_horizontal, self.bot_vertical, self.bot_statues
+        else:
+            if not self.player_pillars>>cell & 1:
+                self.zobrist ^= BOARD_KEYS[1][cell]
+            self.player_pillars |= 1<<cell
+            horizontal, vertical, statues = self.player_horizontal, self.player_vertical, self.player_statues
+        self.temple_vps[owner] += (horizontal>>row & 1) + (vertical>>col & 1)
+        if row==2 and statues & STATUE_BITS["Temple_Horizontal"]:
+            self.temple_vps[owner] += 1
+        if col==2 and statues & STATUE_BITS["Temple_Vertical"]:
+            self.temple_vps[owner] += 1
+        for vps in range(7):
+            self.pillar_buckets[vps] &= ~(1<<cell)
+        self.raise_pillar_values(NEIGHBOR_MASKS[cell])
+
+    def temple_masks(self, side):
+        # (bot, player) masks of a Temple side
+        if side=="Horizontal":
+            return self.bot_horizontal, self.player_horizontal
+        elif side=="Vertical":
+            return self.bot_vertical, self.player_vertical
+        raise KeyError(side)
+
+    def temple_building(self, side, rowcol):
+        bot, player = self.temple_masks(side)
+        bit = 1<<rowcol
+        return "Bot" if bot & bit else "Player" if player & bit else None
+
+    def place_temple_building(self, side, rowcol, owner):
+        bit = 1<<rowcol
+        bot, player = self.temple_masks(side)
+        if not (bot|player) & bit:
+            self.raise_pillar_values(ROW_MASKS[rowcol] if side=="Horizontal" else COL_MASKS[rowcol])
+        if side=="Horizontal" and owner=="Bot":
+            field = 2
+        elif side=="Horizontal":
+            field = 3
+        elif side=="Vertical" and owner=="Bot":
+            field = 4
+        elif side=="Vertical":
+            field = 5
+        else:
+            raise KeyError(side)
+        if not (player if field & 1 else bot) & bit:
+            self.zobrist ^= BOARD_KEYS[field][rowcol]
+        if field==2:
+            self.bot_horizontal |= bit
+        elif field==3:
+            self.player_horizontal |= bit
+        elif field==4:
+            self.bot_vertical |= bit
+        else:
+            self.player_vertical |= bit
+        pillars = self.bot_pillars if owner=="Bot" else self.player_pillars
+        self.temple_vps[owner] += (pillars & (ROW_MASKS[rowcol] if side=="Horizontal" else COL_MASKS[rowcol])).bit_count()
+
+    def osiris_building(self, region, row):
+        bit = 1<<(OSIRIS_SHIFTS[region]+row)
+        return "Bot" if self.bot_osiris & bit else "Player" if self.player_osiris & bit else None
+
+    def place_osiris_building(self, region, row, owner):
+        cell = OSIRIS_SHIFTS[region]+row
+        if owner=="Bot":
+            if not self.bot_osiris>>cell & 1:
+                self.zobrist ^= BOARD_KEYS[6][cell]
+            self.bot_osiris |= 1<<cell
+        else:
+            if not self.player_osiris>>cell & 1:
+                self.zobrist ^= BOARD_KEYS[7][cell]
+            self.player_osiris |= 1<<cell
+        self.update_osiris(region)
+
+    def statues_view(self):
+        return {spot: self.statue(spot) for spot in STATUE_SPOTS}
+
+    def osiris_view(self):
+        return {region: [self.osiris_building(region, row) for row in range(6)] for region in OSIRIS_ORDER}
+
+    def temple_view(self):
+        return {side: [self.temple_building(side, i) for i in range(5)] for side in ("Horizontal", "Vertical")}
+
+    def pillars_view(self):
+        return [[self.pillar(r, c) for c in range(5)] for r in range(5)]
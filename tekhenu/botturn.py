@@ -0,0 +1,197 @@
+import random
+from collections import OrderedDict, namedtuple
+
+from .events import DieTaken, PieceBuilt
+from .rules import VP_CATEGORIES
+from .search import outcomes
+
+"""
+Exact distribution of a Bot turn.
+
+The Bot turn only draws from the rng to break ties, so every way it can go is found by running it once per
+combination of tie-breaks (see tekhenu.search.outcomes), each with its probability. Outcomes with the same die,
+pieces and counter changes are merged.
+
+A turn depends on the pyramid action, the dice, the board, the Horus order and a few counters, so distributions are
+kept in an LRU cache keyed on just those. Games that differ in VPs, cards or round reach the same entry.
+"""
+
+# Tie-break combinations run per turn. A Bot turn has far fewer, so the distribution is exact
+MAX_BRANCHES = 4096
+
+# Game counters a Bot turn may change, besides the vp_breakdown categories
+COUNTERS = [
+    "vps", "scribes", "happiness", "population", "blessings", "technologies", "decrees",
+    "number_built_buildings", "number_built_pillars", "number_built_statues",
+]
+
+# One way a Bot turn goes. delta is {counter or VP category: change}, nonzero only. built is ((piece, location) ..)
+# choices are the tie-breaks taken, as values, for apply_outcome(). god, polarity and die are None if the Bot passed
+BotOutcome = namedtuple("BotOutcome", "probability god polarity die action built delta choices")
+
+
+class RecordingRandom(object):
+    """
+    Passes draws on to rng and keeps what every choice returned.
+    """
+    def __init__(self, rng):
+        self.rng = rng
+        self.choices = []
+
+    def choice(self, seq):
+        value = self.rng.choice(seq)
+        self.choices.append(value)
+        return value
+
+    def sample(self, population, k):
+        value = self.rng.sample(population, k)
+        self.choices.append(value)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self.rng, name)
+
+
+class ForcedRandom(object):
+    """
+    Gives back recorded tie-breaks in order, so a turn goes the way it went when they were recorded.
+    Choices are matched by value, not index, as dice of equal states may be listed in another order.
+    """
+    def __init__(self, choices):
+        self.choices = iter(choices)
+
+    def choice(self, seq):
+        value = next(self.choices)
+        if value not in seq:
+            raise ValueError("Tie-break {} is not one of {}".format(value, seq))
+        return value
+
+    def sample(self, population, k):
+        return next(self.choices)
+
+
+class Recorder(object):
+    """
+    Sink that keeps the die taken and the pieces built.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.taken = None
+        self.built = []
+
+    def emit(self, event):
+        if type(event) is DieTaken:
+            self.taken = event
+        elif type(event) is PieceBuilt:
+            self.built.append((event.piece, event.location))
+
+
+def bot_action(game, round_number):
+    """
+    Returns: pyramid action (str) the Bot plays in round_number
+    """
+    return game.bot_pyramid[game.bot_actions[(round_number-1)%4]]
+
+
+def turn_key(game, round_number):
+    """
+    Returns: tuple. Everything bot_turn reads, so two games with the same key have the same Bot turn distribution.
+    Board and dice come in as their Zobrist hashes.
+    """
+    return (bot_action(game, round_number), game.board.zobrist, game.dice_pool.zobrist, game.dice_pool.first_sunny,
+            tuple(game.horus_order), game.happiness, game.population, game.number_built_buildings,
+            game.number_built_pillars, game.number_built_statues, id(game.rules))
+
+
+def run_turn(game, round_number, rng):
+    """
+    Returns: (god, polarity, die, action, built, delta, choices) of bot_turn played on a copy of game with rng
+    """
+    recorder = Recorder()
+    rng = RecordingRandom(rng)
+    child = game.clone(sink=recorder, rng=rng)
+    child.bot_turn(round_number)
+    delta = {}
+    for counter in COUNTERS:
+        change = getattr(child, counter) - getattr(game, counter)
+        if change:
+            delta[counter] = change
+    for category in VP_CATEGORIES:
+        change = child.vp_breakdown[category] - game.vp_breakdown[category]
+        if change:
+            delta[category] = change
+    taken = recorder.taken
+    if taken is None:
+        # The Bot found no die to take and passed
+        return None, None, None, bot_action(game, round_number), (), delta, tuple(rng.choices)
+    return taken.god, taken.polarity, taken.die, taken.action, tuple(recorder.built), delta, tuple(rng.choices)
+
+
+class BotTurns(object):
+    """
+    Bot turn distributions, cached on turn_key with least recently used eviction.
+    Params:
+      - size (int): distributions kept
+    """
+    def __init__(self, size=4096):
+        self.size = size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def distribution(self, game, round_number):
+        """
+        Every way the Bot turn of round_number can go from the current state of game. game is left as it is.
+        Returns: [BotOutcome ..], most likely first. Probabilities add up to 1
+        """
+        key = turn_key(game, round_number)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return result
+        self.misses += 1
+
+        merged = OrderedDict()
+        fallback = random.Random(0)
+        for probability, (god, polarity, die, action, built, delta, choices) in outcomes(
+                lambda rng: run_turn(game, round_number, rng), fallback, MAX_BRANCHES):
+            outcome_key = (god, polarity, die, built, tuple(sorted(delta.items())))
+            if outcome_key in merged:
+                merged[outcome_key] = merged[outcome_key]._replace(probability=merged[outcome_key].probability+probability)
+            else:
+                merged[outcome_key] = BotOutcome(probability, god, polarity, die, action, built, delta, choices)
+        result = sorted(merged.values(), key=lambda outcome: -outcome.probability)
+
+        self.cache[key] = result
+        if len(self.cache)>self.size:
+            self.cache.popitem(last=False)
+        return result
+
+    def expected(self, game, round_number):
+        """
+        Returns: {counter or VP category: expected change} over the Bot turn of round_number
+        """
+        totals = {}
+        for outcome in self.distribution(game, round_number):
+            for name, change in outcome.delta.items():
+                totals[name] = totals.get(name, 0) + outcome.probability*change
+        return totals
+
+    def __len__(self):
+        return len(self.cache)
+
+
+def apply_outcome(game, round_number, outcome):
+    """
+    Play the Bot turn of round_number on game the way outcome went, events and all.
+    Params:
+      - outcome (BotOutcome): from BotTurns.distribution of this game state
+    """
+    rng = game.rng
+    game.rng = ForcedRandom(outcome.choices)
+    try:
+        game.bot_turn(round_number)
+    finally:
+        game.rng = rng
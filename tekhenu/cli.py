@@ -0,0 +1,316 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from .dice import roll_dice
+from .engine import Game
+from .events import ConsoleSink
+from .journal import JournalSink, replay, find_divergence
+from .policies import ConsolePolicy
+from .rng import seeded_random
+from .rules import GOD_ORDER, Ruleset
+from .simulate import DEFAULT_CONFIG, POLICIES, RNGS
+from .snapshot import DIFFICULTIES, file_autosave
+
+"""
+Command line entry point. `python -m tekhenu play|replay|serve|simulate|compare|sweep|bench|benchmark`
+
+Every command imports what only it needs in its handler, so a console game does not load the server, the
+process pools or the search.
+"""
+
+# Board used by `play` when no seed is given
+DEMO_SETUP = {
+    "horus_order": GOD_ORDER,
+    "first_sunny": "Ra",
+    "starting_dice": {
+        'Horus': [("Bread",3), ("Granite",5), ("Limestone",3), ("Granite", 6)],
+        'Ra': [("Gray",1), ("Granite",2)],
+        'Hathor': [("Bread",3)],
+        'Bastet':[("Papyrus",6), ("Papyrus",2), ("Gray",1), ("Limestone",1)],
+        'Thoth':[("Limestone",5), ("Gray",3 )],
+        'Osiris':[("Gray",3), ("Gray",2), ("Granite",5), ("Granite",4)]
+    },
+}
+
+
+def print_results(results):
+    print("{} games".format(results.pop("games")))
+    for category, stats in results.items():
+        line = "{:<24}{mean:>8.2f} +/- {std:.2f}  [{min}, {max}]".format(category, **stats)
+        if "quantiles" in stats:
+            line += "  p5 {p5}  p50 {p50}  p95 {p95}".format(**stats["quantiles"])
+        print(line)
+
+
+def progress_printer(interval=2.0, field="mean", label="Bot mean"):
+    """
+    Returns: simulate progress callback that prints at most every interval seconds, and at the end, the Total field
+    of the summary so far
+    """
+    start = time.perf_counter()
+    last = [start]
+
+    def report(done, total, summary):
+        now = time.perf_counter()
+        if now-last[0]<interval and done<total:
+            return
+        last[0] = now
+        print("{}/{} games, {:.0f} games/s, {} {:.2f}".format(
+            done, total, done/(now-start), label, summary.as_dict()["Total"][field]), file=sys.stderr)
+    return report
+
+
+def run_batch(n_games, config, seed):
+    # NumPy is only loaded when the batch engine is asked for
+    from .batch import simulate_batch
+    return simulate_batch(n_games, config, seed=seed)
+
+
+def play(args):
+    forecaster, policy = None, None
+    if args.forecast:
+        from .forecast import Forecaster, ForecastingConsolePolicy
+        forecaster = Forecaster()
+        policy = ForecastingConsolePolicy(forecaster)
+    if args.hint:
+        from .search import HintPolicy
+        policy = HintPolicy(policy or ConsolePolicy(), args.hint_budget)
+    try:
+        start_game(args, policy)
+    finally:
+        if forecaster:
+            forecaster.close()
+
+
+def start_game(args, policy):
+    autosave = file_autosave(args.save) if args.save else None
+    if args.resume:
+        with open(args.resume, "rb") as f:
+            game = Game.from_bytes(f.read(), policy=policy, autosave=autosave)
+        game.game_loop()
+        return
+
+    # A BlockRandom stream snapshots as its seed and draw count, a few bytes against 2.5KB of Mersenne state
+    rng = seeded_random(args.seed if args.seed is not None else random.getrandbits(63))
+    if args.seed is None:
+        setup = DEMO_SETUP
+    else:
+        setup = {"horus_order": rng.sample(GOD_ORDER, 6), "first_sunny": rng.choice(GOD_ORDER), "starting_dice": roll_dice(rng)}
+    horus_order, first_sunny = list(setup["horus_order"]), setup["first_sunny"]
+    starting_dice = {god: list(dice) for god, dice in setup["starting_dice"].items()}
+    if not args.journal:
+        Game(args.difficulty, horus_order, first_sunny, starting_dice, policy=policy, rng=rng, autosave=autosave).game_loop()
+        return
+    with open(args.journal, "wb") as f:
+        sink = JournalSink(f, args.difficulty, horus_order, first_sunny, starting_dice, rng, forward=ConsoleSink())
+        Game(args.difficulty, horus_order, first_sunny, starting_dice, policy=policy, sink=sink, rng=rng, autosave=autosave).game_loop()
+
+
+def run_replay(args):
+    with open(args.journal, "rb") as f:
+        recorded = f.read()
+    start = time.perf_counter()
+    game, replayed = replay(recorded)
+    elapsed = time.perf_counter()-start
+    print("Replayed in {:.1f}ms. Bot has {} VPs".format(1000*elapsed, game.vps))
+    for category, vps in game.vp_breakdown.items():
+        print("{:<18}{:>4}".format(category, vps))
+    divergence = find_divergence(recorded, replayed)
+    if divergence is not None:
+        print("Replay differs from the journal in round {} ({}): recorded {}, replayed {}".format(
+            divergence.round_number, divergence.turn, divergence.recorded, divergence.replayed))
+
+
+def serve(args):
+    import asyncio
+    from .server import GameServer
+    server = GameServer(args.sessions, idle_timeout=args.idle, max_sessions=args.max_sessions)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+def run_simulate(args):
+    from .simulate import simulate
+    config = {"difficulty": args.difficulty, "policy": args.policy, "rng": args.rng, "store": args.store, "streaming": args.stream}
+    if args.batch:
+        results = run_batch(args.games, config, args.seed)
+    else:
+        config["metrics"] = args.metrics is not None
+        results = simulate(args.games, config, workers=args.workers, seed=args.seed,
+                           progress=progress_printer() if args.progress else None)
+    metrics = results.pop("metrics", None)
+    print_results(results)
+    if metrics is not None:
+        with open(args.metrics, "w") as f:
+            f.write(metrics.prometheus() if args.metrics.endswith(".prom") else metrics.to_json())
+
+
+def run_compare(args):
+    from .paired import paired
+    configs = []
+    for policy, rules in ((args.policy_a, args.rules_a), (args.policy_b, args.rules_b)):
+        configs.append({"difficulty": args.difficulty, "policy": policy,
+                        "rules": Ruleset(**json.loads(rules)) if rules else None})
+    results = paired(args.games, configs[0], configs[1], workers=args.workers, seed=args.seed, confidence=args.confidence,
+                     progress=progress_printer(field="difference", label="B minus A") if args.progress else None)
+    print("{} game pairs, B minus A with {:.0%} intervals".format(results.pop("games"), results.pop("confidence")))
+    for category, stats in results.items():
+        line = "{:<24}{a:>8.2f}{b:>8.2f}{difference:>+8.2f}".format(category, **stats)
+        if stats["interval"] is not None:
+            line += "  [{:+.2f}, {:+.2f}]".format(*stats["interval"])
+        if stats["variance_reduction"] is not None:
+            # Games independent runs would need for the same interval, per pair played here
+            line += "  x{:.1f} fewer games".format(stats["variance_reduction"])
+        print(line)
+
+
+def run_sweep(args):
+    from .sweep import sweep, strongest
+
+    def report(done, total, record):
+        print("{}/{} cells. {} {} first sunny {}: Bot mean {:.2f}".format(
+            done, total, record["difficulty"], " ".join(record["horus_order"]), record["first_sunny"],
+            record["results"]["Total"]["mean"]), file=sys.stderr)
+
+    records = sweep(args.output, args.games, args.difficulty, args.sample, args.policy, args.rng, args.seed, args.workers,
+                    args.store, report)
+    print("Strongest setups for the Bot over {} cells".format(len(records)))
+    for record in strongest(records, args.top):
+        stats = record["results"]["Total"]
+        # Standard error of the mean, to tell a strong setup from a lucky one
+        error = stats["std"]/record["results"]["games"]**0.5
+        print("{:<8}{:<40}{:<8}{:>8.2f} +/- {:.2f}".format(record["difficulty"], " ".join(record["horus_order"]),
+                                                         record["first_sunny"], stats["mean"], error))
+
+
+def bench(args):
+    from .simulate import simulate
+    config = {"difficulty": args.difficulty, "policy": args.policy, "rng": args.rng}
+    start = time.perf_counter()
+    if args.batch:
+        run_batch(args.games, config, args.seed)
+    else:
+        simulate(args.games, config, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter()-start
+    print("{} games in {:.2f}s, {:.0f} games/s".format(args.games, elapsed, args.games/elapsed))
+
+
+def run_benchmark(args):
+    from . import benchmark
+    unknown = [name for name in args.only or () if name not in benchmark.MICRO_BENCHMARKS and name not in benchmark.THROUGHPUT_BENCHMARKS]
+    if unknown:
+        sys.exit("Unknown benchmark {}. Pick from {}".format(" ".join(unknown),
+                                                            " ".join(list(benchmark.MICRO_BENCHMARKS) + list(benchmark.THROUGHPUT_BENCHMARKS))))
+
+    def report(name, seconds):
+        if name.startswith("games_"):
+            print("{:<24}{:>12.0f} games/s".format(name, 1/seconds))
+        else:
+            print("{:<24}{:>12.2f} us/call".format(name, 1e6*seconds))
+
+    config = {"difficulty": args.difficulty, "policy": args.policy}
+    results = benchmark.run_suite(args.only, args.games, args.batch_games, args.repeat, config, report)
+    if args.output:
+        benchmark.save(results, args.output)
+    if args.baseline:
+        regressions = benchmark.compare(results, benchmark.load(args.baseline), args.threshold)
+        for name, before, seconds, ratio in regressions:
+            print("Slower: {} {:.3g}s -> {:.3g}s ({:+.0%})".format(name, before, seconds, ratio-1))
+        if regressions:
+            sys.exit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tekhenu", description="Solo bot for Tekhenu, Obelisk of the Sun")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play_parser = commands.add_parser("play", help="play against the bot on the console")
+    play_parser.add_argument("--difficulty", default="Medium", choices=["Easy", "Medium", "Hard"])
+    play_parser.add_argument("--seed", type=int, help="roll a random setup from this seed instead of the demo board")
+    play_parser.add_argument("--save", help="snapshot file rewritten after every round")
+    play_parser.add_argument("--resume", help="carry on a game from a snapshot file")
+    play_parser.add_argument("--journal", help="record every move of a new game to this file")
+    play_parser.add_argument("--forecast", action="store_true", help="forecast the Bot score in the background. Type ? at the die prompt")
+    play_parser.add_argument("--hint", action="store_true", help="suggest the die that leaves the Bot the fewest VPs")
+    play_parser.add_argument("--hint-budget", type=float, default=0.2, help="seconds to search per hint. With no time to search the hint is the highest die")
+    play_parser.set_defaults(run=play)
+
+    replay_parser = commands.add_parser("replay", help="replay a game from its journal without prompts")
+    replay_parser.add_argument("journal")
+    replay_parser.set_defaults(run=run_replay)
+
+    serve_parser = commands.add_parser("serve", help="host many console games over a socket")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=7777)
+    serve_parser.add_argument("--unix", help="listen on this Unix socket instead of host:port")
+    serve_parser.add_argument("--sessions", default="sessions", help="directory for sessions evicted to disk")
+    serve_parser.add_argument("--idle", type=float, default=600, help="seconds before an idle session is evicted")
+    serve_parser.add_argument("--max-sessions", type=int, default=500, help="sessions kept in memory")
+    serve_parser.set_defaults(run=serve)
+
+    for name, run, games, help in (("simulate", run_simulate, 1000, "score statistics over headless games"),
+                                   ("bench", bench, 2000, "time headless games")):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument("games", type=int, nargs="?", default=games)
+        sub.add_argument("--difficulty", default=DEFAULT_CONFIG["difficulty"], choices=["Easy", "Medium", "Hard"])
+        sub.add_argument("--policy", default=DEFAULT_CONFIG["policy"], choices=list(POLICIES))
+        sub.add_argument("--rng", default=DEFAULT_CONFIG["rng"], choices=list(RNGS))
+        sub.add_argument("--workers", type=int, help="processes to use. Defaults to all cores")
+        sub.add_argument("--seed", type=int, default=0)
+        sub.add_argument("--batch", action="store_true", help="use the NumPy batch engine")
+        sub.set_defaults(run=run)
+        if name=="simulate":
+            sub.add_argument("--metrics", help="write Bot timings and tie-break counts here. Prometheus text for a .prom "
+                                               "file, JSON otherwise. Not for --batch")
+            sub.add_argument("--store", help="append every game to the columnar result store in this directory")
+            sub.add_argument("--stream", action="store_true", help="streaming statistics: quantiles, histograms and end-state counters")
+            sub.add_argument("--progress", action="store_true", help="report the running mean after every chunk of games")
+
+    compare_parser = commands.add_parser("compare", help="paired Bot score difference of two policies or rule variants")
+    compare_parser.add_argument("games", type=int, nargs="?", default=1000, help="game pairs")
+    compare_parser.add_argument("--difficulty", default=DEFAULT_CONFIG["difficulty"], choices=["Easy", "Medium", "Hard"])
+    compare_parser.add_argument("--policy-a", default=DEFAULT_CONFIG["policy"], choices=list(POLICIES))
+    compare_parser.add_argument("--policy-b", default=DEFAULT_CONFIG["policy"], choices=list(POLICIES))
+    compare_parser.add_argument("--rules-a", help='Ruleset arguments of arm A as JSON, e.g. {"total_statues": 5}')
+    compare_parser.add_argument("--rules-b", help="Ruleset arguments of arm B as JSON")
+    compare_parser.add_argument("--confidence", type=float, default=0.95, help="level of the intervals")
+    compare_parser.add_argument("--workers", type=int, help="processes to use. Defaults to all cores")
+    compare_parser.add_argument("--seed", type=int, default=0)
+    compare_parser.add_argument("--progress", action="store_true", help="report the running mean after every chunk of games")
+    compare_parser.set_defaults(run=run_compare)
+
+    sweep_parser = commands.add_parser("sweep", help="Bot scores per Horus order, first sunny God and difficulty")
+    sweep_parser.add_argument("output", help="JSON lines file of finished cells. Cells already in it are not played again")
+    sweep_parser.add_argument("--games", type=int, default=100, help="games per cell")
+    sweep_parser.add_argument("--difficulty", nargs="+", default=DIFFICULTIES, choices=DIFFICULTIES)
+    sweep_parser.add_argument("--sample", type=int, help="cells to draw at random instead of the whole grid")
+    sweep_parser.add_argument("--policy", default=DEFAULT_CONFIG["policy"], choices=list(POLICIES))
+    sweep_parser.add_argument("--rng", default=DEFAULT_CONFIG["rng"], choices=list(RNGS))
+    sweep_parser.add_argument("--seed", type=int, default=0)
+    sweep_parser.add_argument("--workers", type=int, help="processes to use. Defaults to all cores")
+    sweep_parser.add_argument("--store", help="also append every game to the columnar result store in this directory")
+    sweep_parser.add_argument("--top", type=int, default=10, help="strongest setups to list")
+    sweep_parser.set_defaults(run=run_sweep)
+
+    benchmark_parser = commands.add_parser("benchmark", help="time the Bot's hot paths and game throughput")
+    benchmark_parser.add_argument("--only", nargs="+", help="benchmarks to run, e.g. bot_turn games_headless. All by default")
+    benchmark_parser.add_argument("--games", type=int, default=500, help="games per timing of the headless engines")
+    benchmark_parser.add_argument("--batch-games", type=int, default=20000, help="games per timing of the batch engine")
+    benchmark_parser.add_argument("--repeat", type=int, default=5, help="timings per benchmark, the best is kept")
+    benchmark_parser.add_argument("--difficulty", default=DEFAULT_CONFIG["difficulty"], choices=["Easy", "Medium", "Hard"])
+    benchmark_parser.add_argument("--policy", default=DEFAULT_CONFIG["policy"], choices=list(POLICIES))
+    benchmark_parser.add_argument("--output", help="save the results as JSON")
+    benchmark_parser.add_argument("--baseline", help="JSON results to compare with. Exits 1 on a regression")
+    benchmark_parser.add_argument("--threshold", type=float, default=0.1, help="slowdown allowed before failing, 0.1 for 10%%")
+    benchmark_parser.set_defaults(run=run_benchmark)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
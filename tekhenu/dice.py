@@ -0,0 +1,161 @@
+import random
+
+from .rules import STANDARD_RULES, GOD_ORDER, DICE_COLORS, POLARITIES
+from .zobrist import DICE_KEYS, MAX_COPIES, dice_hash
+
+
+class DicePool(object):
+    """
+    Dice on the board, indexed for the bot die picks. Kept up to date on every removal and refill.
+      - dice: {god: [(color, value) ... ] ..} in the order they were added
+      - by_god: {(god, polarity): [[(color, value) ..] per value 0-6]}
+      - by_color: {(color, polarity): [[god of each die ..] per value 0-6]}
+    Buckets keep the order dice were added, so random tie-breaks see the same lists as a scan of dice would.
+    zobrist is the Zobrist hash of the dice of every God as a multiset, see tekhenu.zobrist.
+    """
+    def __init__(self, dice, first_sunny, rules=STANDARD_RULES):
+        """
+        Params:
+          - dice (dict): {god: [(color, value) ... ] ..}. Kept and updated in place.
+          - first_sunny (str): {Horus ... Osiris} sunny God the polarities are based on
+          - rules (Ruleset): lighting of the dice colors
+        """
+        self.dice = dice
+        self.first_sunny = first_sunny
+        self.polarity_table, self.polarity_changes, self.god_polarities = rules.polarity_table, rules.polarity_changes, rules.god_polarities
+        self.by_god = {(god, polarity): [[] for _ in range(7)] for god in GOD_ORDER for polarity in POLARITIES}
+        self.by_color = {(color, polarity): [[] for _ in range(7)] for color in rules.lighting for polarity in POLARITIES}
+        for god in dice:
+            for die in dice[god]:
+                self.index(god, die)
+        self.zobrist = dice_hash(dice)
+
+    def clone(self):
+        """
+        Returns: DicePool with copies of the dice and buckets. Cheaper than indexing the dice again.
+        """
+        pool = DicePool.__new__(DicePool)
+        pool.dice = {god: list(dice) for god, dice in self.dice.items()}
+        pool.first_sunny = self.first_sunny
+        pool.polarity_table, pool.polarity_changes, pool.god_polarities = self.polarity_table, self.polarity_changes, self.god_polarities
+        pool.by_god = {key: [list(bucket) for bucket in buckets] for key, buckets in self.by_god.items()}
+        pool.by_color = {key: [list(bucket) for bucket in buckets] for key, buckets in self.by_color.items()}
+        pool.zobrist = self.zobrist
+        return pool
+
+    def polarity(self, god, color):
+        """
+        Returns: polarity (str) of a die of color on god under the current lighting
+        """
+        return self.polarity_table[(self.first_sunny, god, color)]
+
+    def rotate(self, first_sunny):
+        """
+        Move the wheel to a new sunny God. Only the buckets of Gods and values with a die whose polarity changes
+        are touched: by_color moves those dice, by_god rebuilds those values in one pass over the God's dice.
+        """
+        old, self.first_sunny = self.first_sunny, first_sunny
+        by_god, by_color = self.by_god, self.by_color
+        for god, dice in self.dice.items():
+            # {color: (old polarity, new polarity)} of the colors that change on this God
+            changes = self.polarity_changes[(old, first_sunny, god)]
+            if not changes:
+                continue
+            values = set()
+            for color, value in dice:
+                change = changes.get(color)
+                if change is not None:
+                    values.add(value)
+                    by_color[(color, change[0])][value].remove(god)
+                    by_color[(color, change[1])][value].append(god)
+            if not values:
+                continue
+            # Board order within the rebuilt buckets, so tie-breaks see the same lists as a fresh index
+            buckets = {polarity: by_god[(god, polarity)] for polarity in POLARITIES}
+            for bucket in buckets.values():
+                for value in values:
+                    bucket[value] = []
+            polarities = self.god_polarities[(first_sunny, god)]
+            for die in dice:
+                if die[1] in values:
+                    buckets[polarities[die[0]]][die[1]].append(die)
+
+    def index(self, god, die):
+        polarity = self.polarity(god, die[0])
+        self.by_god[(god, polarity)][die[1]].append(die)
+        self.by_color[(die[0], polarity)][die[1]].append(god)
+
+    def unindex(self, god, die, polarity):
+        self.by_god[(god, polarity)][die[1]].remove(die)
+        self.by_color[(die[0], polarity)][die[1]].remove(god)
+
+    def add(self, god, die):
+        self.zobrist ^= DICE_KEYS[(god, die[0], die[1])][self.dice[god].count(die) % MAX_COPIES]
+        self.dice[god].append(die)
+        self.index(god, die)
+
+    def remove(self, god, polarity, die):
+        """
+        Take a die off the board. Raises KeyError or ValueError if it is not there with that polarity.
+        """
+        if polarity not in POLARITIES:
+            raise KeyError(polarity)
+        if die not in self.dice[god] or self.polarity(god, die[0])!=polarity:
+            raise ValueError("{} {} {} not available".format(god, polarity, die))
+        self.dice[god].remove(die)
+        self.unindex(god, die, polarity)
+        self.zobrist ^= DICE_KEYS[(god, die[0], die[1])][self.dice[god].count(die) % MAX_COPIES]
+
+    def top_god_dice(self, god):
+        """
+        Returns:
+          - (pure, tainted) lists of the highest valued non Forbidden dice on god. Both empty if none.
+        """
+        for value in range(6, 0, -1):
+            pure, tainted = self.by_god[(god, "Pure")][value], self.by_god[(god, "Tainted")][value]
+            if pure or tainted:
+                return pure, tainted
+        return [], []
+
+    def top_color_dice(self, color):
+        """
+        Returns:
+          - [(god, polarity, (color, value)) ..] highest valued non Forbidden dice of color, in God order of dice
+        """
+        for value in range(6, 0, -1):
+            pure, tainted = self.by_color[(color, "Pure")][value], self.by_color[(color, "Tainted")][value]
+            if pure or tainted:
+                candidates = [(god, "Pure", (color, value)) for god in pure] + [(god, "Tainted", (color, value)) for god in tainted]
+                order = {god: i for i, god in enumerate(self.dice)}
+                candidates.sort(key=lambda x: order[x[0]])
+                return candidates
+        return []
+
+    def has_legal_pick(self):
+        """
+        Returns: boolean. True if any die is not Forbidden
+        """
+        by_god = self.by_god
+        return any(any(by_god[(god, polarity)]) for god in GOD_ORDER for polarity in ("Pure", "Tainted"))
+
+    def legal_picks(self):
+        """
+        Returns: [(god, polarity, (color, value)) ..] every non Forbidden die, God by God, Pure first
+        """
+        return [(god, polarity, die) for god in self.dice for polarity in ("Pure", "Tainted")
+                for die in self.dice[god] if self.polarity(god, die[0])==polarity]
+
+    def view(self):
+        """
+        Returns: {god: {"Forbidden": [(color, value) ..], "Pure": [..], "Tainted": [..]} ..}
+        """
+        return {god: {polarity: [die for die in self.dice[god] if self.polarity(god, die[0])==polarity] for polarity in POLARITIES}
+                for god in self.dice}
+
+
+def roll_dice(rng=random, per_god=3):
+    """
+    Random starting dice for a headless game.
+    Returns: {god: [(color, value) ... ] ..}
+    """
+    return {god: [(rng.choice(DICE_COLORS), rng.randint(1, 6)) for _ in range(per_god)] for god in GOD_ORDER}
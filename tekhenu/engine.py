@@ -0,0 +1,983 @@
+import math
+import random
+from collections import namedtuple
+
+from .board import Board
+from .dice import DicePool
+from .events import (NullSink, ConsoleSink, DestinyCard, PyramidBuilt, PhaseStarted, PhaseEnded, TurnOrder, DiceShown, DieTaken,
+                     StatueBonus, PieceBuilt, BuildFailed, InputRejected, VPsScored, HappinessGained, CardsTaken, DiceAdded,
+                     BalanceDeclared, Debug)
+from . import snapshot, zobrist
+from .metrics import timed
+from .policies import ConsolePolicy
+from .rng import StreamRandom
+from .rules import (STANDARD_RULES, GOD_ORDER, BOT_BASE_ACTIONS, POSSIBLE_BOT_ACTIONS, OSIRIS_ORDER, VP_CATEGORIES, STATUE_BITS, OSIRIS_REGION_MASKS, ROW_MASKS, COL_MASKS,
+                    LINE_ROW_MASKS, LINE_COL_MASKS, CENTER_MASKS, mask_cells)
+
+
+# Version of the game rules as played by Game. Bump it with every change that can alter how a game goes,
+# so results cached against it, like sweep cells, are simulated again
+ENGINE_VERSION = 1
+
+# A question for the Player side. god and die are the taken die for "change", god is the region for "new_die"
+Decision = namedtuple("Decision", "kind round_number god die")
+
+
+class Game(object):
+    def __init__(self, difficulty, horus_order, first_sunny, starting_dice, policy=None, sink=None, rng=None, rules=None, autosave=None,
+                 metrics=None):
+        """
+        Board state setup and bot init
+        Params:
+          - difficulty (str): {Easy, Medium, Hard}
+          - horus_order (list): 6 Gods in order from 1-6 on Horus
+          - first_sunny (str): {Horus ... Osiris} starting sunny God
+          - starting_dice (dict): {god: [(color, value) ... ] ..} starting dice on the board. 3 per God.
+          - policy (PlayerPolicy): drives the Player side and dice refills. Console prompts if None.
+          - sink: receives the game events. ConsoleSink if None, NullSink to run silently.
+          - rng (random.Random): source of every random draw in this game. The global random module if None.
+            A rng.StreamRandom splits the draws by kind, see stream().
+          - rules (Ruleset): house rules. Standard rules if None.
+          - autosave (callable): called with a snapshot (bytes) after every round. See tekhenu.snapshot.
+          - metrics (Metrics): collects Bot timings and tie-break counts. None to run without. See tekhenu.metrics.
+        """
+        self.attach(policy, sink, rng, rules, autosave, metrics)
+        self.difficulty = difficulty
+        self.round_number = 0
+        self.horus_order = horus_order 
+        self.first_sunny = first_sunny 
+        
+        # god: [(color, value) ... ] ..}
+        self.starting_dice = starting_dice  
+
+        self.dice_pool = DicePool(self.starting_dice, self.first_sunny, self.rules)
+       
+        self.board = Board()
+        
+        self.vps = 0
+        self.vp_breakdown = dict.fromkeys(VP_CATEGORIES, 0)
+        self.scribes = 0
+        self.number_built_buildings = 0
+        self.number_built_pillars = 0
+        self.number_built_statues = 0
+        self.happiness = self.rules.starting_happiness
+        self.population = self.rules.starting_population
+        self.blessings = 0
+        self.technologies = 0
+        self.decrees = 0
+        self.player_order = ["Bot", "Player"]
+        
+        card = self.stream("card").choice(["Gold", "Scribe"])
+        if self.sink.enabled:
+            self.sink.emit(DestinyCard(card))
+        
+        self.build_statue(1)
+        
+        if difficulty=="Medium" or difficulty=="Hard":
+            self.build_osiris_building(5, "Bread")
+            self.build_osiris_building(5, "Granite")
+            self.build_pillar(None, setup=True)     
+        
+        if difficulty=="Hard":
+            self.build_statue(4)
+        
+        self.bot_pyramid = self.stream("pyramid").sample(BOT_BASE_ACTIONS, 10)
+        self.bot_actions = self.stream("actions").choice(POSSIBLE_BOT_ACTIONS)
+        if self.sink.enabled:
+            self.sink.emit(PyramidBuilt(self.bot_pyramid, self.bot_actions))
+
+    def attach(self, policy=None, sink=None, rng=None, rules=None, autosave=None, metrics=None):
+        """
+        Plug in everything that drives the game without being game state. Defaults as in __init__.
+        """
+        self.policy = policy if policy is not None else ConsolePolicy()
+        self.sink = sink if sink is not None else ConsoleSink()
+        self.rng = rng if rng is not None else random
+        self.rules = rules if rules is not None else STANDARD_RULES
+        self.autosave = autosave
+        self.metrics = metrics
+
+    def clone(self, policy=None, sink=None, rng=None):
+        """
+        Copy of the game state for search and rollouts. Board, dice and counters are copied, rules are shared.
+        Params:
+          - policy, rng: as in __init__. This game's rng if None
+          - sink: NullSink if None
+        """
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.attach(policy, sink if sink is not None else NullSink(), rng if rng is not None else self.rng, self.rules)
+        game.horus_order = list(self.horus_order)
+        game.player_order = list(self.player_order)
+        game.bot_pyramid = list(self.bot_pyramid)
+        game.vp_breakdown = dict(self.vp_breakdown)
+        game.board = self.board.clone()
+        game.dice_pool = self.dice_pool.clone()
+        game.starting_dice = game.dice_pool.dice
+        return game
+
+    def stream(self, name):
+        """
+        Returns: random stream for draws of kind name, one of rng.STREAMS, in the round being played.
+        This game's rng unless it is a rng.StreamRandom, which keeps a stream per kind and round.
+        """
+        if isinstance(self.rng, StreamRandom):
+            return self.rng.stream(name, self.round_number)
+        return self.rng
+
+    def state_hash(self):
+        """
+        Returns: int. Zobrist hash of everything that decides how the game goes on, see tekhenu.zobrist.
+        Board and dice parts are kept up to date as the game is played, so this is a few XORs.
+        """
+        return self.board.zobrist ^ self.dice_pool.zobrist ^ zobrist.game_hash(self)
+
+    def to_bytes(self):
+        """
+        Returns: bytes. Versioned binary snapshot of the game, see tekhenu.snapshot
+        """
+        return snapshot.dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data, policy=None, sink=None, rng=None, rules=None, autosave=None):
+        """
+        Rebuild a game from to_bytes() output. It resumes after its last finished round on game_loop().
+        The random stream is restored from the snapshot unless rng is given.
+        """
+        return snapshot.loads(cls, data, policy, sink, rng, rules, autosave)
+            
+    @property
+    def available_dice(self):
+        """
+        Read-only {god: {"Forbidden": [(color, value) ... ], "Pure": [...], "Tainted": [...]} ..} view of self.dice_pool
+        """
+        return self.dice_pool.view()
+
+    @property
+    def built_statues(self):
+        """
+        Read-only {spot: owner} view of self.board statues
+        """
+        return self.board.statues_view()
+
+    @property
+    def built_osiris_buildings(self):
+        """
+        Read-only {region: [owner per value 1-6]} view of self.board Osiris buildings
+        """
+        return self.board.osiris_view()
+
+    @property
+    def built_temple_buildings(self):
+        """
+        Read-only {Horizontal/Vertical: [owner per row/col]} view of self.board Temple buildings
+        """
+        return self.board.temple_view()
+
+    @property
+    def built_temple_pillars(self):
+        """
+        Read-only 5x5 [row][col] owner view of self.board pillars
+        """
+        return self.board.pillars_view()
+
+    @timed
+    def build_statue(self, value):
+        """
+        Build a statue following Horus action logic with die value.
+
+        Build on God. If occupied, build on biggest impact Osiris. If none, build on Temple with most pillars. Score 3VPs if still not possible.
+
+        Params:
+          - value (int): 1-6
+        Returns:
+          - boolean. True if succesfully built, False otherwise
+        """
+        if self.number_built_statues==self.rules.total_statues:
+            if self.metrics is not None:
+                self.metrics.fallback("statue_supply_empty")
+            if self.sink.enabled:
+                self.sink.emit(BuildFailed("Statue"))
+            return False
+        
+        god = self.horus_order[value-1]
+        if self.board.statue(god) == None:
+            # If god spot free, build there
+            key = god
+            self.board.place_statue(key, "Bot")
+        else:
+            # Calculate which Osiris row has most impact in terms of ownership change
+            impacts = {}
+            for group in self.stream("tiebreak").sample([("Papyrus", "Bread"), ("Limestone", "Granite")], 2):
+                impact = 0
+                for region in group:
+                    if self.board.osiris_swings[region]:
+                        impact += 1
+                impacts[group] = impact
+
+            if impacts:        
+                # Build on spot with max impact. If tied, pick randomly since we randomized the order when examining.             
+                best_region = max(impacts, key=lambda x: impacts[x])
+                impact = impacts[best_region]
+                if impact>0:
+                    key = "_".join(best_region)
+                    self.board.place_statue(key, "Bot")
+                    if self.metrics is not None:
+                        self.metrics.fallback("statue_on_osiris")
+
+            if not impacts or impact==0:
+                # Either no impact or both Osiris occupied. Look at Temple next.
+                horizontal_pillars, vertical_pillars = 0,0 
+                if self.board.statue("Temple_Horizontal") == None:
+                    horizontal_pillars = (self.board.bot_pillars & ROW_MASKS[2]).bit_count()
+                if self.board.statue("Temple_Vertical") == None:
+                    vertical_pillars = (self.board.bot_pillars & COL_MASKS[2]).bit_count()
+                
+                # Build on row/col with more pillars. 
+                if self.metrics is not None and (horizontal_pillars or vertical_pillars):
+                    self.metrics.fallback("statue_on_temple")
+                if horizontal_pillars>vertical_pillars:
+                    key = "Temple_Horizontal"
+                    self.board.place_statue(key, "Bot")
+                    if self.sink.enabled:
+                        self.sink.emit(VPsScored("Temple statue", {"Actions": 3*horizontal_pillars}, {}))
+                    self.score("Actions", 3*horizontal_pillars)
+                elif horizontal_pillars<vertical_pillars:
+                    key = "Temple_Vertical"
+                    self.board.place_statue(key, "Bot")
+                    if self.sink.enabled:
+                        self.sink.emit(VPsScored("Temple statue", {"Actions": 3*vertical_pillars}, {}))
+                    self.score("Actions", 3*vertical_pillars)
+                    
+                # Both equal. Pick randomly
+                elif horizontal_pillars!=0:
+                    key = self.stream("tiebreak").choice(["Temple_Horizontal", "Temple_Vertical"])
+                    if self.metrics is not None:
+                        self.metrics.tie_break("build_statue")
+                    self.board.place_statue(key, "Bot")
+                    vps = 3*horizontal_pillars if key=="Temple_Horizontal" else 3*vertical_pillars
+                    if self.sink.enabled:
+                        self.sink.emit(VPsScored("Temple statue", {"Actions": vps}, {}))
+                    self.score("Actions", vps)
+                
+                # Both Temple occupied
+                else:
+                    if self.metrics is not None:
+                        self.metrics.fallback("statues_occupied")
+                    if self.sink.enabled:
+                        self.sink.emit(VPsScored("Statues occupied", {"Actions": 3}, {}))
+                    self.score("Actions", 3)
+                    return False
+                
+
+        self.number_built_statues += 1
+        if self.sink.enabled:
+            self.sink.emit(PieceBuilt("Bot", "Statue", key, self.number_built_statues, self.built_statues))
+        return True
+               
+    @timed
+    def build_osiris_building(self, value, resource=None):
+        """
+        Build an Osiris Building following Osiris action logic with die value and resource.
+
+        Build on spot referenced by resource, value. If occupied, cycle through resources first and values descending next.
+
+        Params:
+          - value (int), resource (str): 1-6, One of {Papyrus, .. Granite}
+        Returns:
+          - boolean. True if succesfully built, False otherwise
+        """
+
+        if self.number_built_buildings==self.rules.total_buildings:
+            if self.metrics is not None:
+                self.metrics.fallback("osiris_building_supply_empty")
+            if self.sink.enabled:
+                self.sink.emit(BuildFailed("Osiris_Building"))
+            return False
+        
+        for probe, (resource, value) in enumerate(self.rules.osiris_probes[(resource, value)]):
+            if self.board.osiris_building(resource, value) == None:
+                break
+        if probe and self.metrics is not None:
+            self.metrics.fallback("osiris_spot_taken")
+
+        self.board.place_osiris_building(resource, value, "Bot")
+        self.number_built_buildings += 1
+        if self.sink.enabled:
+            self.sink.emit(PieceBuilt("Bot", "Osiris_Building", (resource, value+1), self.number_built_buildings, self.built_osiris_buildings))
+        return True
+             
+    @timed
+    def build_pillar(self, value, setup=False):
+        """
+        Build a Pillar following Ra action logic with die value.
+
+        Build on spot with most VPs gain. If multiple, pick most inline with Temple Buildings. Random if still tied.
+
+        Params:
+          - value (int), setup (bool): 1-6. Set to true to seed board with pillar on 2,2 without scoring VPs
+        Returns:
+          - boolean. True if succesfully built, False otherwise
+        """
+
+        if self.number_built_pillars==self.rules.total_pillars:
+            if self.metrics is not None:
+                self.metrics.fallback("pillar_supply_empty")
+            if self.sink.enabled:
+                self.sink.emit(BuildFailed("Pillar"))
+            return False
+        
+        if setup:
+            final_row, final_col = 2,2
+            max_vps = 0
+
+        else:
+            board = self.board
+            bucket_vps, candidates = board.best_pillar_spots()
+            if not candidates:
+                if self.metrics is not None:
+                    self.metrics.fallback("temple_full")
+                if self.sink.enabled:
+                    self.sink.emit(BuildFailed("Pillar"))
+                return False
+            max_vps = bucket_vps + math.ceil(value/2)
+
+            # Pick the best VPS
+            if candidates & (candidates-1):
+                # If multiple max VPs, pick the one with most Bot buildings
+                shortlist = candidates & (LINE_ROW_MASKS[board.bot_horizontal] | LINE_COL_MASKS[board.bot_vertical])
+                if not shortlist:
+                    shortlist = candidates
+                # If multiple bot buildings, pick the one closer to center
+                for center_mask in CENTER_MASKS:
+                    if shortlist & center_mask:
+                        candidates = shortlist & center_mask
+                        break
+
+            spots = mask_cells(candidates)
+            if len(spots)==1:
+                final_row, final_col = spots[0]
+            else:
+                # If multiple closest to center, pick random
+                final_row, final_col = self.stream("tiebreak").choice(spots)
+                if self.metrics is not None:
+                    self.metrics.tie_break("build_pillar")
+        
+        self.board.place_pillar(final_row, final_col, "Bot")
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Pillar", {"Actions": max_vps}, {}))
+        self.score("Actions", max_vps)
+
+        self.number_built_pillars += 1
+        if self.sink.enabled:
+            self.sink.emit(PieceBuilt("Bot", "Pillar", (final_row, final_col), self.number_built_pillars, self.built_temple_pillars))
+        return True
+        
+    @timed
+    def build_temple_building(self, value):
+        """
+        Build a Temple Building following Hathor action logic with die value.
+
+        Build on spot with most VPs gain. Random if tied.
+
+        Params:
+          - value (int): 1-6
+        Returns:
+          - boolean. True if succesfully built, False otherwise
+        """
+
+        if self.number_built_buildings==self.rules.total_buildings:
+            if self.metrics is not None:
+                self.metrics.fallback("temple_building_supply_empty")
+            if self.sink.enabled:
+                self.sink.emit(BuildFailed("Temple_Building"))
+            return False
+
+        all_pillars = {}
+        # Count number of pillars on Horizontal and Vertical lines for all spots.
+        for i in range(5):
+            if self.board.temple_building("Horizontal", i) == None:
+                num_pillars = (self.board.bot_pillars & ROW_MASKS[i]).bit_count()
+                all_pillars[("Horizontal", i)] = num_pillars
+            if self.board.temple_building("Vertical", i) == None:
+                num_pillars = (self.board.bot_pillars & COL_MASKS[i]).bit_count()
+                all_pillars[("Vertical", i)] = num_pillars
+
+        if not all_pillars:
+            # Every Temple spot has a building
+            if self.metrics is not None:
+                self.metrics.fallback("temple_buildings_full")
+            if self.sink.enabled:
+                self.sink.emit(BuildFailed("Temple_Building"))
+            return False
+        
+        max_spot = max(all_pillars, key=lambda x: all_pillars[x])
+        most_pillars = all_pillars[max_spot]
+        candidates = [x for x in all_pillars if all_pillars[x]==most_pillars]
+        if len(candidates)==1:
+            position, row = candidates[0]
+        else:
+            position, row = self.stream("tiebreak").choice(candidates)
+            if self.metrics is not None:
+                self.metrics.tie_break("build_temple_building")
+        vps = 3*most_pillars
+
+        self.number_built_buildings += 1
+        self.population += value
+        self.score("Actions", vps)
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Temple Building", {"Actions": vps}, {"population": value}))
+        self.board.place_temple_building(position, row, "Bot")
+        if self.sink.enabled:
+            self.sink.emit(PieceBuilt("Bot", "Temple_Building", (position, row), self.number_built_buildings, self.built_temple_buildings))
+        return True
+
+    @timed
+    def assign_polarity(self):
+        """
+        Based on lighting condition, reclassify polarity of the dice in self.dice_pool. Called on every Rotation Phase.
+        Returns: self.dice_pool
+        """
+        self.dice_pool.rotate(self.first_sunny)
+        return self.dice_pool
+                    
+    def statue_bonus(self, god):
+        """
+        Horus rewards for bot. VP, Scribe or both. Depends on randomized Horus order.
+        """
+        scribes, vps = self.rules.statue_bonus[self.horus_order.index(god)]
+        self.scribes += scribes
+        if vps:
+            self.score("Statue Bonus", vps)
+        if self.sink.enabled:
+            self.sink.emit(StatueBonus("Bot", god, scribes, vps))
+        return 
+
+    def score(self, category, vps):
+        """
+        Add VPs to the bot total and to its VP_CATEGORIES breakdown.
+        """
+        self.vps += vps
+        self.vp_breakdown[category] += vps
+
+    def player_turn(self, round_number):
+        """
+        Ask the player policy for a die selection and board state changes. Board state changes loop till the policy stops.
+        Retry on incorrect input for interactive policies.
+
+        Params:
+          - round_number (int): 1-16
+
+        """
+        self.drive(self.player_turn_steps(round_number))
+        return True
+
+    def player_turn_steps(self, round_number):
+        """
+        player_turn as a generator. Yields a Decision for every Player input and takes the answer back through send().
+        """
+        if self.sink.enabled:
+            self.sink.emit(PhaseStarted("Player turn", round_number))
+        self.print_dice(heading=True)
+
+        if not self.dice_pool.has_legal_pick():
+            # Every die left is Forbidden. The Player passes
+            if self.sink.enabled:
+                self.sink.emit(PhaseEnded("Player turn", round_number, self.vps))
+            return
+
+        # Get dice selection and remove from pool
+        while True:    
+            dice_selection = yield Decision("die", round_number, None, None)
+        
+            #Delete from selection
+            try:
+                god, polarity, dice = dice_selection[0], dice_selection[1], tuple([dice_selection[2][0], int(dice_selection[2][1])])
+                self.dice_pool.remove(god, polarity, dice)
+                if self.sink.enabled:
+                    self.sink.emit(DieTaken("Player", god, polarity, dice, None))
+                #Statue bonus check
+                if self.board.statue(god)=="Player": 
+                    if self.sink.enabled:
+                        self.sink.emit(StatueBonus("Player", god, None, None))
+                elif self.board.statue(god)=="Bot":
+                    self.statue_bonus(god)
+
+            except (KeyError, ValueError, IndexError, TypeError):
+                if not self.policy.interactive:
+                    raise self.policy.error("Policy selected unavailable dice {}".format(dice_selection))
+                if self.sink.enabled:
+                    self.sink.emit(InputRejected("die"))
+                continue
+            
+            break
+    
+        # Get board state changes, one per Decision till the answer is None
+        while True:
+            change = yield Decision("change", round_number, god, dice)
+            if change is None:
+                break
+            command, location = change
+            if not self.player_build(command, location) and not self.policy.interactive:
+                raise self.policy.error("Policy made invalid board change {} {}".format(command, location))
+
+        if self.sink.enabled:
+            self.sink.emit(PhaseEnded("Player turn", round_number, self.vps))
+
+    def player_build(self, command, location):
+        """
+        Record a piece built by the Player.
+
+        Params:
+          - command (str): {Statue, Pillar, Temple_Building, Osiris_Building}
+          - location: Statue location (str), Pillar (row, col), Temple Building (Horizontal/Vertical, row/col) or Osiris Building (resource, 1-6)
+        Returns:
+          - boolean. True if succesfully built, False otherwise
+        """
+        if command=="Statue":
+            try:
+                assert not self.board.statue(location)
+                self.board.place_statue(location, "Player")
+                if self.sink.enabled:
+                    self.sink.emit(PieceBuilt("Player", command, location, None, self.built_statues))
+            except (AssertionError, KeyError):
+                if self.sink.enabled:
+                    self.sink.emit(InputRejected(command))
+                return False
+        
+        elif command=="Pillar":
+            try:
+                row, col = location
+                assert 0<=row<5 and 0<=col<5
+                assert not self.board.pillar(row, col)
+                self.board.place_pillar(row, col, "Player")
+                if self.sink.enabled:
+                    self.sink.emit(PieceBuilt("Player", command, (row, col), None, self.built_temple_pillars))
+            except (AssertionError, TypeError, ValueError):
+                if self.sink.enabled:
+                    self.sink.emit(InputRejected(command))
+                return False
+        
+        elif command=="Temple_Building":
+            try:
+                side, rowcol = location
+                assert 0<=rowcol<5
+                assert not self.board.temple_building(side, rowcol)
+                self.board.place_temple_building(side, rowcol, "Player")
+                if self.sink.enabled:
+                    self.sink.emit(PieceBuilt("Player", command, (side, rowcol), None, self.built_temple_buildings))
+            except (AssertionError, KeyError, TypeError, ValueError):
+                if self.sink.enabled:
+                    self.sink.emit(InputRejected(command))
+                return False
+
+        elif command=="Osiris_Building":
+            try:
+                resource, row = location[0], location[1]-1
+                assert 0<=row<6
+                assert not self.board.osiris_building(resource, row)
+                self.board.place_osiris_building(resource, row, "Player")
+                if self.sink.enabled:
+                    self.sink.emit(PieceBuilt("Player", command, (resource, row+1), None, self.built_osiris_buildings))
+            except (AssertionError, KeyError, IndexError, TypeError):
+                if self.sink.enabled:
+                    self.sink.emit(InputRejected(command))
+                return False
+
+        else:
+            if self.sink.enabled:
+                self.sink.emit(InputRejected("command"))
+            return False
+
+        return True
+
+    def add_dice(self, region):
+        """
+        Refill a God with a new die from the player policy. Called on every Rotation Phase.
+
+        Params:
+          - region (str): {Horus ... Osiris}
+        """
+        self.drive(self.add_dice_steps(region))
+
+    def add_dice_steps(self, region):
+        """
+        add_dice as a generator, see player_turn_steps.
+        """
+        while True:
+            try:
+                c, d = yield Decision("new_die", None, region, None)
+                d = int(d)
+                if c not in self.rules.lighting or d<1 or d>6:
+                    raise ValueError
+            except (TypeError, ValueError):
+                if not self.policy.interactive:
+                    raise self.policy.error("Policy added invalid dice to {}".format(region))
+                if self.sink.enabled:
+                    self.sink.emit(InputRejected("new die"))
+                continue
+            self.dice_pool.add(region, (c,d))
+            if self.sink.enabled:
+                self.sink.emit(DiceAdded(region, (c,d)))
+            return
+  
+    @timed
+    def bot_turn(self, round_number):
+        """
+        Main bot action selection according to pyramid. 
+        
+        For god action, evaluate highest available dice. Pure if tied. Random otherwise. Move to next God if None.
+        For resource action, evaluate highest dice of that color. Statue if tied. Highest if multuple. Random if no statue. Next color if none.
+        
+        Params:
+          - round_number (int): 1-16
+        """
+
+        if self.sink.enabled:
+            self.sink.emit(PhaseStarted("Bot turn", round_number))
+        self.print_dice(heading=True)
+
+        action_number = self.bot_actions[(round_number-1)%4]
+        action = self.bot_pyramid[action_number]
+
+        def god_die_pick(god):
+            # pick highest pure/tainted
+            pure, tainted = self.dice_pool.top_god_dice(god)
+            if self.metrics is not None and len(pure or tainted)>1:
+                self.metrics.tie_break("god_die_pick")
+            if pure:
+                return "Pure", self.stream("tiebreak").choice(pure)
+            elif tainted:
+                return "Tainted", self.stream("tiebreak").choice(tainted)
+            return None, None
+
+        def color_die_pick(color):
+            # pick highest of that color
+            candidates = self.dice_pool.top_color_dice(color)
+            
+            if len(candidates)==1:
+                return candidates[0]
+            elif len(candidates)==0:
+                return None, None, None
+            else:
+                shortlist = [x for x in candidates if self.board.statue(x[0])=="Bot"]
+                if self.sink.enabled:
+                    self.sink.emit(Debug("SL", shortlist))
+                if self.metrics is not None:
+                    self.metrics.tie_break("color_die_pick_horus" if shortlist else "color_die_pick")
+                if shortlist:
+                    for god in self.horus_order[::-1]:
+                        for x in shortlist:
+                            if x[0]==god:
+                                return x
+                else:
+                    return self.stream("tiebreak").choice(candidates)
+            
+        die_pick = None
+        if action in GOD_ORDER:
+            activated_god = action
+            # Every God once, going back from the action's
+            for _ in range(6):
+                polarity, die_pick = god_die_pick(activated_god)
+                if die_pick:
+                    break
+                else:         
+                    if self.metrics is not None:
+                        self.metrics.fallback("next_god")
+                    current = GOD_ORDER.index(activated_god)
+                    activated_god = GOD_ORDER[(current-1)%6]
+                    continue
+
+        else:
+            for color in action.split('/'):
+                activated_god, polarity, die_pick = color_die_pick(color)
+                if die_pick:
+                    break
+                else:
+                    if self.metrics is not None:
+                        self.metrics.fallback("next_color")
+                    continue
+
+        if not die_pick:
+            # Nothing the action can take, e.g. only Forbidden or Gray dice left. The Bot passes, as in BatchGame
+            if self.metrics is not None:
+                self.metrics.fallback("no_die")
+            if self.sink.enabled:
+                self.sink.emit(PhaseEnded("Bot turn", round_number, self.vps))
+            return
+
+        if self.sink.enabled:
+            self.sink.emit(DieTaken("Bot", activated_god, polarity, die_pick, action))
+        self.dice_pool.remove(activated_god, polarity, die_pick)
+        #Statue bonus check
+        if self.board.statue(activated_god)=="Player": 
+            if self.sink.enabled:
+                self.sink.emit(StatueBonus("Player", activated_god, None, None))
+        elif self.board.statue(activated_god)=="Bot":
+            self.statue_bonus(activated_god)
+
+        self.do_bot_action(activated_god, die_pick[0], die_pick[1])
+        if self.sink.enabled:
+            self.sink.emit(PhaseEnded("Bot turn", round_number, self.vps))
+
+    def do_bot_action(self, activated_god, color, value):
+        """
+        Evaluate the bot action with the selection
+        Params:
+          - activated_god (str): {Horus ... Osiris}
+          - color (str): {Papyrus ... Granite}
+          - value (int): 1-6
+        """
+        if activated_god == "Horus":
+            self.build_statue(value)
+
+        elif activated_god == "Ra":
+            self.build_pillar(value)
+
+        elif activated_god == "Hathor":
+            self.build_temple_building(value)
+        
+        elif activated_god == "Bastet":
+            gap = min(max(self.population-self.happiness, -6), 6)
+            scribes_gained, happiness, population = self.rules.bastet[(gap, value)]
+            self.scribes += scribes_gained
+            self.happiness += happiness
+            self.population += population
+            if self.sink.enabled:
+                self.sink.emit(HappinessGained(self.happiness, self.population, scribes_gained))
+
+        elif activated_god == "Thoth":
+            dec, tech, bless, zone = self.rules.thoth_cards[min(self.happiness, self.rules.thoth_cap)][value]
+            self.decrees += dec
+            self.technologies += tech
+            self.blessings += bless
+            if self.sink.enabled:
+                self.sink.emit(CardsTaken(dec, tech, bless, zone))
+
+        elif activated_god == "Osiris":
+            if color == "Gray":
+                built = self.board.bot_osiris | self.board.player_osiris
+                empty_spots = {region: 6-(built & OSIRIS_REGION_MASKS[region]).bit_count() for region in OSIRIS_ORDER}
+                most_empty_region = max(empty_spots, key=lambda x: empty_spots[x])
+                most_empty = empty_spots[most_empty_region]
+                for region in OSIRIS_ORDER:
+                    if empty_spots[region]==most_empty:
+                        resource = region
+                        break
+            else:
+                resource = color
+            self.build_osiris_building(value, resource)
+
+    def osiris_building_scoring(self, region, statue):
+        """
+        Select winner of the Osiris region.
+        Most pieces. Topmost piece if tied.
+
+        Params:
+          - region (str): {Papyrus ... Granite}
+          - statue (str): {None, Bot, Player}
+        Returns:
+          - winner (str): {None, Bot, Player}
+          - player_count, bot_count (int): Pieces per player
+        """
+        return self.board.osiris_result(region, statue)
+
+    @timed
+    def osiris_scoring(self):
+        """
+        3 VPs for Bot for every Osiris region it wins
+        """
+        for region in OSIRIS_ORDER:
+            winner, player_count, bot_count = self.board.osiris_winners[region]
+            if winner=="Bot":
+                self.score("Osiris", 3)
+            if self.sink.enabled:
+                self.sink.emit(VPsScored("Osiris", {"Osiris": 3 if winner=="Bot" else 0}, {
+                    "region": region, "winner": winner, "player": player_count, "bot": bot_count}))
+
+    @timed
+    def temple_scoring(self):
+        """
+        Calculate VPs scored by Player and Bot for Pillars and Temple Buildings
+        """
+        board = self.board
+        temple_statues = STATUE_BITS["Temple_Horizontal"] | STATUE_BITS["Temple_Vertical"]
+        bot_count = board.bot_horizontal.bit_count() + board.bot_vertical.bit_count() + (board.bot_statues & temple_statues).bit_count()
+        player_count = board.player_horizontal.bit_count() + board.player_vertical.bit_count() + (board.player_statues & temple_statues).bit_count()
+        self.score("Temple Buildings", bot_count)
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Temple Buildings", {"Temple Buildings": bot_count}, {"player": player_count}))
+
+        bot_count, player_count = board.temple_vps["Bot"], board.temple_vps["Player"]
+        self.score("Temple Pillars", bot_count)
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Temple Pillars", {"Temple Pillars": bot_count}, {"player": player_count}))
+
+    @timed
+    def statue_scoring(self):
+        """
+        Statue VPs for Bot. 1/3/6/10...
+        """
+        statue_vps = self.rules.statue_vps[self.number_built_statues]
+        self.score("Statues", statue_vps)
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Statues", {"Statues": statue_vps}, {}))
+
+    @timed
+    def happiness_scoring(self):
+        """
+        Happiness VPs for Bot. 3*triangles reached.
+        """
+        happy_vps = self.rules.happiness_vps[min(self.happiness, self.rules.happiness_cap)]
+        
+        self.score("Happiness", happy_vps)
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Happiness", {"Happiness": happy_vps}, {}))
+
+    @timed
+    def card_scoring(self):
+        """
+        Card VPs for Bot. 2 per blessing (discard), 2 per tech (keep)
+        """
+        blessing_vps, tech_vps = 2*self.blessings, 2*self.technologies
+        self.score("Blessings", blessing_vps)
+        self.score("Technologies", tech_vps)
+        self.blessings = 0
+        if self.sink.enabled:
+            self.sink.emit(VPsScored("Cards", {"Blessings": blessing_vps, "Technologies": tech_vps}, {}))
+
+    def print_dice(self, heading=False):
+        """
+        Helper function to send the available dice to the sink
+        """
+        if self.sink.enabled:
+            self.sink.emit(DiceShown(self.available_dice, heading))
+
+    def game_loop(self):
+        """
+        Main game flow loop to iterate 1-16 rounds. Turns in player order. Trigger Rotation, Maat, Scoring and End when applicable.
+        Starts after the last finished round, so a game loaded from a snapshot carries on where it was saved.
+        """
+        self.drive(self.play())
+
+    def drive(self, steps):
+        """
+        Run a generator of Decisions to the end, answering each from the player policy.
+        """
+        answer = None
+        changes = None
+        try:
+            while True:
+                decision = steps.send(answer)
+                if decision.kind=="die":
+                    changes = None
+                    answer = self.policy.select_die(self, decision.round_number)
+                elif decision.kind=="change":
+                    if changes is None:
+                        changes = iter(self.policy.board_changes(self, decision.round_number, decision.god, decision.die))
+                    answer = next(changes, None)
+                elif decision.kind=="balance":
+                    answer = self.policy.balance(self, decision.round_number)
+                else:
+                    answer = self.policy.new_die(self, decision.god)
+        except StopIteration:
+            pass
+
+    def play(self, turns_done=0):
+        """
+        game_loop as a generator. Yields a Decision whenever the Player side has to answer and takes the answer back
+        through send(), so a caller can run many games without blocking on any of them.
+        turns_done skips the turns already played in the first round, to carry on a game snapshotted mid round.
+
+        Decision kinds and answers:
+          - die: (god, polarity, (color, value)) as PlayerPolicy.select_die
+          - change: (command, location) for player_build, or None when the Player turn is over
+          - balance: int as PlayerPolicy.balance
+          - new_die: (color, value) to add to Decision.god
+        """
+        for round_number in range(self.round_number+1, 17):
+            
+            for turn in self.player_order[turns_done:]:
+                if turn == "Player":
+                    yield from self.player_turn_steps(round_number)
+                else:
+                    self.bot_turn(round_number)
+            turns_done = 0
+            
+            if round_number%2==0:
+                # move wheel
+                start = GOD_ORDER.index(self.first_sunny)+1
+                self.first_sunny = GOD_ORDER[start%6]
+                
+                if round_number%4==0:
+                    if self.sink.enabled:
+                        self.sink.emit(PhaseStarted("Maat", round_number))
+
+                    # Check balance, assign turn order
+                    player_balance = yield Decision("balance", round_number, None, None)
+                    if self.sink.enabled:
+                        self.sink.emit(BalanceDeclared(player_balance, round_number))
+                    bot_balance = max(4-(round_number/4), 1) #3,2,1,1
+                    if player_balance<bot_balance:
+                        self.player_order = ["Player", "Bot"]
+                        if self.sink.enabled:
+                            self.sink.emit(TurnOrder("Player"))
+                    else:
+                        self.player_order = ["Bot", "Player"]
+                        card = self.stream("card").choice(["Gold", "Scribe"])
+                        if self.sink.enabled:
+                            self.sink.emit(TurnOrder("Bot"))
+                            self.sink.emit(DestinyCard(card))
+
+                    # Remake action pyramid
+                    self.bot_pyramid = self.stream("pyramid").sample(BOT_BASE_ACTIONS, 10)
+                    self.bot_actions = self.stream("actions").choice(POSSIBLE_BOT_ACTIONS)
+                    if self.sink.enabled:
+                        self.sink.emit(PyramidBuilt(self.bot_pyramid, self.bot_actions))
+
+
+                    if round_number%8==0:
+                        if self.sink.enabled:
+                            self.sink.emit(PhaseStarted("Scoring", round_number))
+
+                        self.osiris_scoring()
+                        self.temple_scoring()
+                        self.statue_scoring()     
+                        self.happiness_scoring()                   
+                        self.card_scoring()
+                        if self.sink.enabled:
+                            self.sink.emit(PhaseEnded("Scoring", round_number, self.vps))
+
+                        if round_number%16==0:
+                            # 3 VPs for being first, 4 per decree, 0.5 per scribe
+                            to_vps = 0
+                            if self.player_order[0]=="Bot":
+                                to_vps = 3                    
+                            decree_vps = 4*self.decrees
+                            scribe_vps = self.scribes//2
+
+                            self.score("Decrees", decree_vps)
+                            self.score("Scribes", scribe_vps)
+                            self.score("Turn Order", to_vps)
+                            if self.sink.enabled:
+                                self.sink.emit(VPsScored("Final", {"Decrees": decree_vps, "Scribes": scribe_vps, "Turn Order": to_vps}, {}))
+                                self.sink.emit(PhaseEnded("Game", round_number, self.vps))
+                            self.end_round(round_number)
+                            return
+                            
+                    
+                for shady in [GOD_ORDER[(start+2)%6]]*2 + [GOD_ORDER[(start+5)%6]]*2:
+                    yield from self.add_dice_steps(shady)
+                
+                self.assign_polarity()
+                self.print_dice()
+
+                if self.sink.enabled:
+                    self.sink.emit(PhaseEnded("Round", round_number, self.vps))
+
+            self.end_round(round_number)
+
+    def end_round(self, round_number):
+        self.round_number = round_number
+        if self.autosave is not None:
+            self.autosave(self.to_bytes())
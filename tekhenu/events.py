@@ -0,0 +1,206 @@
+import json
+from collections import namedtuple
+
+
+# Game events. Game reports everything that happens through these, a sink decides what to do with them.
+DestinyCard = namedtuple("DestinyCard", "card")
+PyramidBuilt = namedtuple("PyramidBuilt", "pyramid actions")
+PhaseStarted = namedtuple("PhaseStarted", "phase round_number")
+PhaseEnded = namedtuple("PhaseEnded", "phase round_number vps")
+TurnOrder = namedtuple("TurnOrder", "first")
+DiceShown = namedtuple("DiceShown", "dice heading")
+DieTaken = namedtuple("DieTaken", "who god polarity die action")
+StatueBonus = namedtuple("StatueBonus", "who god scribes vps")
+PieceBuilt = namedtuple("PieceBuilt", "who piece location number board")
+BuildFailed = namedtuple("BuildFailed", "piece")
+InputRejected = namedtuple("InputRejected", "what")
+VPsScored = namedtuple("VPsScored", "source vps detail")
+HappinessGained = namedtuple("HappinessGained", "happiness population scribes")
+CardsTaken = namedtuple("CardsTaken", "decrees technologies blessings zone")
+DiceAdded = namedtuple("DiceAdded", "god die")
+BalanceDeclared = namedtuple("BalanceDeclared", "balance round_number")
+Debug = namedtuple("Debug", "label value")
+
+
+class NullSink(object):
+    """
+    Drops every event. Game checks enabled before building an event, so a silent game pays nothing for them.
+    """
+    enabled = False
+
+    def emit(self, event):
+        pass
+
+
+class ConsoleSink(object):
+    """
+    Renders events as the game text, one print per line of the original narration.
+    Params:
+      - stream: file to write to. sys.stdout at print time if None
+    """
+    enabled = True
+
+    PIECE_NAMES = {
+        "Statue": ("statue", "statues", "statues"),
+        "Pillar": ("pillar", "pillars", "pillars"),
+        "Temple_Building": ("building", "Temple buildings", "buildings"),
+        "Osiris_Building": ("building", "Osiris buildings", "buildings"),
+    }
+
+    PHASE_TEXT = {
+        "Player turn": "Round {round_number}, Player turn",
+        "Bot turn": "Round {round_number}, Bot turn",
+        "Maat": "Maat Phase #{maat}",
+        "Scoring": "Scoring Phase",
+    }
+
+    PHASE_END_TEXT = {
+        "Player turn": "Player turn done",
+        "Round": "Round {round_number} Over. Bot has {vps} VPs",
+        "Scoring": "Scoring summary: Bot scored {vps} VPs",
+        "Game": "\nFinal Bot Score: {vps} VPs",
+    }
+
+    REJECTED_TEXT = {
+        "die": "Selected dice not available. Try again\n",
+        "Statue": "Statue already exists, or wrong location. Try again\n",
+        "Pillar": "Pillar already exists, or wrong location. Try again\n",
+        "Temple_Building": "Building already exists, or wrong location. Try again\n",
+        "Osiris_Building": "Building already exists, or wrong location. Try again\n",
+        "command": "Wrong board state command. Try again\n",
+        "new die": "Invalid new dice. Try Again.",
+        "balance": "Invalid balance. Try Again.",
+    }
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event):
+        for line in self.render(event):
+            print(line, file=self.stream)
+
+    def render(self, event):
+        """
+        Returns:
+          - list of str. The lines to print for event
+        """
+        return getattr(self, "render_" + type(event).__name__)(event)
+
+    def render_DestinyCard(self, event):
+        return ["Bot starts with {} Destiny Card\n".format(event.card)]
+
+    def render_PyramidBuilt(self, event):
+        pyramid = event.pyramid
+        return [
+            "Bot action pyramid is:\n {}\n{}\n{}\n{}".format([pyramid[9]], pyramid[7:9], pyramid[4:7], pyramid[0:4]),
+            "Debug. Bot actions order {}".format(event.actions),
+        ]
+
+    def render_PhaseStarted(self, event):
+        return [self.PHASE_TEXT[event.phase].format(round_number=event.round_number, maat=event.round_number//4)]
+
+    def render_PhaseEnded(self, event):
+        if event.phase not in self.PHASE_END_TEXT:
+            return []
+        return [self.PHASE_END_TEXT[event.phase].format(round_number=event.round_number, vps=event.vps)]
+
+    def render_TurnOrder(self, event):
+        return ["{} goes first\n".format(event.first)]
+
+    def render_DiceShown(self, event):
+        base = ""
+        for god in event.dice:
+            base += "{}\n".format(god)
+            for polarity in event.dice[god]:
+                base += "\t{}\t{}\n".format(polarity[:7], event.dice[god][polarity])
+        return ["Available dice:", base] if event.heading else [base]
+
+    def render_DieTaken(self, event):
+        if event.who!="Bot":
+            return []
+        return ["Bot selects action {} :: {} {} {} {}\n".format(event.action, event.god, event.polarity, event.die[0], event.die[1])]
+
+    def render_StatueBonus(self, event):
+        if event.who=="Player":
+            return ["Player has statue on {}. Collect bonus.\n".format(event.god)]
+        gains = [text for count, text in ((event.scribes, "1 scribe"), (event.vps, "1 VP")) if count]
+        return ["Bot has statue on {}. Bot collects {}".format(event.god, " and ".join(gains))]
+
+    def render_PieceBuilt(self, event):
+        single, plural, _ = self.PIECE_NAMES[event.piece]
+        if event.who=="Player":
+            return ["All {} built are {}\n".format(plural.lower() if event.piece=="Temple_Building" else plural, event.board)]
+        if event.piece=="Pillar":
+            where = "on {},{}".format(*event.location)
+        elif event.piece=="Statue":
+            where = "on {}".format(event.location)
+        else:
+            where = "on {} {}, {}".format(plural.split()[0], *event.location)
+        return [
+            "Bot builds it's {}th {} {}".format(event.number, single, where),
+            "All {} built are {}\n".format(plural, event.board),
+        ]
+
+    def render_BuildFailed(self, event):
+        return ["Cannot build more {}\n".format(self.PIECE_NAMES[event.piece][2])]
+
+    def render_InputRejected(self, event):
+        return [self.REJECTED_TEXT[event.what]]
+
+    def render_VPsScored(self, event):
+        vps, detail = event.vps, event.detail
+        if event.source=="Temple statue":
+            return ["Bot scores {} VPs for Pillars".format(vps["Actions"])]
+        if event.source=="Statues occupied":
+            return ["All Statues occupied. Bot scores 3 VP"]
+        if event.source=="Pillar":
+            return ["Bot scores {} VPs for Pillar".format(vps["Actions"])]
+        if event.source=="Temple Building":
+            return ["Bot scores {} VPs and gains {} Population".format(vps["Actions"], detail["population"])]
+        if event.source=="Osiris":
+            winner = detail["winner"] if detail["winner"] in ("Player", "Bot") else "Nobody"
+            return ["Player has {} pieces, Bot has {} in Osiris {}. {} scores 3 VPs".format(
+                detail["player"], detail["bot"], detail["region"], winner)]
+        if event.source in ("Temple Buildings", "Temple Pillars"):
+            return ["Player scores {} VPs. Bot scores {} VPs for {}".format(detail["player"], vps[event.source], event.source)]
+        if event.source=="Statues":
+            return ["Bot scores {} VPs for Statues".format(vps["Statues"])]
+        if event.source=="Happiness":
+            return ["Bot scores {} VPs for Happinness".format(vps["Happiness"])]
+        if event.source=="Cards":
+            return ["Bot scored {} VPs for Blessings and {} VPs for Techs".format(vps["Blessings"], vps["Technologies"])]
+        return ["Bot scored {} VPs for Decrees, {} for Scribes, and {} for Turn Order.".format(
+            vps["Decrees"], vps["Scribes"], vps["Turn Order"])]
+
+    def render_HappinessGained(self, event):
+        return ["Bot Happiness={}, Population={}, {} Scribes gained".format(event.happiness, event.population, event.scribes)]
+
+    def render_CardsTaken(self, event):
+        return ["Bot takes {} Decrees, {} Tech, {} Blessings from {} zone".format(
+            event.decrees, event.technologies, event.blessings, event.zone)]
+
+    def render_DiceAdded(self, event):
+        return []
+
+    def render_BalanceDeclared(self, event):
+        return []
+
+    def render_Debug(self, event):
+        return ["{} {}".format(event.label, event.value)]
+
+
+class JsonLinesSink(object):
+    """
+    Writes one JSON object per event: {"event": <event type>, <field>: <value> ..}
+    Params:
+      - stream: open text file to write to
+    """
+    enabled = True
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def emit(self, event):
+        record = {"event": type(event).__name__}
+        record.update(event._asdict())
+        self.stream.write(json.dumps(record, default=list) + "\n")
@@ -0,0 +1,162 @@
+import os
+import random
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+from .engine import Game
+from .events import NullSink
+from .policies import ConsolePolicy
+from .simulate import POLICIES, ScoreSummary
+
+"""
+Forecast of the Bot's final VPs, worked out by rollouts while the Player thinks.
+
+Every rollout carries the game on from a snapshot of the current state with its own random stream, so future dice
+refills, Player moves and the Maat pyramid reshuffles are all sampled. Rollouts run in chunks on a pool and the
+summary grows as chunks come back. stop() drops whatever is still queued, so answering a prompt never waits on it.
+"""
+
+CHUNK_SIZE = 10
+
+
+def run_rollouts(args):
+    """
+    Worker entry point. Plays n rollouts from a snapshot.
+    Params:
+      - args (tuple): snapshot (bytes), turns_done (int) this round, policy name, seed, index of the first rollout, n
+    Returns: ScoreSummary
+    """
+    snapshot, turns_done, policy, seed, start, n = args
+    summary = ScoreSummary()
+    for index in range(start, start+n):
+        game = Game.from_bytes(snapshot, policy=POLICIES[policy](), sink=NullSink())
+        # The snapshot's own stream would give every rollout the same future
+        game.rng = random.Random("tekhenu:forecast:{}:{}".format(seed, index))
+        game.drive(game.play(turns_done))
+        summary.add(game)
+    return summary
+
+
+def describe(results):
+    """
+    Returns: list of str. Forecast lines for ScoreSummary.as_dict() results
+    """
+    if not results["games"]:
+        return ["No rollouts yet"]
+    lines = ["Bot final VPs forecast over {} rollouts".format(results["games"])]
+    for category, stats in results.items():
+        if category!="games":
+            lines.append("{:<18}{mean:>8.1f} +/- {std:.1f}  [{min}, {max}]".format(category, **stats))
+    return lines
+
+
+class Forecaster(object):
+    """
+    Runs rollouts in the background and keeps their ScoreSummary.
+    Params:
+      - workers (int): processes of the pool. Defaults to all cores
+      - policy (str): POLICIES entry that plays the Player side in rollouts
+      - max_rollouts (int): rollouts per start()
+      - on_update (callable): called with ScoreSummary.as_dict() after every chunk, from a pool thread
+      - executor (concurrent.futures.Executor): pool to use instead of a new ProcessPoolExecutor
+    """
+    def __init__(self, workers=None, policy="greedy", max_rollouts=2000, on_update=None, executor=None):
+        self.workers = workers
+        self.policy = policy
+        self.max_rollouts = max_rollouts
+        self.on_update = on_update
+        self.executor = executor
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.pending = set()
+        self.summary = ScoreSummary()
+        self.seed = 0
+
+    def start(self, game, turns_done=0):
+        """
+        Forecast from the current state of game, with turns_done turns of this round already played.
+        Stops any forecast still running. Returns at once.
+        """
+        self.stop()
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        snapshot = game.to_bytes()
+        with self.lock:
+            self.summary = ScoreSummary()
+            self.seed += 1
+            generation = self.generation
+            chunks = iter(range(0, self.max_rollouts, CHUNK_SIZE))
+            # Two chunks in flight per worker keep the pool busy without queueing work stop() has to throw away
+            for _ in range(2*(self.workers or os.cpu_count() or 1)):
+                self.submit(generation, snapshot, turns_done, chunks)
+
+    def submit(self, generation, snapshot, turns_done, chunks):
+        start = next(chunks, None)
+        if start is None:
+            return
+        args = (snapshot, turns_done, self.policy, self.seed, start, min(CHUNK_SIZE, self.max_rollouts-start))
+        future = self.executor.submit(run_rollouts, args)
+        self.pending.add(future)
+        future.add_done_callback(lambda f: self.collect(f, generation, snapshot, turns_done, chunks))
+
+    def collect(self, future, generation, snapshot, turns_done, chunks):
+        with self.lock:
+            self.pending.discard(future)
+            if generation!=self.generation:
+                return
+            try:
+                self.summary.merge(future.result())
+            except CancelledError:
+                return
+            results = self.summary.as_dict()
+            self.submit(generation, snapshot, turns_done, chunks)
+        if self.on_update is not None:
+            self.on_update(results)
+
+    def stop(self):
+        """
+        Drop the running forecast. Queued chunks are cancelled and results still to come are ignored.
+        """
+        with self.lock:
+            self.generation += 1
+            for future in list(self.pending):
+                future.cancel()
+            self.pending.clear()
+
+    def results(self):
+        """
+        Returns: ScoreSummary.as_dict() of the rollouts done so far
+        """
+        with self.lock:
+            return self.summary.as_dict()
+
+    def close(self):
+        self.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+class ForecastingConsolePolicy(ConsolePolicy):
+    """
+    ConsolePolicy that forecasts the Bot score while the Player picks a die. Type ? at the prompt to see it.
+    Params:
+      - forecaster (Forecaster)
+    """
+    def __init__(self, forecaster):
+        self.forecaster = forecaster
+
+    def select_die(self, game, round_number):
+        self.forecaster.start(game, game.player_order.index("Player"))
+        try:
+            return ConsolePolicy.select_die(self, game, round_number)
+        finally:
+            self.forecaster.stop()
+
+    def read(self, prompt):
+        while True:
+            line = input(prompt)
+            if line.strip()!="?":
+                return line
+            for text in describe(self.forecaster.results()):
+                print(text)
@@ -0,0 +1,268 @@
+import random
+import struct
+from collections import namedtuple
+
+from .events import NullSink, PyramidBuilt, PhaseEnded, DieTaken, PieceBuilt, DiceAdded, BalanceDeclared
+from .policies import ScriptedPolicy, ScriptExhausted, ScriptDiverged
+from .rules import GOD_ORDER, BOT_BASE_ACTIONS, POSSIBLE_BOT_ACTIONS, OSIRIS_ORDER, DICE_COLORS, STATUE_SPOTS, POLARITIES
+from .snapshot import DIFFICULTIES, dump_rng, load_rng
+
+"""
+Append-only game journal. Every state change of a game, Bot or Player, is written as a few bytes as it happens,
+so a game can be rebuilt from its setup and random stream plus the journal, without prompting anyone.
+
+Layout, little endian:
+  - header: magic, version, difficulty, first sunny God, Horus order, dice count per God, one byte per die
+            (DICE_COLORS index<<3 | value), then the rng state as saved by tekhenu.snapshot, length first
+  - records: kind byte then
+      - die taken: who, God, polarity, die, Bot action (BOT_BASE_ACTIONS index, 255 for the Player)
+      - piece built: who<<2 | piece, location
+      - dice added: God, die
+      - pyramid: 10 BOT_BASE_ACTIONS indexes, POSSIBLE_BOT_ACTIONS index
+      - balance: Player balance
+      - phase ended: phase, round, Bot VPs. Written after every turn, scoring phase and round
+
+The rng state is taken when the sink is made, so make it before the Game that uses it.
+Replays are exact as long as the Player side never draws from the game rng. Console play never does.
+"""
+
+MAGIC = b"TKJN"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBBB6B6B")
+RNG_LENGTH = struct.Struct("<H")
+
+TAKEN, BUILT, ADDED, PYRAMID, BALANCE, ENDED = range(1, 7)
+RECORDS = {
+    TAKEN: struct.Struct("<BBBBB"),
+    BUILT: struct.Struct("<BB"),
+    ADDED: struct.Struct("<BB"),
+    PYRAMID: struct.Struct("<10BB"),
+    BALANCE: struct.Struct("<h"),
+    ENDED: struct.Struct("<BBH"),
+}
+
+WHO = ["Player", "Bot"]
+PIECES = ["Statue", "Pillar", "Temple_Building", "Osiris_Building"]
+TEMPLE_SIDES = ["Horizontal", "Vertical"]
+PHASES = ["Player turn", "Bot turn", "Scoring", "Round", "Game"]
+NO_ACTION = 255
+
+Divergence = namedtuple("Divergence", "index round_number turn recorded replayed")
+
+
+class JournalError(ValueError):
+    pass
+
+
+def die_code(die):
+    return DICE_COLORS.index(die[0])<<3 | int(die[1])
+
+
+def decode_die(code):
+    return (DICE_COLORS[code>>3], code & 7)
+
+
+def location_code(piece, location):
+    if piece=="Statue":
+        return STATUE_SPOTS.index(location)
+    if piece=="Pillar":
+        return 5*location[0] + location[1]
+    if piece=="Temple_Building":
+        return 5*TEMPLE_SIDES.index(location[0]) + location[1]
+    return 6*OSIRIS_ORDER.index(location[0]) + location[1]-1
+
+
+def decode_location(piece, code):
+    if piece=="Statue":
+        return STATUE_SPOTS[code]
+    if piece=="Pillar":
+        return divmod(code, 5)
+    if piece=="Temple_Building":
+        return (TEMPLE_SIDES[code//5], code%5)
+    return (OSIRIS_ORDER[code//6], code%6+1)
+
+
+class JournalSink(object):
+    """
+    Writes the journal of one game to a binary stream. Events the journal does not need are passed on to forward.
+    Params:
+      - stream: open binary file, or io.BytesIO
+      - difficulty, horus_order, first_sunny, starting_dice: the setup given to Game
+      - rng: the rng given to Game, at its starting state
+      - forward: sink that also receives every event, e.g. a ConsoleSink for a game played on the console
+    """
+    enabled = True
+
+    def __init__(self, stream, difficulty, horus_order, first_sunny, starting_dice, rng=None, forward=None):
+        self.stream = stream
+        self.forward = forward if forward is not None else NullSink()
+        state = dump_rng(rng if rng is not None else random)
+        order = {god: i for i, god in enumerate(GOD_ORDER)}
+        stream.write(HEADER.pack(MAGIC, VERSION, DIFFICULTIES.index(difficulty), order[first_sunny],
+                                 *[order[god] for god in horus_order], *[len(starting_dice[god]) for god in GOD_ORDER]))
+        stream.write(bytes(die_code(die) for god in GOD_ORDER for die in starting_dice[god]))
+        stream.write(RNG_LENGTH.pack(len(state)) + state)
+
+    def write(self, kind, *fields):
+        self.stream.write(bytes([kind]) + RECORDS[kind].pack(*fields))
+
+    def emit(self, event):
+        if self.forward.enabled:
+            self.forward.emit(event)
+        kind = type(event)
+        if kind is DieTaken:
+            action = NO_ACTION if event.action is None else BOT_BASE_ACTIONS.index(event.action)
+            self.write(TAKEN, WHO.index(event.who), GOD_ORDER.index(event.god), POLARITIES.index(event.polarity),
+                       die_code(event.die), action)
+        elif kind is PieceBuilt:
+            piece = PIECES.index(event.piece)
+            self.write(BUILT, WHO.index(event.who)<<2 | piece, location_code(event.piece, event.location))
+        elif kind is DiceAdded:
+            self.write(ADDED, GOD_ORDER.index(event.god), die_code(event.die))
+        elif kind is PyramidBuilt:
+            self.write(PYRAMID, *[BOT_BASE_ACTIONS.index(action) for action in event.pyramid],
+                       POSSIBLE_BOT_ACTIONS.index(event.actions))
+        elif kind is BalanceDeclared:
+            self.write(BALANCE, int(event.balance))
+        elif kind is PhaseEnded and event.phase in PHASES:
+            self.write(ENDED, PHASES.index(event.phase), event.round_number, event.vps)
+            # A turn is the unit to lose in a crash, not a whole game
+            self.stream.flush()
+
+
+def read_journal(data):
+    """
+    Params:
+      - data (bytes): JournalSink output. A journal cut short by a crash reads up to its last whole record.
+    Returns:
+      - (setup, rng, events). setup holds the Game arguments difficulty, horus_order, first_sunny, starting_dice.
+        rng is a new rng at the starting state. events are the recorded events in order, as the event namedtuples.
+        Fields the journal does not keep are None, and BalanceDeclared has no round_number.
+    """
+    if data[:4]!=MAGIC:
+        raise JournalError("Not a Tekhenu journal")
+    if data[4]!=VERSION:
+        raise JournalError("Journal version {} is not supported. Expected {}".format(data[4], VERSION))
+    try:
+        header = HEADER.unpack_from(data, 0)
+        offset = HEADER.size
+        starting_dice = {}
+        for god, count in zip(GOD_ORDER, header[10:16]):
+            starting_dice[god] = [decode_die(code) for code in data[offset:offset+count]]
+            offset += count
+        length, = RNG_LENGTH.unpack_from(data, offset)
+        offset += RNG_LENGTH.size
+        rng = load_rng(data[offset:offset+length], 0, None)
+        offset += length
+    except (struct.error, IndexError) as e:
+        raise JournalError("Truncated or corrupt journal header: {}".format(e))
+    setup = {
+        "difficulty": DIFFICULTIES[header[2]],
+        "horus_order": [GOD_ORDER[i] for i in header[4:10]],
+        "first_sunny": GOD_ORDER[header[3]],
+        "starting_dice": starting_dice,
+    }
+
+    events = []
+    while offset<len(data):
+        kind = data[offset]
+        if kind not in RECORDS:
+            raise JournalError("Unknown record kind {} at byte {}".format(kind, offset))
+        if offset+1+RECORDS[kind].size>len(data):
+            break
+        fields = RECORDS[kind].unpack_from(data, offset+1)
+        offset += 1+RECORDS[kind].size
+        if kind==TAKEN:
+            who, god, polarity, die, action = fields
+            events.append(DieTaken(WHO[who], GOD_ORDER[god], POLARITIES[polarity], decode_die(die),
+                                   None if action==NO_ACTION else BOT_BASE_ACTIONS[action]))
+        elif kind==BUILT:
+            piece = PIECES[fields[0] & 3]
+            events.append(PieceBuilt(WHO[fields[0]>>2], piece, decode_location(piece, fields[1]), None, None))
+        elif kind==ADDED:
+            events.append(DiceAdded(GOD_ORDER[fields[0]], decode_die(fields[1])))
+        elif kind==PYRAMID:
+            events.append(PyramidBuilt([BOT_BASE_ACTIONS[i] for i in fields[:10]], POSSIBLE_BOT_ACTIONS[fields[10]]))
+        elif kind==BALANCE:
+            events.append(BalanceDeclared(fields[0], None))
+        else:
+            events.append(PhaseEnded(PHASES[fields[0]], fields[1], fields[2]))
+    return setup, rng, events
+
+
+def player_script(events):
+    """
+    Returns: ScriptedPolicy script with the Player decisions of a journal.
+    """
+    script = {"dice": [], "changes": [], "balance": [], "refills": []}
+    for event in events:
+        kind = type(event)
+        if kind is DieTaken and event.who=="Player":
+            script["dice"].append((event.god, event.polarity, event.die))
+            script["changes"].append([])
+        elif kind is PieceBuilt and event.who=="Player":
+            script["changes"][-1].append((event.piece, event.location))
+        elif kind is BalanceDeclared:
+            script["balance"].append(event.balance)
+        elif kind is DiceAdded:
+            script["refills"].append(event.die)
+    return script
+
+
+def replay(data, rules=None, sink=None):
+    """
+    Play a journaled game again with the recorded Player decisions and random stream. Nobody is prompted.
+    A journal cut short replays up to where it ends, and one that diverges, when a recorded Player move is not legal
+    in the replayed game, up to that move.
+
+    Params:
+      - data (bytes): JournalSink output
+      - rules (Ruleset): rules to replay under, e.g. after a rule fix. Standard rules if None.
+      - sink: also receives the events of the replay. Silent if None.
+    Returns:
+      - (game, journal). The replayed Game and its own journal (bytes), ready for find_divergence.
+    """
+    from io import BytesIO
+    from .engine import Game
+
+    setup, rng, events = read_journal(data)
+    stream = BytesIO()
+    journal = JournalSink(stream, rng=rng, forward=sink, **setup)
+    game = Game(setup["difficulty"], setup["horus_order"], setup["first_sunny"], setup["starting_dice"],
+                policy=ScriptedPolicy(player_script(events)), sink=journal, rng=rng, rules=rules)
+    try:
+        game.game_loop()
+    except (ScriptExhausted, ScriptDiverged):
+        pass
+    return game, stream.getvalue()
+
+
+def find_divergence(recorded, replayed):
+    """
+    Find the first record where two journals of the same game part ways. Replay an archived game under changed
+    rules and compare the journals to find the exact turn a Bot score went wrong.
+
+    Params:
+      - recorded, replayed (bytes): journals
+    Returns:
+      - Divergence(index, round_number, turn, recorded, replayed) of the first differing record, or None if the
+        journals match. turn is the phase in progress: "Player turn", "Bot turn" or "Maat" before the round ends.
+        recorded or replayed is None where one journal ends first.
+    """
+    _, _, ours = read_journal(recorded)
+    _, _, theirs = read_journal(replayed)
+    taken, turn = 0, "Setup"
+    for index in range(max(len(ours), len(theirs))):
+        a = ours[index] if index<len(ours) else None
+        b = theirs[index] if index<len(theirs) else None
+        event = a if a is not None else b
+        # Both sides take one die every round
+        if type(event) is DieTaken:
+            taken += 1
+            turn = "{} turn".format(event.who)
+        elif type(event) is BalanceDeclared:
+            turn = "Maat"
+        if a!=b:
+            return Divergence(index, (taken+1)//2, turn, a, b)
+    return None
@@ -0,0 +1,111 @@
+import functools
+import json
+import time
+
+"""
+Optional instrumentation of the Bot. A Game with a Metrics attached times its hot methods and counts which
+tie-break and fallback paths the Bot takes. With none attached, as by default, a timed method costs one attribute
+check and every count one `is None` test, so it can stay in the code of every simulation run.
+
+  - timers: calls and total seconds of bot_turn, the build_* methods, assign_polarity and each scoring phase.
+    Times include the methods called inside, e.g. bot_turn includes the build it makes
+  - tie_breaks: random choices between equally good options, and the Horus order pick among statue dice
+  - fallbacks: Bot moves that did not go the first way the rules try, e.g. a statue scored as 3 VPs
+
+Metrics merge by addition, so workers can keep their own and send them back. Export with as_dict (JSON) or
+prometheus (text exposition format).
+"""
+
+
+def timed(method):
+    """
+    Decorator of a Game method. Adds the time of every call to game.metrics under the method name, if set.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if metrics is None:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            metrics.observe(name, time.perf_counter()-start)
+    return wrapper
+
+
+class Metrics(object):
+    """
+    Timers and path counters of one or more games.
+      - timers: {name: [calls, seconds]}
+      - tie_breaks, fallbacks: {path: count}
+    """
+    def __init__(self):
+        self.timers = {}
+        self.tie_breaks = {}
+        self.fallbacks = {}
+        self.games = 0
+
+    def observe(self, name, seconds):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+
+    def tie_break(self, path):
+        self.tie_breaks[path] = self.tie_breaks.get(path, 0) + 1
+
+    def fallback(self, path):
+        self.fallbacks[path] = self.fallbacks.get(path, 0) + 1
+
+    def merge(self, other):
+        self.games += other.games
+        for name, (calls, seconds) in other.timers.items():
+            timer = self.timers.setdefault(name, [0, 0.0])
+            timer[0] += calls
+            timer[1] += seconds
+        for mine, theirs in ((self.tie_breaks, other.tie_breaks), (self.fallbacks, other.fallbacks)):
+            for path, count in theirs.items():
+                mine[path] = mine.get(path, 0) + count
+        return self
+
+    def as_dict(self):
+        """
+        Returns: {"games", "timers": {name: {"calls", "seconds", "mean_us"}}, "tie_breaks", "fallbacks"}
+        """
+        return {
+            "games": self.games,
+            "timers": {name: {"calls": calls, "seconds": seconds, "mean_us": 1e6*seconds/calls}
+                       for name, (calls, seconds) in sorted(self.timers.items())},
+            "tie_breaks": dict(sorted(self.tie_breaks.items())),
+            "fallbacks": dict(sorted(self.fallbacks.items())),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    def prometheus(self, prefix="tekhenu"):
+        """
+        Returns: str. Metrics in the Prometheus text exposition format
+        """
+        lines = [
+            "# HELP {}_games_total Games measured".format(prefix),
+            "# TYPE {}_games_total counter".format(prefix),
+            "{}_games_total {}".format(prefix, self.games),
+            "# HELP {}_method_seconds Time spent in Bot methods".format(prefix),
+            "# TYPE {}_method_seconds summary".format(prefix),
+        ]
+        for name, (calls, seconds) in sorted(self.timers.items()):
+            lines.append('{}_method_seconds_sum{{method="{}"}} {!r}'.format(prefix, name, seconds))
+            lines.append('{}_method_seconds_count{{method="{}"}} {}'.format(prefix, name, calls))
+        for kind, counts, text in (("tie_breaks", self.tie_breaks, "Bot tie-breaks by path"),
+                                   ("fallbacks", self.fallbacks, "Bot fallback moves by path")):
+            lines.append("# HELP {}_{}_total {}".format(prefix, kind, text))
+            lines.append("# TYPE {}_{}_total counter".format(prefix, kind))
+            for path, count in sorted(counts.items()):
+                lines.append('{}_{}_total{{path="{}"}} {}'.format(prefix, kind, path, count))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,138 @@
+import itertools
+import os
+from multiprocessing import Pool
+from statistics import NormalDist
+
+from .rules import VP_CATEGORIES
+from .simulate import DEFAULT_CONFIG, POLICIES, CHUNK_SIZE, CHUNKS_PER_WORKER, game_rng, play_game
+from .stats import RunningStats
+
+"""
+Paired comparison of two configs, e.g. two Player policies or two Rulesets, on common random numbers.
+
+Game i of both arms is played on a rng.StreamRandom of the same key: the same setup, action pyramids,
+POSSIBLE_BOT_ACTIONS picks and dice refills, and the same tie-breaks and Player draws in every round where the two
+games line up. The scores of a pair move together, so their difference varies much less than the difference of
+two independent games, and a small gap between the arms shows up in far fewer games.
+"""
+
+FIELDS = ["Total"] + VP_CATEGORIES
+
+
+class PairedSummary(object):
+    """
+    Bot VPs of both arms and their difference, arm b minus arm a, over game pairs. Total and every VP_CATEGORIES entry.
+    Merges by addition like simulate.ScoreSummary.
+    """
+    def __init__(self):
+        self.games = 0
+        self.a = {field: RunningStats() for field in FIELDS}
+        self.b = {field: RunningStats() for field in FIELDS}
+        self.difference = {field: RunningStats() for field in FIELDS}
+
+    def add(self, game_a, game_b):
+        self.games += 1
+        for field in FIELDS:
+            vps_a = game_a.vps if field=="Total" else game_a.vp_breakdown[field]
+            vps_b = game_b.vps if field=="Total" else game_b.vp_breakdown[field]
+            self.a[field].add(vps_a)
+            self.b[field].add(vps_b)
+            self.difference[field].add(vps_b-vps_a)
+
+    def merge(self, other):
+        self.games += other.games
+        for field in FIELDS:
+            self.a[field].merge(other.a[field])
+            self.b[field].merge(other.b[field])
+            self.difference[field].merge(other.difference[field])
+        return self
+
+    def as_dict(self, confidence=0.95):
+        """
+        Params:
+          - confidence (float): level of the intervals, 0.95 for 95%
+        Returns:
+          - {"games": n, "confidence", field: {"a", "b": mean VPs, "difference": mean of b-a, "std": of b-a,
+            "interval": [low, high] of the mean difference, "variance_reduction"} ..}.
+            variance_reduction is how many times more games independent arms would need for the same interval,
+            None if every pair scored the same difference. Intervals are None under 2 games
+        """
+        result = {"games": self.games, "confidence": confidence}
+        if not self.games:
+            return result
+        z = NormalDist().inv_cdf((1+confidence)/2)
+        for field in FIELDS:
+            difference = self.difference[field]
+            interval = None
+            if self.games>1:
+                # Sample variance, n-1
+                half = z*(difference.m2/(self.games-1)/self.games)**0.5
+                interval = [difference.mean-half, difference.mean+half]
+            independent = self.a[field].variance + self.b[field].variance
+            result[field] = {
+                "a": self.a[field].mean, "b": self.b[field].mean,
+                "difference": difference.mean, "std": difference.variance**0.5, "interval": interval,
+                "variance_reduction": independent/difference.variance if difference.variance else None,
+            }
+        return result
+
+
+def run_pair_chunk(args):
+    """
+    Worker entry point. Plays game pairs chunk*CHUNK_SIZE onwards, both games of a pair on streams of the same key.
+    Returns: PairedSummary
+    """
+    config_a, config_b, seed, chunk, n_games = args
+    summary = PairedSummary()
+    for index in range(chunk*CHUNK_SIZE, chunk*CHUNK_SIZE+n_games):
+        summary.add(play_game(config_a, game_rng(config_a, seed, index)),
+                    play_game(config_b, game_rng(config_b, seed, index)))
+    return summary
+
+
+def paired(n_games, config_a, config_b, workers=None, seed=0, confidence=0.95, progress=None):
+    """
+    Play n_games pairs of headless games, one per arm, on common random numbers.
+
+    Params:
+      - n_games (int): game pairs
+      - config_a, config_b (dict): overrides for DEFAULT_CONFIG of each arm. rng is always "streams", and
+        metrics, store and streaming are not used
+      - workers (int): processes to use. Defaults to all cores. 1 runs in this process.
+      - seed (int): base seed. Same seed and configs give the same results.
+      - confidence (float): level of the intervals
+      - progress (callable): called with (pairs done, n_games, PairedSummary so far) after every chunk
+    Returns:
+      - dict. PairedSummary.as_dict()
+    """
+    configs = []
+    for config in (config_a, config_b):
+        config = dict(DEFAULT_CONFIG, **(config or {}))
+        if config["policy"] not in POLICIES:
+            raise ValueError("Unknown policy {}. Pick one of {}".format(config["policy"], list(POLICIES)))
+        config["rng"] = "streams"
+        configs.append(config)
+    workers = workers or os.cpu_count() or 1
+
+    chunks = ((configs[0], configs[1], seed, i, min(CHUNK_SIZE, n_games-start))
+              for i, start in enumerate(range(0, n_games, CHUNK_SIZE)))
+    summary = PairedSummary()
+
+    def merge(chunk_summary):
+        summary.merge(chunk_summary)
+        if progress is not None:
+            progress(summary.games, n_games, summary)
+
+    if workers==1:
+        for chunk in chunks:
+            merge(run_pair_chunk(chunk))
+    else:
+        with Pool(workers) as pool:
+            while True:
+                wave = list(itertools.islice(chunks, CHUNKS_PER_WORKER*workers))
+                if not wave:
+                    break
+                for result in pool.imap_unordered(run_pair_chunk, wave):
+                    merge(result)
+
+    return summary.as_dict(confidence)
@@ -0,0 +1,248 @@
+from .rules import GOD_ORDER, OSIRIS_ORDER, PLAYER_GOD_ACTIONS, DICE_COLORS, STATUE_SPOTS, ROW_MASKS, COL_MASKS
+
+
+class PlayerPolicy(object):
+    """
+    Decides everything the Player side feeds into a Game: die selection, board state changes, Maat balance and dice refills.
+    Subclass and override all four methods. Non interactive policies must only return legal moves.
+    The Game raises error when one does not.
+    """
+    interactive = False
+    error = ValueError
+
+    def select_die(self, game, round_number):
+        """
+        Returns:
+          - (god, polarity, (color, value)) die to take from game.available_dice. None if there is none to take,
+            the Game does not ask then
+        """
+        raise NotImplementedError
+
+    def board_changes(self, game, round_number, god, die):
+        """
+        Params:
+          - god (str), die (tuple): die the Player took this turn
+        Returns:
+          - iterable of (command, location) for Game.player_build
+        """
+        raise NotImplementedError
+
+    def balance(self, game, round_number):
+        """
+        Returns:
+          - int. Absolute value of Player balance at the Maat Phase
+        """
+        raise NotImplementedError
+
+    def new_die(self, game, region):
+        """
+        Returns:
+          - (color, value) die added to region on Rotation
+        """
+        raise NotImplementedError
+
+
+class ConsolePolicy(PlayerPolicy):
+    """
+    Human at the table. Everything is typed at input() prompts, through read() so subclasses can watch the input.
+    """
+    interactive = True
+
+    def read(self, prompt):
+        return input(prompt)
+
+    def select_die(self, game, round_number):
+        selection = self.read("Which dice is Player selecting (God Polarity Color Number)?: ").split(" ")
+        if len(selection)!=4:
+            return None
+        return selection[0], selection[1], (selection[2], selection[3])
+
+    def board_changes(self, game, round_number, god, die):
+        while True:
+            command = self.read("Which board state changed (Statue / Pillar / Temple_Building / Osiris_Building / Stop)?: ")
+            if command=="Stop":
+                return
+
+            elif command=="Statue":
+                yield command, self.read("Where did Player build statue (God / Papyrus_Bread / Limestone_Granite / Temple_Horizontal / Temple_Vertical?: ")
+            
+            elif command=="Pillar":
+                location = self.read("Which row and col did Player build pillar (row col)?: ").split(" ")
+                try:
+                    yield command, (int(location[0]), int(location[1]))
+                except (IndexError, ValueError):
+                    print("Pillar already exists, or wrong location. Try again\n")
+
+            elif command=="Temple_Building":
+                location = self.read("Where did Player build temple building (Horizontal/Vertical row/col)?: ").split(" ")
+                try:
+                    yield command, (location[0], int(location[1]))
+                except (IndexError, ValueError):
+                    print("Building already exists, or wrong location. Try again\n")
+
+            elif command=="Osiris_Building":
+                location = self.read("Where did Player build osiris building (Papyrus/Bread/Limestone/Granite 1-6)?: ").split(" ")
+                try:
+                    yield command, (location[0], int(location[1]))
+                except (IndexError, ValueError):
+                    print("Building already exists, or wrong location. Try again\n")
+
+            else:
+                print("Wrong board state command. Try again\n")
+
+    def balance(self, game, round_number):
+        while True:
+            try:
+                return int(self.read("What is the absolute value of Player balance?: "))
+            except ValueError:
+                print("Invalid balance. Try Again.")
+
+    def new_die(self, game, region):
+        new_dice = self.read("Which dice to add dice to {} (Color Number)?: ".format(region)).split(" ")
+        try:
+            return new_dice[0], int(new_dice[1])
+        except (IndexError, ValueError):
+            return None
+
+
+class RandomPolicy(PlayerPolicy):
+    """
+    Takes a random Pure/Tainted die and builds the matching piece on a random free spot.
+    Pure dice move balance one way and Tainted the other. Refills are rolled from DICE_COLORS.
+    Params:
+      - rng (random.Random): draws for the Player. Shares the game rng if None, on its "player" and "refill"
+        streams, see Game.stream.
+    """
+    def __init__(self, rng=None):
+        self.rng = rng
+        self.player_balance = 0
+
+    def random(self, game, name="player"):
+        return self.rng if self.rng is not None else game.stream(name)
+
+    def legal_dice(self, game):
+        # Every (god, polarity, die) the Player may take. Forbidden dice are skipped like the bot does.
+        return game.dice_pool.legal_picks()
+
+    def select_die(self, game, round_number):
+        dice = self.legal_dice(game)
+        if not dice:
+            return None
+        pick = self.random(game).choice(dice)
+        self.player_balance += 1 if pick[1]=="Pure" else -1
+        return pick
+
+    def free_spots(self, game, command):
+        # All empty locations for a build command, in Game.player_build format
+        board = game.board
+        if command=="Statue":
+            return [s for s in STATUE_SPOTS if board.statue(s) is None]
+        elif command=="Pillar":
+            return [(r,c) for r in range(5) for c in range(5) if board.pillar(r, c) is None]
+        elif command=="Temple_Building":
+            return [(side,i) for side in ("Horizontal", "Vertical") for i in range(5) if board.temple_building(side, i) is None]
+        elif command=="Osiris_Building":
+            return [(res,v+1) for res in OSIRIS_ORDER for v in range(6) if board.osiris_building(res, v) is None]
+
+    def place(self, game, command, god, die):
+        spots = self.free_spots(game, command)
+        return self.random(game).choice(spots) if spots else None
+
+    def board_changes(self, game, round_number, god, die):
+        command = PLAYER_GOD_ACTIONS.get(god)
+        if command:
+            location = self.place(game, command, god, die)
+            if location is not None:
+                yield command, location
+
+    def balance(self, game, round_number):
+        return abs(self.player_balance)
+
+    def new_die(self, game, region):
+        rng = self.random(game, "refill")
+        return rng.choice(DICE_COLORS), rng.randint(1, 6)
+
+
+class GreedyPolicy(RandomPolicy):
+    """
+    Takes the highest valued die, Pure if tied, and builds where it hurts the bot or helps the Player most.
+    Random tie-breaks. Refills are rolled like RandomPolicy.
+    """
+    def select_die(self, game, round_number):
+        dice = self.legal_dice(game)
+        if not dice:
+            return None
+        best = max((d[2][1], d[1]=="Pure") for d in dice)
+        pick = self.random(game).choice([d for d in dice if (d[2][1], d[1]=="Pure")==best])
+        self.player_balance += 1 if pick[1]=="Pure" else -1
+        return pick
+
+    def place(self, game, command, god, die):
+        spots = self.free_spots(game, command)
+        if not spots:
+            return None
+
+        if command=="Statue":
+            # God with most dice left pays the statue bonus most often
+            scores = {s: len(game.starting_dice[s]) if s in GOD_ORDER else 0 for s in spots}
+        elif command=="Pillar":
+            def score(r, c):
+                neighbors = [game.board.pillar(r+dr, c+dc) for dr,dc in ((-1,0),(1,0),(0,-1),(0,1)) if 0<=r+dr<5 and 0<=c+dc<5]
+                return neighbors.count("Player") + (game.board.temple_building("Horizontal", r)=="Player") + (game.board.temple_building("Vertical", c)=="Player")
+            scores = {s: score(*s) for s in spots}
+        elif command=="Temple_Building":
+            scores = {}
+            for side, i in spots:
+                line = ROW_MASKS[i] if side=="Horizontal" else COL_MASKS[i]
+                scores[(side,i)] = (game.board.player_pillars & line).bit_count()
+        else:
+            # Match the die color, highest Osiris row reachable
+            scores = {(res,v): (res==die[0]) * 10 - abs(v-die[1]) for res,v in spots}
+
+        best = max(scores.values())
+        return self.random(game).choice([s for s in spots if scores[s]==best])
+
+
+class ScriptExhausted(Exception):
+    pass
+
+
+class ScriptDiverged(ValueError):
+    """
+    A scripted move is illegal in the game being played, e.g. a journal replayed under other rules.
+    """
+
+
+class ScriptedPolicy(PlayerPolicy):
+    """
+    Replays prerecorded Player decisions. Useful for tests and repeating a real game.
+    The Game raises ScriptDiverged on a decision that is not legal any more.
+    Params:
+      - script (dict): {"dice": [(god, polarity, (color, value)) ...], "changes": [[(command, location) ...] per turn],
+                        "balance": [int ...], "refills": [(color, value) ...]}
+    """
+    error = ScriptDiverged
+
+    def __init__(self, script):
+        self.dice = iter(script.get("dice", []))
+        self.changes = iter(script.get("changes", []))
+        self.balances = iter(script.get("balance", []))
+        self.refills = iter(script.get("refills", []))
+
+    def next(self, stream, name):
+        try:
+            return next(stream)
+        except StopIteration:
+            raise ScriptExhausted("Script ran out of {}".format(name))
+
+    def select_die(self, game, round_number):
+        return self.next(self.dice, "dice")
+
+    def board_changes(self, game, round_number, god, die):
+        return self.next(self.changes, "changes")
+
+    def balance(self, game, round_number):
+        return self.next(self.balances, "balance")
+
+    def new_die(self, game, region):
+        return self.next(self.refills, "refills")
@@ -0,0 +1,129 @@
+import importlib.util
+import random
+
+
+class BlockRandom(random.Random):
+    """
+    random.Random whose uniform draws are pre-generated in blocks from a NumPy Generator.
+    choice, sample, randint and shuffle index straight into the block, one float per pick,
+    so hot loops pay for NumPy once per block instead of going through _randbelow per call.
+    Every other Random method runs on random() and draws from the same stream.
+
+    The same seed replays the same game, whatever the block_size. getstate() is
+    (seed, draws taken) so a game can be resumed at any point of its stream.
+    Params:
+      - seed (int or tuple of ints): seed of the numpy.random.Generator, each int from 0 to 2**64-1
+      - block_size (int): floats generated at a time
+    """
+    def __init__(self, seed=0, block_size=256):
+        self.block_size = block_size
+        # random.Random.__init__ seeds through seed() below and sets the state gauss() keeps
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        import numpy as np
+        # Snapshots store the seed as up to 255 unsigned 64-bit ints
+        parts = a if isinstance(a, tuple) else (a,)
+        if not 0<len(parts)<256 or not all(isinstance(part, int) and 0<=part<2**64 for part in parts):
+            raise ValueError("BlockRandom seed must be an int from 0 to 2**64-1 or a tuple of them, not {!r}".format(a))
+        self.start_seed = a
+        self.gauss_next = None
+        self.generator = np.random.default_rng(a)
+        # Reversed so pop() hands out the floats in generated order
+        self.block = []
+        self.blocks = 0
+
+    def refill(self):
+        self.block = self.generator.random(self.block_size).tolist()
+        self.block.reverse()
+        self.blocks += 1
+
+    @property
+    def draws(self):
+        return self.blocks*self.block_size - len(self.block)
+
+    def random(self):
+        if not self.block:
+            self.refill()
+        return self.block.pop()
+
+    def choice(self, seq):
+        if not self.block:
+            self.refill()
+        return seq[int(self.block.pop()*len(seq))]
+
+    def randint(self, a, b):
+        if not self.block:
+            self.refill()
+        return a + int(self.block.pop()*(b-a+1))
+
+    def sample(self, population, k):
+        pool = list(population)
+        n = len(pool)
+        if not 0<=k<=n:
+            raise ValueError("Sample larger than population or is negative")
+        result = []
+        for i in range(k):
+            j = int(self.random()*(n-i))
+            result.append(pool[j])
+            pool[j] = pool[n-i-1]
+        return result
+
+    def shuffle(self, x):
+        for i in reversed(range(1, len(x))):
+            j = int(self.random()*(i+1))
+            x[i], x[j] = x[j], x[i]
+
+    def getstate(self):
+        return self.start_seed, self.draws
+
+    def setstate(self, state):
+        seed, draws = state
+        self.seed(seed)
+        skipped = draws//self.block_size
+        if skipped:
+            self.generator.random(skipped*self.block_size)
+            self.blocks = skipped
+        self.refill()
+        del self.block[len(self.block)-draws%self.block_size:]
+
+def seeded_random(seed):
+    """
+    Returns: BlockRandom of seed, which snapshots as its seed and draw count, or random.Random(seed) if NumPy is missing
+    """
+    if importlib.util.find_spec("numpy") is None:
+        return random.Random(seed)
+    return BlockRandom(seed)
+
+
+# Substreams of a StreamRandom, by kind of draw
+STREAMS = ["card", "pyramid", "actions", "tiebreak", "player", "refill"]
+
+
+class StreamRandom(random.Random):
+    """
+    random.Random split into named substreams, for common random numbers between games that are played differently.
+
+    Draws made on the object itself, like the setup of simulate.play_game, come from its own stream. A Game routes
+    each kind of draw to stream(name, round): the destiny cards, the action pyramid, the POSSIBLE_BOT_ACTIONS pick,
+    the Bot tie-breaks, the Player's picks and the dice refills, see Game.stream. Every (name, round) stream starts
+    afresh from the key, so a draw one game makes and the other does not only shifts the rest of that stream in
+    that round: two games on the same key get the same pyramids and refills throughout, and the same tie-breaks in
+    every round their states line up.
+    Params:
+      - key (str): seed of every stream. Games on the same key draw the same numbers
+    """
+    def __init__(self, key):
+        self.key = key
+        # name: (round, random.Random) of the round being played
+        self.streams = {}
+        super().__init__("{}:setup".format(key))
+
+    def stream(self, name, round_number):
+        """
+        Returns: random.Random of draws of kind name in round_number
+        """
+        current = self.streams.get(name)
+        if current is None or current[0]!=round_number:
+            current = self.streams[name] = (round_number, random.Random("{}:{}:{}".format(self.key, name, round_number)))
+        return current[1]
@@ -0,0 +1,221 @@
+from itertools import product
+
+"""
+Rules tables. Game constants plus the bitmask and polarity lookups derived from them.
+Ruleset compiles the rules that house rules may change into flat lookup tables for Game.
+"""
+
+TOTAL_BUILDINGS, TOTAL_PILLARS, TOTAL_STATUES = 10, 8, 6
+
+STARTING_HAPPINESS, STARTING_POPULATION = 4, 7
+
+GOD_ORDER = ['Horus', 'Ra', 'Hathor', 'Bastet', 'Thoth', 'Osiris']
+
+# Pyramid tiles
+BOT_BASE_ACTIONS = [
+    "Horus", "Ra", "Hathor", "Bastet", "Thoth", "Osiris",
+    "Granite/Limestone/Bread/Papyrus", "Papyrus/Bread/Limestone/Granite", 
+    "Limestone/Granite/Papyrus/Bread", "Bread/Papyrus/Granite/Limestone"
+]
+
+LIGHTING = {
+    "Limestone": {"Sunny":"Pure", "Shaded":"Tainted", "Dark":"Forbidden"},
+    "Papyrus": {"Sunny":"Tainted", "Shaded":"Pure", "Dark":"Forbidden"},
+    "Granite": {"Sunny":"Forbidden", "Shaded":"Tainted", "Dark":"Pure"},
+    "Bread": {"Sunny":"Forbidden", "Shaded":"Pure", "Dark":"Tainted"},
+    "Gray": {"Sunny":"Tainted", "Shaded":"Tainted", "Dark":"Tainted"},
+}
+
+# If pyramid looks like 0123/456/78/9, these are the 4 action orders possible
+POSSIBLE_BOT_ACTIONS = [
+    [0,1,2,3], [0,1,2,6], [0,1,5,6], [0,1,5,8],
+    [0,4,5,6], [0,4,5,8], [0,4,7,8], [0,4,7,9],
+]
+
+OSIRIS_ORDER = ['Papyrus', 'Bread', 'Limestone', 'Granite']
+
+# Where bot VPs come from. Actions covers VPs scored while building during the rounds.
+VP_CATEGORIES = [
+    "Actions", "Statue Bonus", "Osiris", "Temple Buildings", "Temple Pillars", "Statues",
+    "Happiness", "Blessings", "Technologies", "Decrees", "Scribes", "Turn Order",
+]
+
+# Piece the Player builds when taking a die from each God
+PLAYER_GOD_ACTIONS = {"Horus": "Statue", "Ra": "Pillar", "Hathor": "Temple_Building", "Osiris": "Osiris_Building"}
+
+DICE_COLORS = ['Limestone', 'Papyrus', 'Granite', 'Bread', 'Gray']
+
+STATUE_SPOTS = GOD_ORDER + ["Papyrus_Bread", "Limestone_Granite", "Temple_Horizontal", "Temple_Vertical"]
+
+# Osiris region -> statue spot counted in its majority, and back
+REGION_STATUE = {"Papyrus": "Papyrus_Bread", "Bread": "Papyrus_Bread", "Limestone": "Limestone_Granite", "Granite": "Limestone_Granite"}
+STATUE_REGIONS = {"Papyrus_Bread": ("Papyrus", "Bread"), "Limestone_Granite": ("Limestone", "Granite")}
+
+# Bit positions on Board masks
+STATUE_BITS = {spot: 1<<i for i, spot in enumerate(STATUE_SPOTS)}
+OSIRIS_SHIFTS = {region: 6*i for i, region in enumerate(OSIRIS_ORDER)}
+OSIRIS_REGION_MASKS = {region: 0b111111<<shift for region, shift in OSIRIS_SHIFTS.items()}
+ROW_MASKS = [0b11111<<(5*r) for r in range(5)]
+COL_MASKS = [sum(1<<(5*r+c) for r in range(5)) for c in range(5)]
+ALL_CELLS = (1<<25)-1
+
+# 5-bit Temple Building mask -> pillar cells in those rows/cols
+LINE_ROW_MASKS = [sum(ROW_MASKS[i] for i in range(5) if lines>>i & 1) for lines in range(32)]
+LINE_COL_MASKS = [sum(COL_MASKS[i] for i in range(5) if lines>>i & 1) for lines in range(32)]
+
+# Pillar cell -> mask of its in-board neighbors
+NEIGHBOR_MASKS = [
+    sum(1<<(5*(r+dr)+c+dc) for dr, dc in ((-1,0), (1,0), (0,-1), (0,1)) if 0<=r+dr<5 and 0<=c+dc<5)
+    for r in range(5) for c in range(5)
+]
+
+# Ra tie-break, cells closest to center first:
+# 0 1 1 1 0
+# 1 2 3 2 1 
+# 1 3 4 3 1
+# 1 2 3 2 1
+# 0 1 1 1 0
+CENTER_MASKS = [
+    sum(1<<(5*r+c) for r in range(5) for c in range(5) if min(r, 4-r, 2)+min(c, 4-c, 2)==score)
+    for score in range(4, -1, -1)
+]
+
+
+def mask_cells(mask):
+    """
+    Returns: [(row, col) ..] of the pillar cells set in mask, row by row
+    """
+    return [(i//5, i%5) for i in range(25) if mask>>i & 1]
+
+
+POLARITIES = ["Forbidden", "Pure", "Tainted"]
+
+# Lighting of each God counted clockwise from the first sunny God
+WHEEL_LIGHTING = ["Sunny", "Sunny", "Shaded", "Dark", "Dark", "Shaded"]
+
+
+def compile_polarity_table(lighting):
+    """
+    Returns: {(first_sunny, god, color): polarity ..}
+    """
+    return {
+        (sunny, god, color): lighting[color][WHEEL_LIGHTING[(GOD_ORDER.index(god)-GOD_ORDER.index(sunny))%6]]
+        for sunny in GOD_ORDER for god in GOD_ORDER for color in lighting
+    }
+
+
+def compile_polarity_changes(table):
+    """
+    Returns: {(old first_sunny, new first_sunny, god): {color: (old polarity, new polarity)} of the colors whose dice
+    change polarity on that God ..}
+    """
+    colors = {color for _, _, color in table}
+    return {
+        (old, new, god): {color: (table[(old, god, color)], table[(new, god, color)]) for color in colors
+                          if table[(old, god, color)]!=table[(new, god, color)]}
+        for old in GOD_ORDER for new in GOD_ORDER for god in GOD_ORDER
+    }
+
+
+def compile_god_polarities(table):
+    """
+    Returns: {(first_sunny, god): {color: polarity} ..}
+    """
+    polarities = {}
+    for (sunny, god, color), polarity in table.items():
+        polarities.setdefault((sunny, god), {})[color] = polarity
+    return polarities
+
+
+POLARITY_TABLE = compile_polarity_table(LIGHTING)
+POLARITY_CHANGES = compile_polarity_changes(POLARITY_TABLE)
+GOD_POLARITIES = compile_god_polarities(POLARITY_TABLE)
+
+# Thoth. (highest happiness of the zone, zone, (decrees, technologies, blessings) for 1-3 cards). None is no limit.
+THOTH_ZONES = [
+    (4, "yellow", [(0,1,0), (0,1,1), (0,1,2)]),
+    (8, "red", [(0,1,0), (0,2,0), (0,2,1)]),
+    (12, "green", [(1,0,0), (1,1,0), (1,2,0)]),
+    (None, "blue", [(1,0,0), (2,0,0), (2,1,0)]),
+]
+
+# Bastet. Die value -> scribes gained
+BASTET_SCRIBES = {1: 2, 2: 2, 3: 1, 4: 1, 5: 0, 6: 0}
+
+# Happiness scoring. (lowest happiness, VPs) of every triangle, ascending
+HAPPINESS_TRIANGLES = [(9, 3), (13, 6), (16, 9), (19, 12), (21, 15)]
+
+# Horus position 1-6 -> (scribes, VPs) statue bonus
+STATUE_BONUS = [(1, 0), (1, 0), (0, 1), (0, 1), (1, 1), (1, 1)]
+
+
+class Ruleset(object):
+    """
+    Rules a house rule may change, compiled once into flat lookup tables. Standard rules by default.
+    Params:
+      - total_buildings, total_pillars, total_statues (int): bot pieces
+      - starting_happiness, starting_population (int): bot tracks at setup
+      - lighting (dict): {color: {Sunny, Shaded, Dark: polarity}}
+      - thoth_zones (list), bastet_scribes (dict), happiness_triangles (list), statue_bonus (list): as THOTH_ZONES ..
+
+    Tables:
+      - thoth_cards[min(happiness, thoth_cap)][value]: (decrees, technologies, blessings, zone)
+      - bastet[(gap, value)]: (scribes, happiness gained, population gained). gap is population-happiness clamped to -6..6
+      - happiness_vps[min(happiness, happiness_cap)]: VPs
+      - statue_bonus[Horus position 0-5]: (scribes, VPs)
+      - statue_vps[statues built]: VPs
+      - osiris_probes[(resource, value)]: the 24 (region, row) spots in the order a bot Osiris building tries them
+      - polarity_table, polarity_changes, god_polarities: as POLARITY_TABLE, POLARITY_CHANGES, GOD_POLARITIES
+    """
+    def __init__(self, total_buildings=TOTAL_BUILDINGS, total_pillars=TOTAL_PILLARS, total_statues=TOTAL_STATUES,
+                 starting_happiness=STARTING_HAPPINESS, starting_population=STARTING_POPULATION, lighting=LIGHTING,
+                 thoth_zones=THOTH_ZONES, bastet_scribes=BASTET_SCRIBES, happiness_triangles=HAPPINESS_TRIANGLES,
+                 statue_bonus=STATUE_BONUS):
+        self.total_buildings = total_buildings
+        self.total_pillars = total_pillars
+        self.total_statues = total_statues
+        self.starting_happiness = starting_happiness
+        self.starting_population = starting_population
+        self.lighting = lighting
+
+        self.thoth_cap = max(limit for limit, _, _ in thoth_zones if limit is not None) + 1
+        self.thoth_cards = []
+        for happiness in range(self.thoth_cap+1):
+            _, zone, cards = next(z for z in thoth_zones if z[0] is None or happiness<=z[0])
+            self.thoth_cards.append([None] + [cards[(value+1)//2-1] + (zone,) for value in range(1, 7)])
+
+        self.bastet = {}
+        for gap, value in product(range(-6, 7), range(1, 7)):
+            happiness, population = 0, gap
+            for _ in range(value):
+                if happiness<population:
+                    happiness += 1
+                else:
+                    population += 1
+            self.bastet[(gap, value)] = (bastet_scribes[value], happiness, population-gap)
+
+        self.happiness_cap = happiness_triangles[-1][0]
+        self.happiness_vps = [max([vps for lowest, vps in happiness_triangles if happiness>=lowest], default=0)
+                              for happiness in range(self.happiness_cap+1)]
+
+        self.statue_bonus = list(statue_bonus)
+        self.statue_vps = [n*(n+1)//2 for n in range(total_statues+1)]
+
+        # Resources cycle from the die color first, then values descend from the die value
+        self.osiris_probes = {}
+        for start, resource in enumerate(OSIRIS_ORDER):
+            resource_order = OSIRIS_ORDER[start:] + OSIRIS_ORDER[:start]
+            for value in range(1, 7):
+                rows = list(range(5, -1, -1))
+                rows = rows[rows.index(value-1):] + rows[:rows.index(value-1)]
+                self.osiris_probes[(resource, value)] = tuple((region, row) for row, region in product(rows, resource_order))
+
+        if lighting is LIGHTING:
+            self.polarity_table, self.polarity_changes, self.god_polarities = POLARITY_TABLE, POLARITY_CHANGES, GOD_POLARITIES
+        else:
+            self.polarity_table = compile_polarity_table(lighting)
+            self.polarity_changes = compile_polarity_changes(self.polarity_table)
+            self.god_polarities = compile_god_polarities(self.polarity_table)
+
+
+STANDARD_RULES = Ruleset()
@@ -0,0 +1,296 @@
+import random
+import time
+from collections import namedtuple
+
+from .policies import PlayerPolicy, GreedyPolicy
+from .zobrist import TURN_KEYS, BALANCE_KEYS, TranspositionTable
+
+"""
+Hints for the Player's die pick.
+
+The Bot only draws from its rng to break ties, so its reply to a pick can be worked out exactly: BranchRandom walks
+every combination of tie-breaks, each with its probability. The search is expectimax over those outcomes, the Player
+minimising the Bot's expected VPs, with iterative deepening one Player pick at a time. Larger draws, like the Maat
+pyramid reshuffle, are sampled from a fixed stream instead of enumerated.
+
+Player builds, refills and balance inside the search are played by a GreedyPolicy on its own stream.
+
+Different orders of picks often reach the same state, so the value of every Player pick node is kept in a
+TranspositionTable keyed on the state's Zobrist hash, and a later visit at the same or lower depth reuses it.
+"""
+
+# Enumerate sample() only for small populations. The 10 tile pyramid reshuffle is sampled
+MAX_ENUMERATED_SAMPLE = 4
+# Outcomes looked at per move. Past it the probabilities of the ones seen are scaled up to 1
+MAX_OUTCOMES = 32
+
+Hint = namedtuple("Hint", "pick value depth values complete")
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class BranchRandom(object):
+    """
+    Stands in for the game rng and follows one branch of every choice.
+    Params:
+      - path (list of int): index to take at each choice, in the order they come. 0 past its end
+      - fallback (random.Random): draws for everything that is not enumerated
+    """
+    def __init__(self, path, fallback):
+        self.path = path
+        self.fallback = fallback
+        self.widths = []
+
+    def pick(self, width):
+        depth = len(self.widths)
+        self.widths.append(width)
+        return self.path[depth] if depth<len(self.path) else 0
+
+    def choice(self, seq):
+        return seq[self.pick(len(seq))]
+
+    def sample(self, population, k):
+        if len(population)>MAX_ENUMERATED_SAMPLE:
+            return self.fallback.sample(population, k)
+        pool = list(population)
+        return [pool.pop(self.pick(len(pool))) for _ in range(k)]
+
+    def __getattr__(self, name):
+        return getattr(self.fallback, name)
+
+    @property
+    def probability(self):
+        probability = 1.0
+        for width in self.widths:
+            probability /= width
+        return probability
+
+
+def outcomes(run, fallback, limit=MAX_OUTCOMES):
+    """
+    Run a function of an rng once per combination of choices it makes.
+
+    Params:
+      - run (callable): takes a BranchRandom, returns a result
+      - fallback (random.Random): stream for draws that are not enumerated. Rewound for every run
+      - limit (int): most outcomes to return
+    Returns:
+      - [(probability, result) ..]. Probabilities add up to 1
+    """
+    results = []
+    stack = [[]]
+    # Every run starts the fallback stream over, so a path always leads to the same choices
+    state = fallback.getstate()
+    while stack and len(results)<limit:
+        path = stack.pop()
+        fallback.setstate(state)
+        rng = BranchRandom(path, fallback)
+        result = run(rng)
+        results.append((rng.probability, result))
+        # Every choice made past the path took index 0. Branch on the others
+        for depth in range(len(rng.widths)-1, len(path)-1, -1):
+            for index in range(rng.widths[depth]-1, 0, -1):
+                stack.append(path + [0]*(depth-len(path)) + [index])
+    if stack:
+        total = sum(probability for probability, _ in results)
+        results = [(probability/total, result) for probability, result in results]
+    return results
+
+
+def unique_picks(game):
+    """
+    Returns: legal (god, polarity, die) picks without repeats
+    """
+    return list(dict.fromkeys(game.dice_pool.legal_picks()))
+
+
+def quick_hint(game, picks):
+    """
+    Hint without a search, for when there is no time for one: the highest die, Pure if tied, like GreedyPolicy.
+    Returns: Hint of depth 0. value is the Bot's VPs now and values is empty
+    """
+    pick = max(picks, key=lambda p: (p[2][1], p[1]=="Pure"))
+    return Hint(pick, game.vps, 0, {}, False)
+
+
+class HintSearch(object):
+    """
+    Anytime search of the Player's die pick.
+    Params:
+      - budget (float): seconds to search
+      - max_depth (int): Player picks to look ahead
+      - seed (int): stream for sampled draws and the Player side, so a hint is repeatable
+      - table (TranspositionTable): searched nodes, kept across searches. A new one if None
+    """
+    def __init__(self, budget=0.2, max_depth=6, seed=0, table=None):
+        self.budget = budget
+        self.max_depth = max_depth
+        self.seed = seed
+        self.table = table if table is not None else TranspositionTable()
+        self.nodes = 0
+        self.deadline = None
+        self.cut_off = False
+
+    def search(self, game, turns_done=None, balance=None):
+        """
+        Params:
+          - game (Game): waiting on the Player's die pick
+          - turns_done (int): turns played this round. Worked out from the turn order if None
+          - balance (int): Player balance. From game.policy if None
+        Returns:
+          - Hint(pick, value, depth, values, complete). value is the Bot's expected final VPs at the search horizon
+            after pick, values has it for every pick. complete is False if time ran out before depth was done.
+            If it ran out before any pick was valued, depth is 0 and pick the highest Pure die, see quick_hint.
+            None if there is no die to take
+        """
+        self.deadline = time.perf_counter() + self.budget
+        self.nodes = 0
+        self.fallback = random.Random(self.seed)
+        self.table.new_search()
+        if turns_done is None:
+            turns_done = game.player_order.index("Player")
+        if balance is None:
+            balance = getattr(game.policy, "player_balance", 0)
+
+        picks = unique_picks(game)
+        if not picks:
+            return None
+        best = None
+        for depth in range(1, self.max_depth+1):
+            values = {}
+            self.cut_off = False
+            try:
+                for pick in picks:
+                    values[pick] = self.expect(game, turns_done, balance, pick, depth)
+            except SearchTimeout:
+                if best is None and values:
+                    pick = min(values, key=values.get)
+                    best = Hint(pick, values[pick], depth, values, False)
+                break
+            pick = min(values, key=values.get)
+            best = Hint(pick, values[pick], depth, values, True)
+            if not self.cut_off:
+                # Every line reached the end of the game
+                break
+            # Best first, so a cut short depth has its likely answer checked
+            picks.sort(key=values.get)
+        if best is None:
+            best = quick_hint(game, picks)
+        return best
+
+    def expect(self, game, turns_done, balance, pick, depth):
+        """
+        Returns: Bot's expected VPs after the Player takes pick and the game runs up to the next pick, then
+        depth-1 more picks with the Player picking the least for the Bot
+        """
+        total = 0.0
+        for probability, (child, child_turns, child_balance) in outcomes(
+                lambda rng: self.step(game, turns_done, balance, pick, rng), self.fallback):
+            if child_turns is None or depth==1:
+                self.cut_off = self.cut_off or child_turns is not None
+                value = child.vps
+            else:
+                value = self.value(child, child_turns, child_balance, depth-1)
+            total += probability*value
+        return total
+
+    def value(self, game, turns_done, balance, depth):
+        """
+        Returns: Bot's expected VPs with the Player picking the least for the Bot, depth picks ahead
+        """
+        key = game.state_hash() ^ TURN_KEYS[turns_done] ^ BALANCE_KEYS[balance % len(BALANCE_KEYS)]
+        entry = self.table.get(key, depth)
+        if entry is not None:
+            value, cut_off = entry
+            self.cut_off = self.cut_off or cut_off
+            return value
+        # Whether this subtree stopped short of the end of the game, so a hit carries it on
+        outer, self.cut_off = self.cut_off, False
+        value = min(self.expect(game, turns_done, balance, p, depth) for p in unique_picks(game))
+        self.table.put(key, depth, (value, self.cut_off))
+        self.cut_off = self.cut_off or outer
+        return value
+
+    def step(self, game, turns_done, balance, pick, rng):
+        """
+        Returns: (game, turns_done, balance) at the next Player pick, turns_done None if the game is over
+        """
+        if time.perf_counter()>self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+        policy = GreedyPolicy(rng.fallback)
+        policy.player_balance = balance + (1 if pick[1]=="Pure" else -1)
+        child = game.clone(policy=policy, rng=rng)
+        steps = child.play(turns_done)
+        answer = pick
+        changes = None
+        try:
+            steps.send(None)
+            while True:
+                decision = steps.send(answer)
+                if decision.kind=="die":
+                    return child, child.player_order.index("Player"), policy.player_balance
+                elif decision.kind=="change":
+                    if changes is None:
+                        changes = iter(policy.board_changes(child, decision.round_number, decision.god, decision.die))
+                    answer = next(changes, None)
+                elif decision.kind=="balance":
+                    answer = policy.balance(child, decision.round_number)
+                else:
+                    answer = policy.new_die(child, decision.god)
+        except StopIteration:
+            return child, None, policy.player_balance
+
+
+def hint(game, budget=0.2, max_depth=6):
+    """
+    Returns: Hint for the Player's next die pick, searched for at most budget seconds. See HintSearch.search
+    """
+    return HintSearch(budget, max_depth).search(game)
+
+
+class HintPolicy(PlayerPolicy):
+    """
+    Wraps a policy and prints a hint before every die pick.
+    Params:
+      - policy (PlayerPolicy): policy that makes the decisions, e.g. ConsolePolicy
+      - budget (float): seconds to search per hint
+    """
+    def __init__(self, policy, budget=0.2):
+        self.policy = policy
+        self.budget = budget
+        self.interactive = policy.interactive
+        self.error = policy.error
+        # One search for the whole game, so its table carries over from pick to pick
+        self.search = HintSearch(budget)
+
+    @property
+    def player_balance(self):
+        return getattr(self.policy, "player_balance", 0)
+
+    @player_balance.setter
+    def player_balance(self, value):
+        if hasattr(self.policy, "player_balance"):
+            self.policy.player_balance = value
+
+    def select_die(self, game, round_number):
+        result = self.search.search(game)
+        if result is not None and result.depth==0:
+            god, polarity, (color, value) = result.pick
+            print("Hint: take {} {} {} {}. Out of time before any search, highest die".format(god, polarity, color, value))
+        elif result is not None:
+            god, polarity, (color, value) = result.pick
+            print("Hint: take {} {} {} {}. Bot expected at {:.1f} VPs, {} picks ahead".format(
+                god, polarity, color, value, result.value, result.depth))
+        return self.policy.select_die(game, round_number)
+
+    def board_changes(self, game, round_number, god, die):
+        return self.policy.board_changes(game, round_number, god, die)
+
+    def balance(self, game, round_number):
+        return self.policy.balance(game, round_number)
+
+    def new_die(self, game, region):
+        return self.policy.new_die(game, region)
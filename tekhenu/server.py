@@ -0,0 +1,325 @@
+import asyncio
+import io
+import os
+import random
+import secrets
+import signal
+import struct
+import time
+
+from .dice import roll_dice
+from .engine import Game
+from .events import ConsoleSink, NullSink
+from .policies import PlayerPolicy
+from .rng import seeded_random
+from .rules import GOD_ORDER
+
+"""
+Line based game server. One process hosts many tables, each a Game run as a generator of Decisions (Game.play),
+so no session ever blocks the event loop waiting for its player.
+
+A client connects over TCP or a Unix socket and types `new [Easy|Medium|Hard] [seed]` or `resume <id>`, then
+answers the prompts one line each, like the console game. `quit` leaves a session to resume later.
+
+Sessions idle for a while are evicted to disk: the snapshot of the last finished round plus the lines answered
+since. Loading one back replays those lines silently, so the player is back at the same prompt.
+"""
+
+PROMPTS = {
+    "die": "Which dice is Player selecting (God Polarity Color Number)?: ",
+    "change": "Which board state changed (Statue God / Pillar row col / Temple_Building Horizontal/Vertical row/col / "
+              "Osiris_Building Papyrus/Bread/Limestone/Granite 1-6 / Stop)?: ",
+    "balance": "What is the absolute value of Player balance?: ",
+    "new_die": "Which dice to add dice to {god} (Color Number)?: ",
+}
+
+WELCOME = "Tekhenu bot server. Type `new [Easy|Medium|Hard] [seed]` or `resume <id>`\n"
+
+SAVED = struct.Struct("<I")
+
+
+class SessionPolicy(PlayerPolicy):
+    """
+    Placeholder policy of a served game. Answers come from the client through Session.handle, never from here.
+    """
+    interactive = True
+
+
+def parse_answer(decision, line):
+    """
+    Turn a client line into the answer to decision. Lines the engine can judge are passed on for it to reject.
+
+    Params:
+      - decision (Decision): question pending
+      - line (str): what the client typed
+    Returns:
+      - answer to send to Game.play
+    Raises:
+      - ValueError with the text to show if line is not an answer at all
+    """
+    words = line.split(" ")
+    if decision.kind=="die":
+        if len(words)!=4:
+            return None
+        return words[0], words[1], (words[2], words[3])
+
+    if decision.kind=="change":
+        command = words[0]
+        try:
+            if command=="Stop":
+                return None
+            elif command=="Statue":
+                return command, words[1]
+            elif command=="Pillar":
+                return command, (int(words[1]), int(words[2]))
+            elif command in ("Temple_Building", "Osiris_Building"):
+                return command, (words[1], int(words[2]))
+        except (IndexError, ValueError):
+            raise ValueError(ConsoleSink.REJECTED_TEXT[command])
+        raise ValueError(ConsoleSink.REJECTED_TEXT["command"])
+
+    if decision.kind=="balance":
+        try:
+            return int(line)
+        except ValueError:
+            raise ValueError(ConsoleSink.REJECTED_TEXT["balance"])
+
+    try:
+        return words[0], int(words[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class Session(object):
+    """
+    One table. Holds the game generator, the Decision it waits on and what it needs to be evicted to disk.
+    Params:
+      - session_id (str)
+    """
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.output = io.StringIO()
+        self.game = None
+        self.steps = None
+        self.pending = None
+        self.snapshot = None
+        self.answers = []
+        self.last_active = time.monotonic()
+
+    @classmethod
+    def new(cls, session_id, difficulty="Medium", seed=None):
+        """
+        Returns: Session with a new game, set up at random from seed.
+        """
+        session = cls(session_id)
+        rng = seeded_random(seed)
+        horus_order, first_sunny, starting_dice = rng.sample(GOD_ORDER, 6), rng.choice(GOD_ORDER), roll_dice(rng)
+        session.game = Game(difficulty, horus_order, first_sunny, starting_dice, policy=SessionPolicy(),
+                            sink=ConsoleSink(session.output), rng=rng, autosave=session.checkpoint)
+        session.checkpoint(session.game.to_bytes())
+        session.start()
+        return session
+
+    @classmethod
+    def from_bytes(cls, session_id, data):
+        """
+        Returns: Session saved with to_bytes(), waiting on the same Decision as when it was saved.
+        """
+        session = cls(session_id)
+        length, = SAVED.unpack_from(data, 0)
+        snapshot = data[SAVED.size:SAVED.size+length]
+        lines = data[SAVED.size+length:].decode("utf-8")
+        session.game = Game.from_bytes(snapshot, policy=SessionPolicy(), sink=NullSink(), autosave=session.checkpoint)
+        session.snapshot = snapshot
+        session.start()
+        for line in lines.split("\n") if lines else []:
+            session.handle(line)
+        session.game.sink = ConsoleSink(session.output)
+        session.output.write("Resumed session {} in round {}\n".format(session_id, session.game.round_number+1))
+        session.game.print_dice(heading=True)
+        return session
+
+    def to_bytes(self):
+        return SAVED.pack(len(self.snapshot)) + self.snapshot + "\n".join(self.answers).encode("utf-8")
+
+    def checkpoint(self, snapshot):
+        # Called by the game after every round. Answers before it are in the snapshot
+        self.snapshot = snapshot
+        self.answers = []
+
+    def start(self):
+        self.steps = self.game.play()
+        self.advance(None)
+
+    def advance(self, answer):
+        try:
+            self.pending = self.steps.send(answer)
+        except StopIteration:
+            self.pending = None
+
+    @property
+    def finished(self):
+        return self.pending is None
+
+    def prompt(self):
+        if self.pending is None:
+            return ""
+        return PROMPTS[self.pending.kind].format(god=self.pending.god)
+
+    def read(self):
+        """
+        Returns: str. Game text since the last read, and the pending prompt
+        """
+        text = self.output.getvalue() + self.prompt()
+        self.output.seek(0)
+        self.output.truncate()
+        return text
+
+    def handle(self, line):
+        """
+        Answer the pending Decision with a client line and run the game up to its next Decision.
+        """
+        self.last_active = time.monotonic()
+        try:
+            answer = parse_answer(self.pending, line)
+        except ValueError as e:
+            print(e, file=self.output)
+            return
+        self.answers.append(line)
+        self.advance(answer)
+
+
+class GameServer(object):
+    """
+    Hosts sessions for any number of connections in one event loop.
+    Params:
+      - directory (str): where evicted sessions are kept
+      - idle_timeout (float): seconds without input before a session not in use is evicted
+      - max_sessions (int): sessions kept in memory. The longest idle one not in use is evicted past it
+    """
+    def __init__(self, directory, idle_timeout=600, max_sessions=500):
+        self.directory = directory
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.connected = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, session_id):
+        return os.path.join(self.directory, session_id + ".session")
+
+    def evict(self, session_id):
+        session = self.sessions.pop(session_id)
+        with open(self.path(session_id) + ".tmp", "wb") as f:
+            f.write(session.to_bytes())
+        os.replace(self.path(session_id) + ".tmp", self.path(session_id))
+
+    def make_room(self):
+        # Evict the least recently active idle sessions, only as many as it takes to fit one more under the cap
+        if len(self.sessions)<self.max_sessions:
+            return
+        idle = [s for s in self.sessions.values() if s.session_id not in self.connected]
+        for session in sorted(idle, key=lambda s: s.last_active)[:max(0, len(self.sessions)-self.max_sessions+1)]:
+            self.evict(session.session_id)
+
+    def open(self, words):
+        """
+        Returns: (session, message) for a `new` or `resume` line. session is None if it could not be opened.
+        """
+        if words[0]=="new":
+            difficulty = words[1] if len(words)>1 else "Medium"
+            if difficulty not in ("Easy", "Medium", "Hard"):
+                return None, "Unknown difficulty {}\n".format(difficulty)
+            try:
+                seed = int(words[2]) if len(words)>2 else random.getrandbits(32)
+            except ValueError:
+                seed = -1
+            # Snapshots store the seed in 8 bytes
+            if not 0<=seed<2**64:
+                return None, "Seed must be a number from 0 to {}\n".format(2**64-1)
+            self.make_room()
+            session = Session.new(secrets.token_hex(4), difficulty, seed)
+            self.sessions[session.session_id] = session
+            return session, "Session {} ({}, seed {})\n".format(session.session_id, difficulty, seed)
+
+        if words[0]=="resume" and len(words)==2:
+            session_id = words[1]
+            if len(session_id)!=8 or any(c not in "0123456789abcdef" for c in session_id):
+                return None, "No session {}\n".format(session_id)
+            if session_id in self.connected:
+                return None, "Session {} is in use\n".format(session_id)
+            if session_id not in self.sessions:
+                if not os.path.exists(self.path(session_id)):
+                    return None, "No session {}\n".format(session_id)
+                self.make_room()
+                with open(self.path(session_id), "rb") as f:
+                    self.sessions[session_id] = Session.from_bytes(session_id, f.read())
+                os.remove(self.path(session_id))
+            return self.sessions[session_id], ""
+
+        return None, WELCOME
+
+    def close(self, session):
+        self.connected.discard(session.session_id)
+        session.last_active = time.monotonic()
+        if session.finished:
+            self.sessions.pop(session.session_id, None)
+
+    async def handle(self, reader, writer):
+        session = None
+        writer.write(WELCOME.encode())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", "replace").strip()
+                if session is None:
+                    session, message = self.open(text.split(" "))
+                    if session is not None:
+                        self.connected.add(session.session_id)
+                        message += session.read()
+                    writer.write(message.encode())
+                elif text=="quit":
+                    writer.write("Saved. Type `resume {}` to carry on\n".format(session.session_id).encode())
+                    break
+                else:
+                    session.handle(text)
+                    writer.write(session.read().encode())
+                    if session.finished:
+                        break
+                await writer.drain()
+        finally:
+            if session is not None:
+                self.close(session)
+            writer.close()
+
+    async def sweep(self):
+        while True:
+            await asyncio.sleep(self.idle_timeout/4)
+            now = time.monotonic()
+            for session in list(self.sessions.values()):
+                if session.session_id not in self.connected and now-session.last_active>self.idle_timeout:
+                    self.evict(session.session_id)
+
+    async def serve(self, host="127.0.0.1", port=7777, path=None):
+        """
+        Accept connections on path (Unix socket) if given, else on host:port, till cancelled.
+        Sessions in memory are evicted to disk on the way out, also when stopped with SIGTERM.
+        """
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        sweeper = asyncio.ensure_future(self.sweep())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+            for session_id in list(self.sessions):
+                self.evict(session_id)
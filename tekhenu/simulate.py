@@ -0,0 +1,220 @@
+import itertools
+import os
+import random
+
+from .dice import roll_dice
+from .engine import Game
+from .events import NullSink
+from .metrics import Metrics
+from .policies import RandomPolicy, GreedyPolicy
+from .rng import BlockRandom, StreamRandom
+from .rules import GOD_ORDER, VP_CATEGORIES
+from .stats import StreamingSummary
+
+"""
+Monte Carlo runner for headless bot games.
+
+Every game draws from its own random stream seeded from (seed, game index), so a run gives
+the same results whatever the number of workers, and any single game can be replayed alone.
+"""
+
+POLICIES = {"random": RandomPolicy, "greedy": GreedyPolicy}
+
+# None means draw a new random value for every game
+DEFAULT_CONFIG = {
+    "difficulty": "Medium",
+    "horus_order": None,
+    "first_sunny": None,
+    "starting_dice": None,
+    "policy": "random",
+    "rng": "python",
+    "rules": None,
+    "metrics": False,
+    # Directory of a tekhenu.store to write every game to, and the config_id column of its rows
+    "store": None,
+    "config_id": 0,
+    # Keep a StreamingSummary, with quantiles, histograms and end-state counters, instead of a ScoreSummary
+    "streaming": False,
+}
+
+# How a game's random stream is built from its seed
+RNGS = {
+    "python": lambda seed: random.Random(seed),
+    "block": lambda seed: BlockRandom(seed),
+    # A stream per kind of draw and round, so games played differently from one seed stay paired, see tekhenu.paired
+    "streams": lambda seed: StreamRandom(seed),
+}
+
+CHUNK_SIZE = 250
+# Chunks handed to the pool at a time per worker, so a run of any length keeps few of them in memory
+CHUNKS_PER_WORKER = 8
+
+
+class ScoreSummary(object):
+    """
+    Aggregated bot VPs over many games. Total plus every VP_CATEGORIES entry.
+    Sums are kept so summaries from different workers merge by addition.
+    """
+    def __init__(self):
+        self.games = 0
+        self.sums = dict.fromkeys(["Total"] + VP_CATEGORIES, 0)
+        self.squares = dict.fromkeys(["Total"] + VP_CATEGORIES, 0)
+        self.mins = {}
+        self.maxs = {}
+
+    def add(self, game):
+        self.games += 1
+        for category, vps in [("Total", game.vps)] + list(game.vp_breakdown.items()):
+            self.sums[category] += vps
+            self.squares[category] += vps*vps
+            self.mins[category] = min(self.mins.get(category, vps), vps)
+            self.maxs[category] = max(self.maxs.get(category, vps), vps)
+
+    def add_batch(self, batch):
+        """
+        Add every game of a finished batch.BatchGame.
+        """
+        columns = [("Total", batch.vps)] + [(c, batch.vp_breakdown[:, i]) for i, c in enumerate(VP_CATEGORIES)]
+        self.games += batch.n
+        for category, vps in columns:
+            vps = vps.astype("int64")
+            self.sums[category] += int(vps.sum())
+            self.squares[category] += int((vps*vps).sum())
+            self.mins[category] = min(self.mins.get(category, int(vps.min())), int(vps.min()))
+            self.maxs[category] = max(self.maxs.get(category, int(vps.max())), int(vps.max()))
+
+    def merge(self, other):
+        self.games += other.games
+        for category in self.sums:
+            self.sums[category] += other.sums[category]
+            self.squares[category] += other.squares[category]
+            if category in other.mins:
+                self.mins[category] = min(self.mins.get(category, other.mins[category]), other.mins[category])
+                self.maxs[category] = max(self.maxs.get(category, other.maxs[category]), other.maxs[category])
+        return self
+
+    def as_dict(self):
+        """
+        Returns: {"games": n, category: {"mean", "std", "min", "max"} ..}
+        """
+        result = {"games": self.games}
+        for category in self.sums:
+            if not self.games:
+                continue
+            mean = self.sums[category]/self.games
+            variance = max(self.squares[category]/self.games - mean*mean, 0)
+            result[category] = {
+                "mean": mean, "std": variance**0.5,
+                "min": self.mins[category], "max": self.maxs[category],
+            }
+        return result
+
+
+def game_rng(config, seed, index):
+    """
+    Random stream of game number index in a run with base seed. Pass it to play_game to replay that game.
+    """
+    if config["rng"]=="block":
+        return RNGS["block"]((seed, index))
+    return RNGS[config["rng"]]("tekhenu:{}:{}".format(seed, index))
+
+
+def play_game(config, rng=random, metrics=None):
+    """
+    Set up and play one full headless game. Every draw, the Player's included, comes from rng.
+    Params:
+      - config (dict): keys of DEFAULT_CONFIG
+      - rng (random.Random): random stream of this game
+      - metrics (Metrics): instrumentation to collect, see tekhenu.metrics
+    Returns:
+      - Game after the final scoring
+    """
+    horus_order = list(config["horus_order"] or rng.sample(GOD_ORDER, 6))
+    first_sunny = config["first_sunny"] or rng.choice(GOD_ORDER)
+    if config["starting_dice"]:
+        starting_dice = {god: list(dice) for god, dice in config["starting_dice"].items()}
+    else:
+        starting_dice = roll_dice(rng)
+
+    game = Game(config["difficulty"], horus_order, first_sunny, starting_dice, policy=POLICIES[config["policy"]](), sink=NullSink(), rng=rng,
+                rules=config["rules"], metrics=metrics)
+    game.game_loop()
+    if metrics is not None:
+        metrics.games += 1
+    return game
+
+
+def run_chunk(args):
+    """
+    Worker entry point. Plays games chunk*CHUNK_SIZE onwards, each on its own stream.
+    Returns: (ScoreSummary or StreamingSummary, Metrics). Metrics is None unless config["metrics"] is set
+    """
+    config, seed, chunk, n_games = args
+    summary = StreamingSummary() if config["streaming"] else ScoreSummary()
+    metrics = Metrics() if config["metrics"] else None
+    writer = None
+    if config["store"] is not None:
+        # NumPy is only loaded when results are stored
+        from .store import process_writer
+        writer = process_writer(config["store"])
+    for index in range(chunk*CHUNK_SIZE, chunk*CHUNK_SIZE+n_games):
+        game = play_game(config, game_rng(config, seed, index), metrics)
+        summary.add(game)
+        if writer is not None:
+            writer.add(game, seed, index, config["config_id"])
+    if writer is not None:
+        writer.flush()
+    return summary, metrics
+
+
+def simulate(n_games, config=None, workers=None, seed=0, progress=None):
+    """
+    Play n_games headless games spread over a process pool.
+
+    Params:
+      - n_games (int): number of games
+      - config (dict): overrides for DEFAULT_CONFIG
+      - workers (int): processes to use. Defaults to all cores. 1 runs in this process.
+      - seed (int): base seed. Same seed and config give the same results.
+      - progress (callable): called with (games done, n_games, summary so far) after every chunk
+    Returns:
+      - dict. ScoreSummary.as_dict() over all games. With config["metrics"] set, "metrics" holds the merged Metrics
+    """
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    if config["policy"] not in POLICIES:
+        raise ValueError("Unknown policy {}. Pick one of {}".format(config["policy"], list(POLICIES)))
+    if config["rng"] not in RNGS:
+        raise ValueError("Unknown rng {}. Pick one of {}".format(config["rng"], list(RNGS)))
+    workers = workers or os.cpu_count() or 1
+
+    chunks = ((config, seed, i, min(CHUNK_SIZE, n_games-start)) for i, start in enumerate(range(0, n_games, CHUNK_SIZE)))
+    summary = StreamingSummary() if config["streaming"] else ScoreSummary()
+    metrics = Metrics()
+
+    def merge(result):
+        chunk_summary, chunk_metrics = result
+        summary.merge(chunk_summary)
+        if chunk_metrics is not None:
+            metrics.merge(chunk_metrics)
+        if progress is not None:
+            progress(summary.games, n_games, summary)
+
+    if workers==1:
+        for chunk in chunks:
+            merge(run_chunk(chunk))
+    else:
+        # Loaded here, so the engine and the command line do not pay for it
+        from multiprocessing import Pool
+        with Pool(workers) as pool:
+            while True:
+                wave = list(itertools.islice(chunks, CHUNKS_PER_WORKER*workers))
+                if not wave:
+                    break
+                for result in pool.imap_unordered(run_chunk, wave):
+                    merge(result)
+
+    results = summary.as_dict()
+    if config["metrics"]:
+        results["metrics"] = metrics
+    return results
+
@@ -0,0 +1,205 @@
+import os
+import random
+import struct
+
+from .board import Board
+from .dice import DicePool
+from .rng import BlockRandom, StreamRandom, STREAMS
+from .rules import GOD_ORDER, BOT_BASE_ACTIONS, POSSIBLE_BOT_ACTIONS, VP_CATEGORIES, DICE_COLORS
+
+"""
+Versioned binary snapshots of a Game. Plain struct fields, no pickle, so loading untrusted bytes is safe.
+
+Layout, little endian:
+  - header: magic, version, difficulty, last finished round, first sunny God, Bot first, bot_actions index,
+            Horus order, action pyramid
+  - counters: vps, vp_breakdown in VP_CATEGORIES order, scribes, happiness, population, blessings,
+              technologies, decrees, pieces built, Player balance of the policy
+  - board: Board.state() masks
+  - dice: count per God, then one byte per die, DICE_COLORS index<<3 | value, in board order
+  - rng: kind byte then its state. 0 not saved, 1 BlockRandom (seed, draws), 2 random.Random (full Mersenne state),
+         3 StreamRandom (key, its own Mersenne state, then STREAMS index, round and Mersenne state of every stream
+         of the round being played)
+
+A game on a BlockRandom stream snapshots to about 150 bytes. The Mersenne state adds 2.5KB, and another 2.5KB per
+StreamRandom stream drawn from in the round. Version 2 added the StreamRandom kind; version 1 snapshots still load.
+Rules, policy, sink and autosave are not saved, they are plugged back in on load.
+"""
+
+MAGIC = b"TKSN"
+VERSION = 2
+# Versions loads() reads. Each only added to the layout of the one before
+READ_VERSIONS = (1, 2)
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+HEADER = struct.Struct("<4sBBBBBB6B10B")
+COUNTERS = struct.Struct("<H{}H6HBBBh".format(len(VP_CATEGORIES)))
+BOARD = struct.Struct("<IIBBBBIIHH")
+DICE_COUNTS = struct.Struct("<6B")
+
+RNG_NONE, RNG_BLOCK, RNG_MERSENNE, RNG_STREAMS = 0, 1, 2, 3
+BLOCK_STATE = struct.Struct("<BQH")
+MERSENNE_STATE = struct.Struct("<625IBd")
+STREAM_HEADER = struct.Struct("<BB")
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def dump_mersenne(rng):
+    version, internal, gauss = rng.getstate()
+    return MERSENNE_STATE.pack(*internal, gauss is not None, gauss or 0.0)
+
+
+def load_mersenne(data, offset, rng):
+    fields = MERSENNE_STATE.unpack_from(data, offset)
+    rng.setstate((3, tuple(fields[:625]), fields[626] if fields[625] else None))
+    return offset + MERSENNE_STATE.size
+
+
+def dump_rng(rng, round_number=None):
+    """
+    Params:
+      - round_number (int): round being played. Streams of a StreamRandom left from other rounds are not saved
+    """
+    if isinstance(rng, StreamRandom):
+        key = rng.key.encode("utf-8")
+        streams = [(STREAMS.index(name), r, stream) for name, (r, stream) in sorted(rng.streams.items())
+                   if round_number is None or r==round_number]
+        return (bytes([RNG_STREAMS]) + struct.pack("<H", len(key)) + key + dump_mersenne(rng) + bytes([len(streams)])
+                + b"".join(STREAM_HEADER.pack(name, r) + dump_mersenne(stream) for name, r, stream in streams))
+    if isinstance(rng, BlockRandom):
+        seed, draws = rng.getstate()
+        seeds = list(seed) if isinstance(seed, tuple) else [seed]
+        return (bytes([RNG_BLOCK]) + BLOCK_STATE.pack(isinstance(seed, tuple), draws, rng.block_size)
+                + struct.pack("<B{}Q".format(len(seeds)), len(seeds), *seeds))
+    if hasattr(rng, "getstate"):
+        return bytes([RNG_MERSENNE]) + dump_mersenne(rng)
+    return bytes([RNG_NONE])
+
+
+def load_rng(data, offset, rng):
+    """
+    Returns: the rng to resume with. A given rng is moved to the saved state if it is of the saved kind.
+    """
+    kind = data[offset]
+    offset += 1
+    if kind==RNG_BLOCK:
+        is_tuple, draws, block_size = BLOCK_STATE.unpack_from(data, offset)
+        offset += BLOCK_STATE.size
+        seeds = struct.unpack_from("<{}Q".format(data[offset]), data, offset+1)
+        seed = tuple(seeds) if is_tuple else seeds[0]
+        if rng is None:
+            rng = BlockRandom(seed, block_size)
+        if isinstance(rng, BlockRandom):
+            rng.setstate((seed, draws))
+    elif kind==RNG_MERSENNE:
+        if rng is None:
+            rng = random.Random()
+        if not isinstance(rng, BlockRandom):
+            load_mersenne(data, offset, rng)
+    elif kind==RNG_STREAMS:
+        length, = struct.unpack_from("<H", data, offset)
+        key = data[offset+2:offset+2+length].decode("utf-8")
+        offset += 2 + length
+        if rng is None:
+            rng = StreamRandom(key)
+        if isinstance(rng, StreamRandom):
+            rng.key = key
+            rng.streams = {}
+            offset = load_mersenne(data, offset, rng)
+            count = data[offset]
+            offset += 1
+            for _ in range(count):
+                name, r = STREAM_HEADER.unpack_from(data, offset)
+                stream = random.Random()
+                offset = load_mersenne(data, offset+STREAM_HEADER.size, stream)
+                rng.streams[STREAMS[name]] = (r, stream)
+    elif kind!=RNG_NONE:
+        raise SnapshotError("Unknown rng kind {}".format(kind))
+    return rng
+
+
+def dumps(game):
+    """
+    Returns: bytes. Snapshot of game
+    """
+    order = {god: i for i, god in enumerate(GOD_ORDER)}
+    header = HEADER.pack(
+        MAGIC, VERSION, DIFFICULTIES.index(game.difficulty), game.round_number, order[game.first_sunny],
+        game.player_order[0]=="Bot", POSSIBLE_BOT_ACTIONS.index(game.bot_actions),
+        *[order[god] for god in game.horus_order], *[BOT_BASE_ACTIONS.index(action) for action in game.bot_pyramid],
+    )
+    counters = COUNTERS.pack(
+        game.vps, *[game.vp_breakdown[category] for category in VP_CATEGORIES],
+        game.scribes, game.happiness, game.population, game.blessings, game.technologies, game.decrees,
+        game.number_built_buildings, game.number_built_pillars, game.number_built_statues,
+        getattr(game.policy, "player_balance", 0),
+    )
+    dice = game.dice_pool.dice
+    counts = DICE_COUNTS.pack(*[len(dice[god]) for god in GOD_ORDER])
+    codes = bytes(DICE_COLORS.index(color)<<3 | value for god in GOD_ORDER for color, value in dice[god])
+    return header + counters + BOARD.pack(*game.board.state()) + counts + codes + dump_rng(game.rng, game.round_number)
+
+
+def loads(cls, data, policy=None, sink=None, rng=None, rules=None, autosave=None):
+    """
+    Rebuild a cls (Game) from dumps() output. Raises SnapshotError if data is not a snapshot this version reads.
+    """
+    if data[:4]!=MAGIC:
+        raise SnapshotError("Not a Tekhenu snapshot")
+    if data[4] not in READ_VERSIONS:
+        raise SnapshotError("Snapshot version {} is not supported. Expected one of {}".format(data[4], READ_VERSIONS))
+    try:
+        header = HEADER.unpack_from(data, 0)
+        counters = COUNTERS.unpack_from(data, HEADER.size)
+        offset = HEADER.size + COUNTERS.size
+        board = BOARD.unpack_from(data, offset)
+        offset += BOARD.size
+        counts = DICE_COUNTS.unpack_from(data, offset)
+        offset += DICE_COUNTS.size
+        dice = {}
+        for god, count in zip(GOD_ORDER, counts):
+            dice[god] = [(DICE_COLORS[code>>3], code & 7) for code in data[offset:offset+count]]
+            offset += count
+        rng = load_rng(data, offset, rng)
+    except (struct.error, IndexError) as e:
+        raise SnapshotError("Truncated or corrupt snapshot: {}".format(e))
+
+    game = cls.__new__(cls)
+    game.attach(policy, sink, rng, rules, autosave)
+    _, _, difficulty, game.round_number, first_sunny, bot_first, actions = header[:7]
+    game.difficulty = DIFFICULTIES[difficulty]
+    game.first_sunny = GOD_ORDER[first_sunny]
+    game.player_order = ["Bot", "Player"] if bot_first else ["Player", "Bot"]
+    game.bot_actions = POSSIBLE_BOT_ACTIONS[actions]
+    game.horus_order = [GOD_ORDER[i] for i in header[7:13]]
+    game.bot_pyramid = [BOT_BASE_ACTIONS[i] for i in header[13:23]]
+
+    game.vps = counters[0]
+    game.vp_breakdown = dict(zip(VP_CATEGORIES, counters[1:1+len(VP_CATEGORIES)]))
+    (game.scribes, game.happiness, game.population, game.blessings, game.technologies, game.decrees,
+     game.number_built_buildings, game.number_built_pillars, game.number_built_statues,
+     player_balance) = counters[1+len(VP_CATEGORIES):]
+    if hasattr(game.policy, "player_balance"):
+        game.policy.player_balance = player_balance
+
+    game.board = Board(board)
+    game.starting_dice = dice
+    game.dice_pool = DicePool(dice, game.first_sunny, game.rules)
+    return game
+
+
+def file_autosave(path):
+    """
+    Returns: an autosave callable for Game that keeps the latest snapshot in path.
+    The file is replaced atomically, so a crash mid-write leaves the previous round's snapshot.
+    """
+    def save(data):
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+    return save
+
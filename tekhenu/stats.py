@@ -0,0 +1,208 @@
+import math
+
+from .rules import VP_CATEGORIES
+
+"""
+Streaming statistics of Bot scores, in memory that does not grow with the number of games.
+
+Every part merges with another of its kind, so workers keep their own and the parent adds them up:
+  - RunningStats: count, mean and variance by Welford's update, merged with Chan's formula, plus min and max
+  - Histogram: counts per bin of fixed width. Scores and counters are small integers, so bins stay few
+  - QuantileSketch: KLL style sketch. Levels of sorted compactors, every item of level h standing for 2**h games;
+    a full level keeps every other item, from a random end, one level up. Quantiles are off by about 1/k of rank
+"""
+
+# Game counters summarised besides the VPs
+END_STATE = [
+    "number_built_buildings", "number_built_pillars", "number_built_statues",
+    "happiness", "population", "decrees", "technologies", "scribes",
+]
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+class RunningStats(object):
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta/self.count
+        self.m2 += delta*(value - self.mean)
+        self.min = value if self.min is None or value<self.min else self.min
+        self.max = value if self.max is None or value>self.max else self.max
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta*other.count/count
+        self.m2 += other.m2 + delta*delta*self.count*other.count/count
+        self.count = count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2/self.count if self.count else 0.0
+
+
+class Histogram(object):
+    """
+    Params:
+      - width (number): bin width. Bin b counts values in [b, b+width)
+    """
+    def __init__(self, width=1):
+        self.width = width
+        self.bins = {}
+
+    def add(self, value):
+        key = math.floor(value/self.width)*self.width
+        self.bins[key] = self.bins.get(key, 0) + 1
+
+    def merge(self, other):
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        return self
+
+
+class QuantileSketch(object):
+    """
+    Params:
+      - k (int): items of the top level. Memory is about 3k items, rank error about 1/k
+      - seed (int): start of the compaction coin flips
+    """
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.levels = [[]]
+        self.count = 0
+        # 64 bit LCG. A random.Random would add kilobytes of state to every sketch sent back by a worker
+        self.state = seed
+
+    def coin(self):
+        self.state = (self.state*6364136223846793005 + 1442695040888963407) & 0xFFFFFFFFFFFFFFFF
+        return self.state>>63
+
+    def capacity(self, level):
+        # Lower levels hold fewer items, 2/3 of the level above, so the total stays near 3k
+        return max(2, int(math.ceil(self.k*(2/3)**(len(self.levels)-level-1))))
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        if len(self.levels[0])>=self.capacity(0):
+            self.compress()
+
+    def compress(self):
+        level = 0
+        while level<len(self.levels):
+            if len(self.levels[level])>=self.capacity(level):
+                if level+1==len(self.levels):
+                    self.levels.append([])
+                items = sorted(self.levels[level])
+                # An odd one out stays, so the weights still add up to count
+                self.levels[level] = [items.pop()] if len(items)%2 else []
+                self.levels[level+1].extend(items[self.coin()::2])
+            level += 1
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level==len(self.levels):
+                self.levels.append([])
+            self.levels[level].extend(items)
+        self.count += other.count
+        while any(len(items)>=self.capacity(level) for level, items in enumerate(self.levels)):
+            self.compress()
+        return self
+
+    def quantiles(self, fractions=QUANTILES):
+        """
+        Returns: [value ..] at each fraction of the rank, None if nothing was added
+        """
+        weighted = sorted((value, 1<<level) for level, items in enumerate(self.levels) for value in items)
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            if not weighted:
+                results.append(None)
+                continue
+            target, seen = fraction*total, 0
+            for value, weight in weighted:
+                seen += weight
+                if seen>=target:
+                    break
+            results.append(value)
+        return results
+
+    def __len__(self):
+        return sum(len(items) for items in self.levels)
+
+
+class StreamingSummary(object):
+    """
+    Bot final VPs, every VP_CATEGORIES entry and the END_STATE counters over any number of games, in constant memory.
+    Drop-in for simulate.ScoreSummary, with quantiles and histograms added to as_dict().
+    Params:
+      - k (int): QuantileSketch size
+    """
+    FIELDS = ["Total"] + VP_CATEGORIES + END_STATE
+
+    def __init__(self, k=200):
+        self.games = 0
+        self.stats = {field: RunningStats() for field in self.FIELDS}
+        self.histograms = {field: Histogram() for field in self.FIELDS}
+        self.sketches = {field: QuantileSketch(k, seed=i) for i, field in enumerate(self.FIELDS)}
+
+    def add_values(self, values):
+        self.games += 1
+        for field, value in zip(self.FIELDS, values):
+            self.stats[field].add(value)
+            self.histograms[field].add(value)
+            self.sketches[field].add(value)
+
+    def add(self, game):
+        self.add_values([game.vps] + [game.vp_breakdown[category] for category in VP_CATEGORIES]
+                        + [getattr(game, counter) for counter in END_STATE])
+
+    def add_batch(self, batch):
+        """
+        Add every game of a finished batch.BatchGame.
+        """
+        columns = ([batch.vps.tolist()] + [batch.vp_breakdown[:, i].tolist() for i in range(len(VP_CATEGORIES))]
+                   + [getattr(batch, counter).tolist() for counter in END_STATE])
+        for values in zip(*columns):
+            self.add_values(values)
+
+    def merge(self, other):
+        self.games += other.games
+        for field in self.FIELDS:
+            self.stats[field].merge(other.stats[field])
+            self.histograms[field].merge(other.histograms[field])
+            self.sketches[field].merge(other.sketches[field])
+        return self
+
+    def as_dict(self):
+        """
+        Returns: {"games": n, field: {"mean", "std", "min", "max", "quantiles": {"p50": ..}, "histogram": {bin: count}} ..}
+        """
+        result = {"games": self.games}
+        if not self.games:
+            return result
+        for field in self.FIELDS:
+            stats = self.stats[field]
+            quantiles = self.sketches[field].quantiles()
+            result[field] = {
+                "mean": stats.mean, "std": stats.variance**0.5, "min": stats.min, "max": stats.max,
+                "quantiles": {"p{:g}".format(100*q): value for q, value in zip(QUANTILES, quantiles)},
+                "histogram": dict(sorted(self.histograms[field].bins.items())),
+            }
+        return result
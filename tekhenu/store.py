@@ -0,0 +1,192 @@
+import json
+import os
+import secrets
+
+import numpy as np
+
+from .rules import VP_CATEGORIES
+
+"""
+Columnar store of simulation results, one row per game.
+
+A store is a directory of shards, each written by one process only, so workers never share a file. A shard is a
+directory with one raw little endian file per column and a schema.json. Rows are appended a buffer at a time,
+so a file only ever grows; if a writer dies between two column files, readers take the rows every column has.
+
+Readers map every column file with numpy.memmap: nothing is read or copied until it is used, whatever the size
+of the run.
+"""
+
+SCHEMA_VERSION = 1
+
+COUNTERS = [
+    "number_built_buildings", "number_built_pillars", "number_built_statues",
+    "happiness", "population", "decrees", "technologies", "scribes",
+]
+
+
+def category_column(category):
+    return "vp_" + category.lower().replace(" ", "_")
+
+
+# (name, dtype) of every column
+COLUMNS = (
+    [("seed", "<i8"), ("game", "<i8"), ("config_id", "<u4"), ("vps", "<i2")]
+    + [(category_column(category), "<i2") for category in VP_CATEGORIES]
+    + [(counter, "<i2") for counter in COUNTERS]
+)
+
+
+def column_path(path, name):
+    return os.path.join(path, name + ".col")
+
+
+def shard_rows(path, columns):
+    """
+    Returns: rows every column file of a shard has. Some have more only if a writer stopped halfway through an append
+    """
+    return min(os.path.getsize(column_path(path, name))//np.dtype(dtype).itemsize if os.path.exists(column_path(path, name)) else 0
+               for name, dtype in columns)
+
+
+class ShardWriter(object):
+    """
+    Appends rows to one shard. Rows are buffered and written on flush(), when the buffer is full and on close().
+    Params:
+      - path (str): shard directory. Created if missing, appended to if it exists. Rows an append left in some
+        columns only are dropped first, so the columns stay aligned
+      - buffer_rows (int): rows kept in memory between writes
+    """
+    def __init__(self, path, buffer_rows=4096):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        schema_path = os.path.join(path, "schema.json")
+        schema = {"version": SCHEMA_VERSION, "columns": COLUMNS}
+        if os.path.exists(schema_path):
+            with open(schema_path) as f:
+                if json.load(f)!=json.loads(json.dumps(schema)):
+                    raise ValueError("Shard {} has another schema".format(path))
+            rows = shard_rows(path, COLUMNS)
+            for name, dtype in COLUMNS:
+                if os.path.exists(column_path(path, name)):
+                    os.truncate(column_path(path, name), rows*np.dtype(dtype).itemsize)
+        else:
+            with open(schema_path, "w") as f:
+                json.dump(schema, f)
+        self.buffer = {name: np.zeros(buffer_rows, dtype=dtype) for name, dtype in COLUMNS}
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+
+    def add(self, game, seed, index, config_id=0):
+        """
+        Add a finished Game played as game number index of a run with base seed.
+        """
+        if self.rows==self.buffer_rows:
+            self.flush()
+        row, buffer = self.rows, self.buffer
+        buffer["seed"][row] = seed
+        buffer["game"][row] = index
+        buffer["config_id"][row] = config_id
+        buffer["vps"][row] = game.vps
+        for category in VP_CATEGORIES:
+            buffer[category_column(category)][row] = game.vp_breakdown[category]
+        for counter in COUNTERS:
+            buffer[counter][row] = getattr(game, counter)
+        self.rows += 1
+
+    def add_batch(self, batch, seed, start, config_id=0):
+        """
+        Add every game of a finished batch.BatchGame, numbered from start.
+        """
+        self.flush()
+        columns = {"seed": np.full(batch.n, seed), "game": np.arange(start, start+batch.n), "config_id": np.full(batch.n, config_id),
+                   "vps": batch.vps}
+        for i, category in enumerate(VP_CATEGORIES):
+            columns[category_column(category)] = batch.vp_breakdown[:, i]
+        for counter in COUNTERS:
+            columns[counter] = getattr(batch, counter)
+        self.append(columns)
+
+    def append(self, columns):
+        for name, dtype in COLUMNS:
+            with open(column_path(self.path, name), "ab") as f:
+                np.ascontiguousarray(columns[name], dtype=dtype).tofile(f)
+
+    def flush(self):
+        if self.rows:
+            self.append({name: column[:self.rows] for name, column in self.buffer.items()})
+            self.rows = 0
+
+    def close(self):
+        self.flush()
+
+
+class Shard(object):
+    """
+    Read-only view of one shard. columns maps every column name to a numpy.memmap.
+    Params:
+      - path (str): shard directory
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "schema.json")) as f:
+            schema = json.load(f)
+        if schema["version"]!=SCHEMA_VERSION:
+            raise ValueError("Shard {} has schema version {}. Expected {}".format(path, schema["version"], SCHEMA_VERSION))
+        self.rows = shard_rows(path, schema["columns"])
+        self.columns = {}
+        for name, dtype in schema["columns"]:
+            if self.rows:
+                self.columns[name] = np.memmap(column_path(path, name), dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                # numpy cannot map an empty file
+                self.columns[name] = np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+
+class Store(object):
+    """
+    Every shard of a store directory.
+    Params:
+      - directory (str)
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.shards = [Shard(os.path.join(directory, name)) for name in sorted(os.listdir(directory))
+                       if os.path.exists(os.path.join(directory, name, "schema.json"))]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def column(self, name):
+        """
+        Returns: numpy array of a column over all shards. Zero-copy if there is a single shard, else one concatenation
+        """
+        parts = [shard[name] for shard in self.shards]
+        if len(parts)==1:
+            return parts[0]
+        if not parts:
+            return np.zeros(0, dtype=dict(COLUMNS)[name])
+        return np.concatenate(parts)
+
+
+# Writer per (store directory, process id), so the chunks a worker plays go to one shard of its own.
+# Keyed on the process id too, as forked workers inherit the writers of their parent
+writers = {}
+
+
+def process_writer(directory):
+    """
+    Returns: ShardWriter of this process in a store directory
+    """
+    key = (directory, os.getpid())
+    writer = writers.get(key)
+    if writer is None:
+        name = "shard-{}-{}".format(os.getpid(), secrets.token_hex(4))
+        writer = writers[key] = ShardWriter(os.path.join(directory, name))
+    return writer
@@ -0,0 +1,137 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+from multiprocessing import Pool
+
+from .engine import ENGINE_VERSION
+from .rules import GOD_ORDER
+from .simulate import DEFAULT_CONFIG, simulate
+
+"""
+Sweep of game setups: Horus order (720), first sunny God (6) and difficulty (3), N games per cell.
+
+Finished cells are appended to a JSON lines file, one object per cell, flushed as they come. The file is also the
+cache: a cell whose key, a hash of its setup, the run settings and ENGINE_VERSION, is already in it is not played
+again. An interrupted sweep carries on where it stopped, and a sweep with more cells only plays the new ones.
+"""
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+# Cells handed to the pool at a time per worker
+CELLS_PER_WORKER = 4
+
+
+def grid(difficulties=DIFFICULTIES):
+    """
+    Returns: [(cell id, difficulty, horus_order, first_sunny) ..] of every setup. Cell ids do not depend on
+    the difficulties asked for, so a cell keeps its id across sweeps
+    """
+    cells = []
+    for d, difficulty in enumerate(DIFFICULTIES):
+        for p, horus_order in enumerate(itertools.permutations(GOD_ORDER)):
+            for s, first_sunny in enumerate(GOD_ORDER):
+                if difficulty in difficulties:
+                    cells.append(((d*720 + p)*6 + s, difficulty, list(horus_order), first_sunny))
+    return cells
+
+
+def cell_key(cell, settings):
+    """
+    Returns: str. Hash of a cell's setup, the run settings and ENGINE_VERSION
+    """
+    _, difficulty, horus_order, first_sunny = cell
+    text = json.dumps([ENGINE_VERSION, difficulty, horus_order, first_sunny, settings], sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def read_cells(path):
+    """
+    Returns: {key: cell record} of a sweep file. A last line cut short by a crash is dropped from the file
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n")+1
+        if end<len(data):
+            f.truncate(end)
+    for line in data[:end].splitlines():
+        record = json.loads(line)
+        records[record["key"]] = record
+    return records
+
+
+def run_cell(args):
+    """
+    Worker entry point. Plays the games of one cell.
+    Returns: cell record
+    """
+    cell, key, settings, store = args
+    cell_id, difficulty, horus_order, first_sunny = cell
+    config = {"difficulty": difficulty, "horus_order": horus_order, "first_sunny": first_sunny,
+              "policy": settings["policy"], "rng": settings["rng"], "store": store, "config_id": cell_id}
+    results = simulate(settings["games"], config, workers=1, seed=settings["seed"])
+    return {"key": key, "cell": cell_id, "difficulty": difficulty, "horus_order": horus_order, "first_sunny": first_sunny,
+            "engine": ENGINE_VERSION, "settings": settings, "results": results}
+
+
+def sweep(path, games=100, difficulties=DIFFICULTIES, sample=None, policy=None, rng=None, seed=0, workers=None,
+          store=None, progress=None):
+    """
+    Play every cell of the grid not in the sweep file yet, and append them to it.
+
+    Params:
+      - path (str): JSON lines file of finished cells. Created if missing
+      - games (int): games per cell
+      - difficulties (list of str): difficulties to sweep
+      - sample (int): play this many cells, drawn at random from seed, instead of the whole grid
+      - policy, rng (str): Player policy and random stream, as in simulate. DEFAULT_CONFIG if None
+      - seed (int): base seed of every cell. The same in all cells, so cells differ by their setup only
+      - workers (int): processes to use. Defaults to all cores
+      - store (str): tekhenu.store directory to also write every game to, config_id being the cell id
+      - progress (callable): called with (cells done, cells to play, record) after every cell
+    Returns:
+      - [cell record ..] of the sampled cells, cached or played. A record holds the setup, its key and the
+        simulate results
+    """
+    settings = {"games": games, "policy": policy or DEFAULT_CONFIG["policy"], "rng": rng or DEFAULT_CONFIG["rng"],
+                "seed": seed}
+    cells = grid(difficulties)
+    if sample is not None and sample<len(cells):
+        cells = random.Random(seed).sample(cells, sample)
+    keys = [cell_key(cell, settings) for cell in cells]
+
+    done = read_cells(path)
+    todo = [(cell, key, settings, store) for cell, key in zip(cells, keys) if key not in done]
+    workers = workers or os.cpu_count() or 1
+
+    finished = []
+    with open(path, "a") as f:
+        def finish(record):
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+            f.flush()
+            done[record["key"]] = record
+            finished.append(record["key"])
+            if progress is not None:
+                progress(len(finished), len(todo), record)
+
+        if workers==1:
+            for args in todo:
+                finish(run_cell(args))
+        else:
+            with Pool(workers) as pool:
+                for start in range(0, len(todo), CELLS_PER_WORKER*workers):
+                    for record in pool.imap_unordered(run_cell, todo[start:start+CELLS_PER_WORKER*workers]):
+                        finish(record)
+
+    return [done[key] for key in keys]
+
+
+def strongest(records, n=10, category="Total"):
+    """
+    Returns: the n cell records with the highest mean Bot VPs in category
+    """
+    return sorted(records, key=lambda record: -record["results"][category]["mean"])[:n]
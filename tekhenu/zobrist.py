@@ -0,0 +1,124 @@
+import random
+
+from .rules import GOD_ORDER, BOT_BASE_ACTIONS, POSSIBLE_BOT_ACTIONS, DICE_COLORS
+
+"""
+Zobrist keys of game states. Every state feature has a random 64 bit key and a state hashes to the XOR of the keys
+of its features, so a move updates the hash with an XOR or two instead of hashing the whole state again.
+
+Board and DicePool keep their part up to date on every placement, add and removal. The few Game scalars are
+folded in by Game.state_hash. Keys come from a fixed seed, so hashes agree across processes and runs.
+"""
+
+KEYS = random.Random("tekhenu:zobrist")
+
+
+def keys(n):
+    return [KEYS.getrandbits(64) for _ in range(n)]
+
+
+# Board.state() field order, one key per bit of each mask
+BOARD_KEYS = [keys(32) for _ in range(10)]
+
+# k-th copy of a (color, value) die on a God, so the dice of a God hash as a multiset
+MAX_COPIES = 32
+DICE_KEYS = {(god, color, value): keys(MAX_COPIES) for god in GOD_ORDER for color in DICE_COLORS for value in range(1, 7)}
+
+FIRST_SUNNY_KEYS = dict(zip(GOD_ORDER, keys(6)))
+BOT_FIRST_KEY = keys(1)[0]
+PYRAMID_KEYS = [dict(zip(BOT_BASE_ACTIONS, keys(10))) for _ in range(10)]
+ACTIONS_KEYS = keys(len(POSSIBLE_BOT_ACTIONS))
+
+# Game counters, values taken modulo COUNTER_RANGE
+COUNTERS = [
+    "round_number", "vps", "scribes", "happiness", "population", "blessings", "technologies", "decrees",
+    "number_built_buildings", "number_built_pillars", "number_built_statues",
+]
+COUNTER_RANGE = 256
+COUNTER_KEYS = [keys(COUNTER_RANGE) for _ in COUNTERS]
+
+# Search context: turns played this round and Player balance
+TURN_KEYS = keys(2)
+BALANCE_KEYS = keys(64)
+
+
+def board_hash(state):
+    """
+    Returns: int. Zobrist hash of a Board.state() tuple, from scratch
+    """
+    h = 0
+    for mask, field_keys in zip(state, BOARD_KEYS):
+        while mask:
+            low = mask & -mask
+            h ^= field_keys[low.bit_length()-1]
+            mask ^= low
+    return h
+
+
+def dice_hash(dice):
+    """
+    Returns: int. Zobrist hash of {god: [(color, value) ..]}, from scratch
+    """
+    h = 0
+    for god, god_dice in dice.items():
+        seen = {}
+        for die in god_dice:
+            copies = seen.get(die, 0)
+            h ^= DICE_KEYS[(god, die[0], die[1])][copies % MAX_COPIES]
+            seen[die] = copies+1
+    return h
+
+
+def game_hash(game):
+    """
+    Returns: int. Zobrist hash of the Game scalars that Board and DicePool do not cover
+    """
+    h = FIRST_SUNNY_KEYS[game.first_sunny] ^ ACTIONS_KEYS[POSSIBLE_BOT_ACTIONS.index(game.bot_actions)]
+    if game.player_order[0]=="Bot":
+        h ^= BOT_FIRST_KEY
+    for position, action in enumerate(game.bot_pyramid):
+        h ^= PYRAMID_KEYS[position][action]
+    for counter, counter_keys in zip(COUNTERS, COUNTER_KEYS):
+        h ^= counter_keys[getattr(game, counter) % COUNTER_RANGE]
+    return h
+
+
+class TranspositionTable(object):
+    """
+    Fixed size table of search results keyed on Zobrist hashes. A slot holds one entry; a new entry replaces the old
+    one if it is from an older search or searched at least as deep.
+    Params:
+      - size (int): number of slots
+    """
+    def __init__(self, size=1<<16):
+        self.size = size
+        self.slots = [None]*size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_search(self):
+        """
+        Age every entry, so the next search may overwrite them whatever their depth.
+        """
+        self.generation += 1
+
+    def get(self, key, depth):
+        """
+        Returns: value stored for key searched at least depth deep, None if there is none
+        """
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0]==key and entry[1]>=depth:
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        return None
+
+    def put(self, key, depth, value):
+        index = key % self.size
+        entry = self.slots[index]
+        if entry is None or entry[3]!=self.generation or depth>=entry[1]:
+            self.slots[index] = (key, depth, value, self.generation)
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.slots)
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from tekhenu.dice import roll_dice
+from tekhenu.engine import Game
+from tekhenu.metrics import Metrics
+from tekhenu.rules import GOD_ORDER
+from tekhenu.simulate import simulate
+
+np = pytest.importorskip("numpy")
+from tekhenu.batch import BatchGame, PLAYER, simulate_batch
+
+PARITY_FIELDS = ["Total", "Temple Buildings", "Temple Pillars", "Osiris", "Statues"]
+
+
+@pytest.mark.parametrize("difficulty", ["Easy", "Medium", "Hard"])
+def test_batch_means_match_simulate(difficulty):
+    # Both engines play the random policy on different streams, so means agree up to sampling error
+    config = {"difficulty": difficulty}
+    scalar = simulate(1500, config, workers=1, seed=0)
+    batch = simulate_batch(20000, config, seed=0)
+    for field in PARITY_FIELDS:
+        a, b = scalar[field], batch[field]
+        standard_error = (a["std"]**2/scalar["games"] + b["std"]**2/batch["games"])**0.5
+        assert abs(a["mean"]-b["mean"]) <= 4*standard_error+1e-9, field
+
+
+def test_batch_temple_building_on_full_temple():
+    game = BatchGame(4, "Medium", rng=np.random.default_rng(0))
+    game.built_temple_buildings[:] = PLAYER
+    vps, built = game.vps.copy(), game.number_built_buildings.copy()
+    game.build_temple_building(game.all, np.full(4, 6))
+    assert (game.vps==vps).all()
+    assert (game.number_built_buildings==built).all()
+    assert (game.built_temple_buildings==PLAYER).all()
+
+
+def test_temple_building_on_full_temple():
+    rng = random.Random(0)
+    metrics = Metrics()
+    game = Game("Medium", rng.sample(GOD_ORDER, 6), rng.choice(GOD_ORDER), roll_dice(rng), rng=rng, metrics=metrics)
+    for side in ("Horizontal", "Vertical"):
+        for rowcol in range(5):
+            game.board.place_temple_building(side, rowcol, "Player")
+    vps = game.vps
+    assert game.build_temple_building(6) is False
+    assert game.vps==vps
+    assert metrics.fallbacks["temple_buildings_full"]==1
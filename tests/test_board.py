@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from tekhenu.board import Board
+from tekhenu.dice import DicePool, roll_dice
+from tekhenu.engine import Game
+from tekhenu.policies import RandomPolicy, GreedyPolicy
+from tekhenu.rules import GOD_ORDER
+from tekhenu.zobrist import board_hash, dice_hash, game_hash
+
+
+class RebuildSink(object):
+    """
+    Checks the incrementally kept Board and DicePool indexes against ones built from scratch after every event.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.game = None
+        self.events = 0
+
+    def emit(self, event):
+        game = self.game
+        if game is None:
+            return
+        self.events += 1
+        board, fresh = game.board, Board(game.board.state())
+        assert board.pillar_buckets==fresh.pillar_buckets, event
+        assert board.osiris_winners==fresh.osiris_winners, event
+        assert board.osiris_swings==fresh.osiris_swings, event
+        assert board.temple_vps==fresh.temple_vps, event
+
+        pool = DicePool({god: list(dice) for god, dice in game.dice_pool.dice.items()}, game.dice_pool.first_sunny, game.rules)
+        assert game.dice_pool.by_god==pool.by_god, event
+        # by_color lists are in the order dice were added, top_color_dice sorts them into God order
+        assert ({key: [sorted(bucket) for bucket in buckets] for key, buckets in game.dice_pool.by_color.items()}
+                == {key: [sorted(bucket) for bucket in buckets] for key, buckets in pool.by_color.items()}), event
+
+        assert board.zobrist==board_hash(board.state()), event
+        assert game.dice_pool.zobrist==dice_hash(game.dice_pool.dice), event
+        assert game.state_hash()==board_hash(board.state()) ^ dice_hash(game.dice_pool.dice) ^ game_hash(game), event
+
+
+@pytest.mark.parametrize("policy", [RandomPolicy, GreedyPolicy])
+@pytest.mark.parametrize("difficulty", ["Easy", "Medium", "Hard"])
+def test_incremental_state_matches_rebuild(policy, difficulty):
+    for seed in range(5):
+        rng = random.Random(seed)
+        sink = RebuildSink()
+        game = Game(difficulty, rng.sample(GOD_ORDER, 6), rng.choice(GOD_ORDER), roll_dice(rng), policy=policy(), sink=sink,
+                    rng=rng)
+        sink.game = game
+        game.game_loop()
+        assert game.round_number==16
+        assert sink.events>0
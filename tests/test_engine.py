@@ -0,0 +1,28 @@
+import random
+
+from tekhenu.dice import DicePool
+from tekhenu.metrics import Metrics
+from tekhenu.policies import RandomPolicy, GreedyPolicy
+from tekhenu.simulate import DEFAULT_CONFIG, game_rng, play_game
+
+
+def test_bot_passes_when_no_die_can_be_taken():
+    # Game 1666 of a Hard run on seed 1 reaches a Bot turn where no action color has a die left
+    config = dict(DEFAULT_CONFIG, difficulty="Hard")
+    metrics = Metrics()
+    game = play_game(config, game_rng(config, 1, 1666), metrics)
+    assert game.round_number==16
+    assert metrics.fallbacks["no_die"]==1
+
+
+def test_policies_pick_nothing_from_forbidden_dice():
+    class Stub(object):
+        pass
+
+    game = Stub()
+    # Horus sunny: Bread is Forbidden on the Sunny Gods, Limestone on the Dark ones
+    game.dice_pool = DicePool({"Horus": [("Bread", 6)], "Ra": [], "Hathor": [], "Bastet": [("Limestone", 3)],
+                               "Thoth": [("Limestone", 5)], "Osiris": []}, "Horus")
+    assert not game.dice_pool.has_legal_pick()
+    for policy in (RandomPolicy(random.Random(0)), GreedyPolicy(random.Random(0))):
+        assert policy.select_die(game, 1) is None
@@ -0,0 +1,45 @@
+import io
+import random
+
+from tekhenu.dice import roll_dice
+from tekhenu.engine import Game
+from tekhenu.journal import JournalSink, replay, find_divergence
+from tekhenu.policies import RandomPolicy
+from tekhenu.rules import Ruleset, GOD_ORDER
+
+
+def record(seed):
+    """
+    Returns: (Game, journal bytes) of a random policy game
+    """
+    rng = random.Random(seed)
+    setup = {"difficulty": "Medium", "horus_order": rng.sample(GOD_ORDER, 6), "first_sunny": rng.choice(GOD_ORDER),
+             "starting_dice": roll_dice(rng)}
+    stream = io.BytesIO()
+    # The Game moves dice off the starting lists, the journal needs them as they were
+    sink = JournalSink(stream, rng=rng, **dict(setup, starting_dice={god: list(dice) for god, dice in setup["starting_dice"].items()}))
+    # The Player draws from its own stream, as a replay only has its decisions
+    game = Game(setup["difficulty"], setup["horus_order"], setup["first_sunny"], setup["starting_dice"],
+                policy=RandomPolicy(random.Random(seed+1000)), sink=sink, rng=rng)
+    game.game_loop()
+    return game, stream.getvalue()
+
+
+def test_replay_matches_record():
+    game, journal = record(0)
+    replayed, replayed_journal = replay(journal)
+    assert replayed.vps==game.vps
+    assert find_divergence(journal, replayed_journal) is None
+
+
+def test_replay_under_modified_rules_stops_at_divergence():
+    # Fewer Bot statues leave spots free that the Player took in the recorded games
+    rules = Ruleset(total_statues=3)
+    cut_short = 0
+    for seed in range(50):
+        _, journal = record(seed)
+        replayed, replayed_journal = replay(journal, rules=rules)
+        if replayed.round_number<16:
+            cut_short += 1
+            assert find_divergence(journal, replayed_journal) is not None
+    assert cut_short>0
@@ -0,0 +1,35 @@
+import random
+
+from tekhenu.dice import roll_dice
+from tekhenu.engine import Game
+from tekhenu.events import NullSink
+from tekhenu.policies import GreedyPolicy
+from tekhenu.rules import GOD_ORDER
+from tekhenu.search import HintSearch, HintPolicy, unique_picks
+
+
+def first_pick(seed):
+    """
+    Returns: Game waiting on the Player's first die pick
+    """
+    rng = random.Random(seed)
+    game = Game("Medium", rng.sample(GOD_ORDER, 6), rng.choice(GOD_ORDER), roll_dice(rng),
+                policy=GreedyPolicy(random.Random(seed)), sink=NullSink(), rng=rng)
+    decision = game.play().send(None)
+    assert decision.kind=="die"
+    return game
+
+
+def test_search_out_of_time_hints_highest_die():
+    game = first_pick(0)
+    result = HintSearch(budget=0).search(game)
+    assert result.depth==0 and not result.complete
+    assert result.pick in unique_picks(game)
+    assert result.pick[2][1]==max(pick[2][1] for pick in unique_picks(game))
+
+
+def test_hint_policy_out_of_time(capsys):
+    game = first_pick(1)
+    policy = HintPolicy(GreedyPolicy(random.Random(1)), budget=0)
+    assert policy.select_die(game, 1) in unique_picks(game)
+    assert "Out of time" in capsys.readouterr().out
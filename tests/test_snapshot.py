@@ -0,0 +1,33 @@
+import pytest
+
+from tekhenu.dice import roll_dice
+from tekhenu.engine import Game
+from tekhenu.policies import RandomPolicy
+from tekhenu.rng import BlockRandom
+from tekhenu.rules import GOD_ORDER
+from tekhenu.events import NullSink
+from tekhenu.simulate import game_rng
+
+
+@pytest.mark.parametrize("kind", ["python", "block", "streams"])
+def test_resume_from_mid_game_snapshot(kind):
+    if kind=="block":
+        pytest.importorskip("numpy")
+    rng = game_rng({"rng": kind}, 7, 3)
+    snapshots = []
+    game = Game("Hard", rng.sample(GOD_ORDER, 6), rng.choice(GOD_ORDER), roll_dice(rng), policy=RandomPolicy(), sink=NullSink(),
+                rng=rng, autosave=snapshots.append)
+    game.game_loop()
+    for data in (snapshots[0], snapshots[7], snapshots[-2]):
+        # The random stream comes back from the snapshot, the Player draws from it as in the recorded game
+        resumed = Game.from_bytes(data, policy=RandomPolicy(), sink=NullSink())
+        resumed.game_loop()
+        assert resumed.vps==game.vps
+        assert resumed.state_hash()==game.state_hash()
+
+
+@pytest.mark.parametrize("seed", [-1, 2**64, (1, -1), "7"])
+def test_block_random_rejects_seeds_snapshots_cannot_hold(seed):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        BlockRandom(seed)